@@ -0,0 +1,72 @@
+"""Benchmark the parsing of (long) author lists, as found in large collaborations.
+
+Run with ``python -m benchmarks.authors``.
+"""
+
+from itertools import chain
+import random
+import timeit
+
+from pybibtex.authorcache import AuthorCache
+from pybibtex.authors import AuthorsParser, LazyAuthors, parse_authors_bulk
+
+FIRST = ['Jean', 'J.-P.', 'Mary Ann', "{\\'E}mile", 'P.', 'Hans', 'Ana', 'Kim']
+VON = ['', '', '', 'de la', 'van der', 'von']
+LAST = ['Smith', 'Fontaine', 'M{\\"u}ller', 'Nguyen', "O'Neil", '{Barnes and Noble}', 'Zola', 'Berg']
+
+
+def author_list(n: int, seed: int = 42) -> str:
+    rnd = random.Random(seed)
+    names = []
+    for i in range(n):
+        first, von, last = rnd.choice(FIRST), rnd.choice(VON), rnd.choice(LAST)
+        if i % 2:
+            names.append('{} {}, {}'.format(von, last, first).strip())
+        else:
+            names.append(' '.join(x for x in (first, von, last) if x))
+
+    return ' and '.join(names)
+
+
+def ascii_author_list(n: int, seed: int = 42) -> str:
+    """List of names without braces nor special characters (the fast path of `parse_authors_bulk()`)"""
+
+    rnd = random.Random(seed)
+    first = [f for f in FIRST if '{' not in f]
+    last = [x for x in LAST if '{' not in x]
+    names = []
+    for i in range(n):
+        if i % 2:
+            names.append('{}, {}'.format(rnd.choice(last), rnd.choice(first)))
+        else:
+            names.append('{} {}'.format(rnd.choice(first), rnd.choice(last)))
+
+    return ' and '.join(names)
+
+
+def main():
+    for n, authors in chain(
+            ((n, author_list(n)) for n in (3, 100, 1000, 3000)),
+            (('ASCII {}'.format(n), ascii_author_list(n)) for n in (100, 1000))):
+        repeat = max(1, 3000 // len(authors.split(' and ')))
+
+        t_parser = timeit.timeit(lambda: AuthorsParser(authors).authors(), number=repeat) / repeat
+        t_bulk = timeit.timeit(lambda: parse_authors_bulk([authors]), number=repeat) / repeat
+        t_lazy = timeit.timeit(lambda: LazyAuthors(authors)[:3], number=repeat) / repeat
+
+        print('{:>10} authors: AuthorsParser {:8.3f} ms, parse_authors_bulk {:8.3f} ms, first 3 {:8.3f} ms'.format(
+            n, t_parser * 1000, t_bulk * 1000, t_lazy * 1000))
+
+    # repeated author strings, as found in the items of a large database
+    strings = [author_list(3, seed) for seed in range(1000)] * 100
+    cache = AuthorCache()
+
+    t_parse = timeit.timeit(lambda: [parse_authors_bulk([s]) for s in strings], number=1)
+    t_cache = timeit.timeit(lambda: [cache.get(s) for s in strings], number=1)
+
+    print('{} strings ({} distinct): parse_authors_bulk {:8.3f} us, AuthorCache {:8.3f} us per string ({})'.format(
+        len(strings), len(set(strings)), t_parse / len(strings) * 1e6, t_cache / len(strings) * 1e6, cache.stats()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark the construction of the co-authorship graph of a database.
+
+Run with ``python -m benchmarks.coauthors``.
+"""
+
+import random
+import time
+
+from pybibtex.bibliography import Database, Item
+from pybibtex.coauthors import CoauthorGraph
+
+from benchmarks.authors import FIRST, LAST, VON
+
+
+def make_database(n: int, n_authors: int = 20000, seed: int = 42) -> Database:
+    rnd = random.Random(seed)
+    names = ['{} {}, {} {}'.format(rnd.choice(VON), rnd.choice(LAST), rnd.choice(FIRST), i).strip()
+             for i in range(n_authors)]
+
+    return Database(dict(
+        ('item{}'.format(i), Item('item{}'.format(i), 'article', {
+            'author': ' and '.join(rnd.sample(names, rnd.randint(1, 6))), 'title': 'Title {}'.format(i)}))
+        for i in range(n)))
+
+
+def naive(database: Database) -> dict:
+    """Co-authors built by hand, with string keys"""
+
+    edges = {}
+    for item in database.iter_item():
+        names = sorted(set(str(a) for a in item.authors()))
+        for i, first in enumerate(names):
+            for second in names[i + 1:]:
+                edges[first, second] = edges.get((first, second), 0) + 1
+
+    return edges
+
+
+def main():
+    database = make_database(100000)
+
+    start = time.perf_counter()
+    edges = naive(database)
+    t_naive = time.perf_counter() - start
+
+    database = make_database(100000)  # (without the parsed authors)
+
+    start = time.perf_counter()
+    graph = CoauthorGraph.from_database(database)
+    t_graph = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graph.csr()
+    t_csr = time.perf_counter() - start
+
+    print('{} items, {} authors, {} edges: by hand {:.3f} s, CoauthorGraph {:.3f} s (+ {:.3f} s for CSR)'.format(
+        len(database), len(graph), graph.n_edges, t_naive, t_graph, t_csr))
+    assert len(edges) == graph.n_edges
+
+
+if __name__ == '__main__':
+    main()
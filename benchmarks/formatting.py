@@ -0,0 +1,48 @@
+"""Benchmark the formatting of references.
+
+Run with ``python -m benchmarks.formatting``.
+"""
+
+import random
+import time
+
+from pybibtex.bibliography import Database, Item
+from pybibtex.formatting import APA, NUMERIC
+
+from benchmarks.authors import author_list
+
+
+def make_database(n: int, seed: int = 42) -> Database:
+    rnd = random.Random(seed)
+    db = {}
+    for i in range(n):
+        key = 'item{}'.format(i)
+        db[key] = Item(key, rnd.choice(['article', 'article', 'book', 'inproceedings']), {
+            'author': author_list(rnd.choice([1, 2, 3, 5, 30]), seed=i),
+            'title': 'On the {{DNA}} of things, part {}'.format(i),
+            'journal': 'J. Chem. Phys.',
+            'booktitle': 'Proceedings',
+            'publisher': 'Springer',
+            'year': str(rnd.randint(1950, 2023)),
+            'volume': str(rnd.randint(1, 150)),
+            'pages': '{}--{}'.format(i, i + 10),
+        })
+
+    return Database(db)
+
+
+def main():
+    database = make_database(100000)
+
+    for name, style in (('APA', APA), ('numeric', NUMERIC)):
+        # the first pass also parses the authors, which are then cached in the items
+        for run in ('first', 'second'):
+            start = time.perf_counter()
+            references = style.format_database(database)
+            duration = time.perf_counter() - start
+            print('{:8} ({} pass): {} references in {:.2f} s ({:.1f} µs/reference)'.format(
+                name, run, len(references), duration, duration / len(references) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Benchmark the JSON Lines and CSL-JSON exporters and importers, against BibTeX.
+
+Run with ``python -m benchmarks.jsonio``.
+"""
+
+import io
+import time
+
+from pybibtex.jsonio import dump_csl, dump_jsonl, load_csl, load_jsonl
+from pybibtex.parser import Parser
+
+from benchmarks.formatting import make_database
+
+
+def timed(name: str, n: int, f):
+    start = time.perf_counter()
+    result = f()
+    duration = time.perf_counter() - start
+    print('{:22}: {:.2f} s ({:.1f} µs/item)'.format(name, duration, duration / n * 1e6))
+    return result
+
+
+def main():
+    n = 20000
+    database = make_database(n)
+
+    bibtex = timed('BibTeX export', n, lambda: str(database))
+    timed('BibTeX import', n, lambda: Parser(bibtex).parse())
+
+    for name, dump, load, kwargs in (
+            ('JSON Lines', dump_jsonl, load_jsonl, {}),
+            ('CSL-JSON', dump_csl, load_csl, {'to_utf8': False}),
+            ('CSL-JSON (UTF-8)', dump_csl, load_csl, {})
+    ):
+        output = io.StringIO()
+        timed('{} export'.format(name), n, lambda: dump(database, output, **kwargs))
+        timed('{} import'.format(name), n, lambda: load(io.StringIO(output.getvalue())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark the serialization of a database, and its transfer to another process.
+
+Run with ``python -m benchmarks.serialization``.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+import time
+
+from pybibtex import serialization
+from pybibtex.bibliography import Database, Item
+
+from benchmarks.formatting import make_database
+
+
+class DefaultItem(Item):
+    """Item pickled as before (with its ``__dict__``)"""
+
+    __reduce__ = object.__reduce__
+
+
+class DefaultDatabase(Database):
+    """Database pickled as before (with its ``__dict__``)"""
+
+    __reduce__ = object.__reduce__
+
+
+def default_database(database: Database) -> DefaultDatabase:
+    """Copy of the database, without the caches (which cannot be pickled with the default protocol)"""
+
+    return DefaultDatabase(dict(
+        (key, DefaultItem(item.cite_key, item.item_type, item.fields))
+        for key, item in zip(database, database.iter_item())))
+
+
+def count(database: Database) -> int:
+    return len(database)
+
+
+def count_serialized(data: bytes) -> int:
+    return len(serialization.loads(data))
+
+
+def timed(name: str, f, repeat: int = 3):
+    """Print the best time out of ``repeat`` runs"""
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = f()
+        durations.append(time.perf_counter() - start)
+
+    print('{:32}: {:.3f} s'.format(name, min(durations)))
+    return result
+
+
+def main():
+    database = make_database(100000)
+    for item in database.iter_item():  # fill the caches, as in real use
+        item.authors(limit=3)
+
+    default = default_database(database)
+    data = timed('default pickle (dumps)', lambda: pickle.dumps(default, pickle.HIGHEST_PROTOCOL))
+    timed('default pickle (loads)', lambda: pickle.loads(data))
+    print('{:32}: {:.1f} MB'.format('default pickle (size)', len(data) / 1e6))
+
+    data = timed('pickle (dumps)', lambda: pickle.dumps(database, pickle.HIGHEST_PROTOCOL))
+    timed('pickle (loads)', lambda: pickle.loads(data))
+    print('{:32}: {:.1f} MB'.format('pickle (size)', len(data) / 1e6))
+
+    data = timed('serialization (dumps)', lambda: serialization.dumps(database))
+    timed('serialization (loads)', lambda: serialization.loads(data))
+    print('{:32}: {:.1f} MB'.format('serialization (size)', len(data) / 1e6))
+
+    with ProcessPoolExecutor(1) as executor:
+        executor.submit(count, Database()).result()  # start the process
+        timed('to process (default pickle)', lambda: executor.submit(count, default).result())
+        timed('to process (pickle)', lambda: executor.submit(count, database).result())
+        timed('to process (serialization)', lambda: executor.submit(
+            count_serialized, serialization.dumps(database)).result())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark the updates of a shared database, as the changes since the last merge accumulate.
+
+Run with ``python -m benchmarks.shared``.
+"""
+
+import time
+
+from pybibtex.bibliography import Database, Item
+from pybibtex.shared import COMPACT_RATIO, OverlayDict, SharedDatabase
+
+
+def make_shared(n: int) -> SharedDatabase:
+    return SharedDatabase(Database(dict(('k{}'.format(i), Item('k{}'.format(i), 'misc', {})) for i in range(n))))
+
+
+def main():
+    n = 1000000
+    shared = make_shared(n)
+    n_commits = n // COMPACT_RATIO  # (so that the layers are merged once)
+    bucket = n_commits // 8
+
+    print('{:>8} {:>8} {:>12} {:>12} {:>12}'.format('commits', 'layers', 'mean (us)', 'max (us)', 'lookup (us)'))
+
+    for start in range(0, n_commits, bucket):
+        durations = []
+        for i in range(start, start + bucket):
+            begin = time.perf_counter()
+            with shared.update() as transaction:
+                transaction.set_field('k{}'.format(i * 7 % n), 'year', '2000')
+            durations.append(time.perf_counter() - begin)
+
+        snapshot = shared.snapshot()
+        db = snapshot.db
+        keys = ['k{}'.format(i) for i in range(0, n, n // 10000)]
+        begin = time.perf_counter()
+        for key in keys:
+            snapshot[key]
+        lookup = (time.perf_counter() - begin) / len(keys)
+
+        print('{:>8} {:>8} {:>12.1f} {:>12.1f} {:>12.2f}'.format(
+            start + bucket, db.depth if isinstance(db, OverlayDict) else 0,
+            1e6 * sum(durations) / len(durations), 1e6 * max(durations), 1e6 * lookup))
+
+
+if __name__ == '__main__':
+    main()
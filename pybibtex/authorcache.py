@@ -0,0 +1,189 @@
+from collections import OrderedDict
+from typing import Dict, Tuple
+import json
+import os
+import tempfile
+import threading
+
+from pybibtex.authors import Author, parse_name, split_names
+
+DEFAULT_SIZE = 1 << 16  #: default maximum number of author strings kept by `AuthorCache`
+FORMAT_VERSION = 1  #: version of the files written by `AuthorCache.save()`
+
+
+def parse_authors(inp: str) -> Tuple[Author, ...]:
+    """Get the authors of a list of names (as `pybibtex.authors.AuthorsParser` does), as a tuple.
+
+    Parameters:
+        inp: input string
+    """
+
+    if not inp.strip(' '):
+        return ()
+
+    return tuple(parse_name(name) for name in split_names(inp))
+
+
+class CacheStats:
+    """Statistics of an `AuthorCache` (see `AuthorCache.stats()`)
+    """
+
+    def __init__(self, hits: int, misses: int, evictions: int, size: int, maxsize: int):
+        self.hits = hits  #: number of lookups that found the authors in the cache
+        self.misses = misses  #: number of lookups that had to parse the authors
+        self.evictions = evictions  #: number of entries removed to keep the cache below its maximum size
+        self.size = size  #: current number of entries
+        self.maxsize = maxsize  #: maximum number of entries (``None`` if unbounded)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Proportion of lookups that found the authors in the cache"""
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def __repr__(self) -> str:
+        return 'CacheStats(hits={}, misses={}, evictions={}, size={}, maxsize={})'.format(
+            self.hits, self.misses, self.evictions, self.size, self.maxsize)
+
+
+class AuthorCache:
+    """Bounded cache of parsed author strings (e.g., ``Smith, John and Doe, Jane``), safe to use from many threads.
+
+    The least recently used entries are evicted once the cache holds ``maxsize`` strings.
+    The parsing itself (see `parse_authors()`) is done outside of the lock, so that a miss does not block the other
+    threads (if two threads miss the same string at once, both parse it, and the last one is kept).
+    The same (immutable) `pybibtex.authors.Author` objects are returned for each lookup of a string.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_SIZE):
+        """Initialize the object
+
+        Parameters:
+            maxsize: maximum number of author strings (``None`` for an unbounded cache)
+        """
+
+        self.maxsize = maxsize
+
+        self._entries: Dict[str, Tuple[Author, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, inp: str) -> Tuple[Author, ...]:
+        """Get the authors of a list of names, parsing it only if it is not in the cache
+
+        Parameters:
+            inp: input string
+        """
+
+        with self._lock:
+            authors = self._entries.get(inp)
+            if authors is not None:
+                self._entries.move_to_end(inp)
+                self._hits += 1
+                return authors
+
+            self._misses += 1
+
+        authors = parse_authors(inp)
+        self._put(inp, authors)
+        return authors
+
+    def _put(self, inp: str, authors: Tuple[Author, ...]):
+        with self._lock:
+            self._entries[inp] = authors
+            self._entries.move_to_end(inp)
+            self._evict()
+
+    def _evict(self):
+        """Remove the least recently used entries, if there are too many of them (the lock must be held)"""
+
+        if self.maxsize is None:
+            return
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def resize(self, maxsize: int):
+        """Change the maximum size of the cache (the least recently used entries are evicted if needed)"""
+
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of the cache"""
+
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self.maxsize)
+
+    def clear(self):
+        """Remove all the entries, and reset the statistics"""
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, inp: str) -> bool:
+        return inp in self._entries
+
+    def save(self, path: str):
+        """Write the entries of the cache in a JSON file (from the least to the most recently used).
+
+        The file is replaced at once, so that a concurrent `load()` never reads a partially written file.
+        """
+
+        with self._lock:
+            entries = [
+                [inp, [[a.first, a.last, a.von, a.jr] for a in authors]] for inp, authors in self._entries.items()]
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': FORMAT_VERSION, 'entries': entries}, f, ensure_ascii=False)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def load(self, path: str) -> int:
+        """Add the entries of a file written by `save()` to the cache (they do not count as hits or misses).
+
+        Returns:
+            the number of entries read
+        """
+
+        with open(path, encoding='utf-8') as f:
+            content = json.load(f)
+
+        if content.get('version') != FORMAT_VERSION:
+            raise ValueError('unsupported version of the cache file: {}'.format(content.get('version')))
+
+        entries = content['entries']
+        with self._lock:
+            for inp, authors in entries:
+                self._entries[inp] = tuple(Author(first, last, von, jr) for first, last, von, jr in authors)
+                self._entries.move_to_end(inp)
+            self._evict()
+
+        return len(entries)
+
+
+default_cache = AuthorCache()  #: cache shared by the whole process (see `cached_authors()`)
+
+
+def cached_authors(inp: str) -> Tuple[Author, ...]:
+    """Get the authors of a list of names, using `default_cache`
+
+    Parameters:
+        inp: input string
+    """
+
+    return default_cache.get(inp)
@@ -1,5 +1,9 @@
-from typing import Iterator, List, Tuple
+from typing import Iterable, Iterator, List, Tuple, Union
 from enum import Enum, unique
+import re
+import threading
+
+from pybibtex.latexutf8 import purify
 
 
 class Author:
@@ -11,18 +15,59 @@ class Author:
     + its first name, with `author.first` (may be empty),
     + its "von" part, with `author.von` (may be empty),
     + its "jr" part, with `author.jr` (may be empty).
+
+    Authors are immutable and hashable, so that they can be shared (e.g., by `pybibtex.authorcache`),
+    and used in sets or as keys of dictionaries.
+    They are ordered by `sort_key` (then by their parts, so that the order is consistent with ``==``).
     """
 
+    __slots__ = ('first', 'last', 'von', 'jr', '_hash', '_sort_key', '_order')
+
+    first: str  #: author first name (may be empty)
+    last: str  #: author last name (never empty)
+    von: str  #: author "von" part (may be empty)
+    jr: str  #: author "jr" part (may be empty)
+
     def __init__(self, first: str, last: str, von: str = '', jr: str = ''):
         """Initialize the object
         """
         if not last:
             raise Exception('last must not be empty')
 
-        self.first = first  #: author first name (may be empty)
-        self.last = last  #: author last name (never empty)
-        self.von = von  #: author "von" part (may be empty)
-        self.jr = jr  #: author "jr" part (may be empty)
+        setattr_ = object.__setattr__
+        setattr_(self, 'first', first)
+        setattr_(self, 'last', last)
+        setattr_(self, 'von', von)
+        setattr_(self, 'jr', jr)
+        setattr_(self, '_hash', None)
+        setattr_(self, '_sort_key', None)
+        setattr_(self, '_order', None)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('Author is immutable')
+
+    def __delattr__(self, item):
+        raise AttributeError('Author is immutable')
+
+    def __reduce__(self):
+        return Author, (self.first, self.last, self.von, self.jr)
+
+    @property
+    def sort_key(self) -> Tuple[str, str, str]:
+        """Key to sort authors, as BibTeX does: by "von" and last name, then by first name, then by "jr" part
+        (see `pybibtex.latexutf8.purify()` for the normalization, which decodes the LaTeX accents).
+
+        It is computed on first access, then kept.
+        """
+
+        if self._sort_key is None:
+            object.__setattr__(self, '_sort_key', (
+                purify('{} {}'.format(self.von, self.last) if self.von else self.last),
+                purify(self.first),
+                purify(self.jr)
+            ))
+
+        return self._sort_key
 
     def __str__(self):
         """Return the author in the "comma" form (since it is the only one which handle "jr")
@@ -49,30 +94,62 @@ class Author:
 
         return self.first == other.first and self.last == other.last and self.jr == other.jr and self.von == other.von
 
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash((self.first, self.last, self.von, self.jr)))
+
+        return self._hash
+
+    def _make_order(self) -> tuple:
+        object.__setattr__(self, '_order', self.sort_key + (self.von, self.last, self.first, self.jr))
+        return self._order
+
+    def __lt__(self, other: 'Author'):
+        if type(other) is not Author:
+            return NotImplemented
+
+        return (self._order or self._make_order()) < (other._order or other._make_order())
+
+    def __le__(self, other: 'Author'):
+        if type(other) is not Author:
+            return NotImplemented
+
+        return (self._order or self._make_order()) <= (other._order or other._make_order())
+
+    def __gt__(self, other: 'Author'):
+        if type(other) is not Author:
+            return NotImplemented
+
+        return (self._order or self._make_order()) > (other._order or other._make_order())
+
+    def __ge__(self, other: 'Author'):
+        if type(other) is not Author:
+            return NotImplemented
+
+        return (self._order or self._make_order()) >= (other._order or other._make_order())
+
 
 @unique
 class AuthorTokenType(Enum):
     COMMA = ','
-    LETTER = 'LET'
-    BRACEDITEM = 'ITM'
-    SPECIALCHAR = 'SCH'
+    WORD = 'WRD'
     SPACE = 'SPC'
     EOS = '\0'
 
 
-AUTHOR_SYMBOL_TR = {
-    ',': AuthorTokenType.COMMA,
-    ' ': AuthorTokenType.SPACE
-}
+SPACES = re.compile(r' +')
+LETTERS = re.compile(r'[^ ,{]+')
+BRACES = re.compile(r'[{}]')
 
 
 class AuthorToken:
-    def __init__(self, typ_: AuthorTokenType, value: str, position: int = -1):
+    def __init__(self, typ_: AuthorTokenType, value: str, position: int = -1, capitalization: int = -1):
         """Initialize the object
         """
         self.type = typ_
         self.value = value
         self.position = position
+        self.capitalization = capitalization  #: capitalization, for a ``WORD``
 
     def __repr__(self):
         return "Token({}, '{}'{})".format(
@@ -224,40 +301,85 @@ class AuthorsParser:
             raise AuthorParserSyntaxError('expected {}, got {}'.format(typ, self.current_token))
 
     def tokenize(self) -> Iterator[AuthorToken]:
+        """Get the tokens, where a ``WORD`` is a sequence of
+
+        + letters (anything but a space, a comma or a brace),
+        + braced items (``{...}``, with matching braces),
+        + special characters (braced items starting by a backslash: ``{\\...}``),
+
+        and its capitalization is precomputed (see `word()`).
+        """
+
+        inp = self.input
+        length = len(inp)
         i = 0
-        while i < len(self.input):
-            current_char = self.input[i]
-            if current_char in AUTHOR_SYMBOL_TR:
-                yield AuthorToken(AUTHOR_SYMBOL_TR[current_char], current_char, i)
-            elif current_char == '{':
-                j = i + 1
-                is_special = False
-                opening_level = 1
-                while j < len(self.input):
-                    cc = self.input[j]
-                    if j == i + 1 and cc == '\\':
-                        is_special = True
-                    if cc == '{':
-                        opening_level += 1
-                    elif cc == '}':
-                        opening_level -= 1
-                        if opening_level == 0:
-                            break
-                    j += 1
-                if opening_level != 0:
-                    raise AuthorParserSyntaxError('unmatched braces while EOS!')
-                else:
-                    yield AuthorToken(
-                        AuthorTokenType.BRACEDITEM if not is_special else AuthorTokenType.SPECIALCHAR,
-                        self.input[i:j + 1],
-                        i)
-                    i = j
+
+        while i < length:
+            current_char = inp[i]
+            if current_char == ',':
+                yield AuthorToken(AuthorTokenType.COMMA, current_char, i)
+                i += 1
+            elif current_char == ' ':
+                j = SPACES.match(inp, i).end()
+                yield AuthorToken(AuthorTokenType.SPACE, inp[i:j], i)
+                i = j
             else:
-                yield AuthorToken(AuthorTokenType.LETTER, current_char, i)
+                start = i
+                capitalization = None
+                while i < length and inp[i] not in ' ,':
+                    if inp[i] == '{':
+                        j = self._closing_brace(i)
+                        if capitalization is None and inp[i + 1] == '\\':
+                            capitalization = self._special_char_capitalization(inp[i:j + 1])
+                        i = j + 1
+                    else:
+                        j = LETTERS.match(inp, i).end()
+                        if capitalization is None:
+                            for c in inp[i:j]:
+                                if c.isalpha():
+                                    capitalization = 1 if c.upper() == c else 0
+                                    break
+                        i = j
+
+                yield AuthorToken(
+                    AuthorTokenType.WORD, inp[start:i], start, -1 if capitalization is None else capitalization)
 
+        yield AuthorToken(AuthorTokenType.EOS, '\0', i)
+
+    def _closing_brace(self, i: int) -> int:
+        """Get the position of the brace matching the one at position ``i``
+        """
+
+        opening_level = 0
+        for brace in BRACES.finditer(self.input, i):
+            if brace.group() == '{':
+                opening_level += 1
+            else:
+                opening_level -= 1
+                if opening_level == 0:
+                    return brace.start()
+
+        raise AuthorParserSyntaxError('unmatched braces while EOS!')
+
+    @staticmethod
+    def _special_char_capitalization(value: str) -> int:
+        """Get the capitalization of a special character, which is the one of its argument (if any)
+        """
+
+        # quick and dirty look for argument
+        i = 2
+
+        # skip command name
+        if value[i].isalpha():
+            while i < len(value) and value[i].isalpha():
+                i += 1
+
+        # take next alpha (should be the argument)
+        while i < len(value) and not value[i].isalnum():
             i += 1
 
-        yield AuthorToken(AuthorTokenType.EOS, '\0', i)
+        if i < len(value):
+            return 1 if value[i].upper() == value[i] else 0
 
     def skip_empty(self):
         """Skip spaces
@@ -302,9 +424,7 @@ class AuthorsParser:
 
         self.skip_empty()
         while self.current_token.type != AuthorTokenType.EOS:
-            if self.current_token.type in [
-                AuthorTokenType.LETTER, AuthorTokenType.BRACEDITEM, AuthorTokenType.SPECIALCHAR
-            ]:
+            if self.current_token.type == AuthorTokenType.WORD:
                 word, capitalization = self.word()
 
                 if word.lower() == 'and':
@@ -340,47 +460,239 @@ class AuthorsParser:
         + ``0`` if it is lowercase,
         + ``1`` if it is uppercase
 
-        A ``BRACEDITEM`` has no case, but a special character has the one of its argument
+        A braced item has no case, but a special character has the one of its argument.
+        The capitalization of the word is the one of its first letter that has a case.
+        """
 
-        ```text
-        c := LETTER
-          | BRACEDITEM
-          | SPECIALCHAR
-          ;
+        if self.current_token.type != AuthorTokenType.WORD:
+            return '', -1
 
-        word := c c* ;
-        ```
+        word, capitalization = self.current_token.value, self.current_token.capitalization
+        self.next()
+
+        return word, capitalization
+
+
+AND_SEPARATOR = re.compile(r'(?:^|(?<=[ ,]))[aA][nN][dD](?=[ ,]|$)')
+
+
+def split_names(inp: str) -> Iterator[str]:
+    """Split a list of names on the ``and`` that are not enclosed in braces,
+    without parsing the names themselves.
+
+    Parameters:
+        inp: input string
+    """
+
+    prev = 0
+    scanned = 0
+    depth = 0
+    check_depth = '{' in inp
+
+    for match in AND_SEPARATOR.finditer(inp):
+        if check_depth:
+            for brace in BRACES.finditer(inp, scanned, match.start()):
+                if brace.group() == '{':
+                    depth += 1
+                elif depth > 0:  # outside braces, `}` is a letter
+                    depth -= 1
+
+            scanned = match.start()
+            if depth > 0:
+                continue
+
+        yield inp[prev:match.start()].strip(' ')
+        prev = match.end()
+
+    yield inp[prev:].strip(' ')
+
+
+_UPPER_WORD = r"[A-Z][A-Za-z.'\-]*"
+_WORD = r"[A-Za-z][A-Za-z.'\-]*"
+
+# (used with ``fullmatch()``, since ``$`` would also accept a trailing newline, that `AuthorsParser` keeps)
+FAST_COMMA_FORM = re.compile(r'({u}(?: +{u})*|{w}) *, *({w}(?: +{w})*)?'.format(u=_UPPER_WORD, w=_WORD))
+FAST_NATURAL_FORM = re.compile(r'(?:({u}(?: +{u})*) +)?({w})'.format(u=_UPPER_WORD, w=_WORD))
+
+
+def parse_name(inp: str) -> Author:
+    """Get the `Author` corresponding to a single name.
+
+    The common ASCII forms ("Last, First" and "First Last", where the words are capitalized) are directly handled,
+    while the other cases are handled by `AuthorsParser`.
+
+    Parameters:
+        inp: input string, without any ``and``
+    """
+
+    match = FAST_COMMA_FORM.fullmatch(inp)
+    if match:
+        return Author(' '.join((match.group(2) or '').split()), ' '.join(match.group(1).split()))
+
+    match = FAST_NATURAL_FORM.fullmatch(inp)
+    if match:
+        return Author(' '.join((match.group(1) or '').split()), match.group(2))
+
+    return AuthorsParser(inp).authors()[0]
+
+
+class AuthorsColumns:
+    """Authors, stored as columns.
+
+    The authors are available as `first`, `von`, `last` and `jr` lists,
+    while `source` contains the index of the input string the author comes from.
+    """
+
+    def __init__(self):
+        """Initialize the object
         """
 
-        check_capitalization = True
-        capitalization = -1
-        word = ''
-        while self.current_token.type in [
-            AuthorTokenType.LETTER, AuthorTokenType.BRACEDITEM, AuthorTokenType.SPECIALCHAR
-        ]:
-            value = self.current_token.value
-            if check_capitalization:
-                if self.current_token.type == AuthorTokenType.LETTER and value.isalpha():
-                    capitalization = 1 if value.upper() == value else 0
-                    check_capitalization = False
-                elif self.current_token.type == AuthorTokenType.SPECIALCHAR:
-                    # quick and dirty look for argument
-                    i = 2
-
-                    # skip command name
-                    if value[i].isalpha():
-                        while i < len(value) and value[i].isalpha():
-                            i += 1
-
-                    # take next alpha (should be the argument)
-                    while i < len(value) and not value[i].isalnum():
-                        i += 1
-
-                    if i < len(value):
-                        capitalization = 1 if value[i].upper() == value[i] else 0
-                        check_capitalization = False
-
-            word += value
-            self.next()
+        self.first: List[str] = []
+        self.von: List[str] = []
+        self.last: List[str] = []
+        self.jr: List[str] = []
+        self.source: List[int] = []
 
-        return word, capitalization
+    def append(self, author: Author, source: int):
+        self.first.append(author.first)
+        self.von.append(author.von)
+        self.last.append(author.last)
+        self.jr.append(author.jr)
+        self.source.append(source)
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def __getitem__(self, item: int) -> Author:
+        return Author(self.first[item], self.last[item], von=self.von[item], jr=self.jr[item])
+
+
+def parse_authors_bulk(inputs: Iterable[str]) -> AuthorsColumns:
+    """Get the authors of a list of strings (e.g., all the ``author`` fields of a database).
+
+    The strings without braces or backslashes are split, and their names go through the fast path of
+    `parse_name()`, which is several times faster than `AuthorsParser` on plain "Last, First" and "First Last" names.
+    The other strings (braced words, special characters) are given as a whole to `AuthorsParser`,
+    so that they cost no more than with it.
+
+    Parameters:
+        inputs: the input strings
+
+    Returns:
+        The authors, as columns
+    """
+
+    columns = AuthorsColumns()
+
+    for i, inp in enumerate(inputs):
+        if '{' in inp or '\\' in inp:
+            authors = AuthorsParser(inp).authors()
+        else:
+            authors = (parse_name(name) for name in split_names(inp))
+
+        for author in authors:
+            columns.append(author, i)
+
+    return columns
+
+
+class LazyAuthors:
+    """Sequence of `Author`, where the names are only parsed when accessed.
+
+    It can be indexed (or sliced) and iterated like a list, while ``len()`` only requires to split the names.
+    If the last name is ``others`` (as in ``Smith, J. and others``), it is not part of the sequence,
+    but `others` is set to ``True``.
+
+    It can be shared between threads: the names are split under a lock (see `_fetch()`),
+    while parsing the same name twice at once is harmless.
+    """
+
+    def __init__(self, inp: str):
+        """Initialize the object
+
+        Parameters:
+            inp: input string
+        """
+
+        self.input = inp
+
+        self._names: List[str] = []
+        self._authors: List[Author] = []
+        self._names_iterator = self._iter_names() if inp.strip(' ') else None
+        self._others = False
+        self._lock = threading.Lock()
+
+    def _iter_names(self) -> Iterator[str]:
+        previous = None
+        for name in split_names(self.input):
+            if previous is not None:
+                yield previous
+            previous = name
+
+        if previous == 'others':
+            self._others = True
+        else:
+            yield previous
+
+    def _fetch(self, n: int = -1):
+        """Split the names until ``n`` are available (or all of them, if ``n < 0``).
+
+        The iterator of names is only advanced under the lock, and the slot of an author is added before its name,
+        so that a name is never visible without its slot.
+        """
+
+        if self._names_iterator is None or 0 <= n <= len(self._names):
+            return
+
+        with self._lock:
+            while self._names_iterator is not None and (n < 0 or len(self._names) < n):
+                try:
+                    name = next(self._names_iterator)
+                except StopIteration:
+                    self._names_iterator = None
+                else:
+                    self._authors.append(None)
+                    self._names.append(name)
+
+    @property
+    def others(self) -> bool:
+        """Whether the list ends with ``and others``"""
+
+        self._fetch()
+        return self._others
+
+    def __len__(self) -> int:
+        self._fetch()
+        return len(self._names)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[Author, List[Author]]:
+        if isinstance(item, slice):
+            if item.start is None and item.step is None and item.stop is not None and item.stop >= 0:
+                self._fetch(item.stop)
+                return [self[i] for i in range(min(item.stop, len(self._names)))]
+
+            return [self[i] for i in range(*item.indices(len(self)))]
+
+        if item < 0:
+            self._fetch()
+        else:
+            self._fetch(item + 1)
+
+        author = self._authors[item]
+        if author is None:
+            author = self._authors[item] = parse_name(self._names[item])
+
+        return author
+
+    def __iter__(self) -> Iterator[Author]:
+        i = 0
+        while True:
+            self._fetch(i + 1)
+            if i >= len(self._names):
+                break
+
+            yield self[i]
+            i += 1
+
+    def __repr__(self) -> str:
+        return 'LazyAuthors({!r})'.format(self.input)
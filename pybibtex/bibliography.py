@@ -1,6 +1,14 @@
-from typing import Dict, Iterable, List
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice, repeat
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Union
+import re
 
-from pybibtex.authors import AuthorsParser, Author
+from pybibtex.authors import Author, LazyAuthors
+from pybibtex.latexutf8 import purify
+
+SORT_MAX_AUTHORS = 3  #: number of authors (or editors) used to sort
+SORT_TITLE_ARTICLE = re.compile(r'^(?:a|an|the) ')
+SORT_YEAR = re.compile(r'\d+')
 
 
 class Item:
@@ -18,18 +26,135 @@ class Item:
         self.cite_key = cite_key  #: citation key
         self.item_type = item_type.lower()  #: item type (article, book, ...)
         self.fields = fields
+        self.span = None  #: position of the item in the source, as ``(start, end)``, if parsed
+        self.source_path = None  #: path of the file the item comes from, if loaded from a file
+
+        self._cache = {}
 
-    def authors(self, possible_fields: Iterable[str] = ('author', 'Author', 'AUTHOR')) -> List[Author]:
+    def authors(
+            self, possible_fields: Iterable[str] = ('author', 'Author', 'AUTHOR'), limit: int = None) -> List[Author]:
         """Get a list of ``Authors``.
 
         Parameters:
             possible_fields: looks for the fields in ``possible_fields`` to get the authors, stops when found.
+            limit: only get the first ``limit`` authors (the other ones are not parsed).
+
+        !!! note
+            A trailing ``and others`` is not part of the list (see `lazy_authors()`).
         """
+
+        return self.lazy_authors(possible_fields)[:limit]
+
+    def lazy_authors(self, possible_fields: Iterable[str] = ('author', 'Author', 'AUTHOR')) -> LazyAuthors:
+        """Get a sequence of ``Authors``, where the names are parsed on demand.
+        The sequence is cached as long as the field is not modified.
+
+        Parameters:
+            possible_fields: looks for the fields in ``possible_fields`` to get the authors, stops when found.
+        """
+
         for f in possible_fields:
             if f in self.fields:
-                return AuthorsParser(self.fields[f]).authors()
+                value = self.fields[f]
+                authors = self._cache.get(('authors', f))
+                if authors is None or authors.input is not value:
+                    authors = self._cache[('authors', f)] = LazyAuthors(value)
+
+                return authors
+
+        return LazyAuthors('')
+
+    def get_field(self, name: str) -> str:
+        """Get a field, with a case insensitive lookup (the field must exist).
+        """
+
+        if name in self.fields:
+            return self.fields[name]
+
+        name = name.lower()
+        for key, value in self.fields.items():
+            if key.lower() == name:
+                return value
+
+        raise KeyError(name)
+
+    def _sort_source(self, name: str) -> Any:
+        """Get the value the sort key of a field (in lowercase) is computed from (``None`` if it is missing)
+        """
+
+        if name == 'key':
+            return self.cite_key
+        if name == 'type':
+            return self.item_type
+        if name in ('author', 'editor'):
+            for f in (name, name.capitalize(), name.upper()):
+                if f in self.fields:
+                    return self.fields[f]
+            return None
+
+        try:
+            return self.get_field(name)
+        except KeyError:
+            return None
+
+    def _has_sort_key(self, field: str) -> bool:
+        """Check whether the sort key of a field is cached (and still valid)"""
+
+        cached = self._cache.get(('sort', field))
+        return cached is not None and cached[0] is self._sort_source(field.lower())
+
+    def sort_key(self, field: str) -> Tuple[int, Any]:
+        """Get the key used to sort the items according to ``field``, as ``(missing, value)``.
+        The key is cached as long as the value it is computed from is not modified
+        (as for `lazy_authors()`, even if ``item.fields`` is modified directly).
+
+        + For ``author`` and ``editor``, the value is a tuple of the keys of the first authors
+          (see `pybibtex.authors.Author.sort_key`);
+        + For ``year``, the value is an integer;
+        + For ``key`` and ``type``, the value is the (lowercase) citation key and the item type;
+        + For the other fields, the value is normalized (see `pybibtex.latexutf8.purify()`),
+          and leading articles are removed from ``title``.
+
+        Parameters:
+            field: the field (case insensitive)
+        """
+
+        name = field.lower()
+        source = self._sort_source(name)
+        cached = self._cache.get(('sort', field))
+        if cached is not None and cached[0] is source:
+            return cached[1]
+
+        if name == 'key':
+            key = (0, self.cite_key.lower())
+        elif name == 'type':
+            key = (0, self.item_type)
+        elif name in ('author', 'editor'):
+            authors = self.authors((name, name.capitalize(), name.upper()), limit=SORT_MAX_AUTHORS)
+            key = (0, tuple(a.sort_key for a in authors)) if authors else (1, ())
+        else:
+            value = '' if source is None else source
 
-        return []
+            if name == 'year':
+                year = SORT_YEAR.search(value)
+                key = (0, int(year.group())) if year else (1, 0)
+            else:
+                value = purify(value)
+                if name == 'title':
+                    value = SORT_TITLE_ARTICLE.sub('', value)
+                key = (0 if value else 1, value)
+
+        self._cache[('sort', field)] = source, key
+        return key
+
+    def __reduce__(self):
+        """Pickle the item as a compact tuple (the cache is not included)"""
+
+        state = (self.cite_key, self.item_type, self.fields)
+        if self.span is not None or self.source_path is not None:
+            state += (self.span, self.source_path)
+
+        return _item_from_state, state
 
     def __repr__(self) -> str:
         return "Item('{}', '{}')".format(self.cite_key, self.item_type)
@@ -39,6 +164,8 @@ class Item:
 
     def __setitem__(self, key, value):
         self.fields[key] = value
+        self.span = None  # the item does not match its source anymore
+        self._cache.clear()
 
     def __contains__(self, item: str) -> bool:
         return item in self.fields
@@ -53,6 +180,28 @@ class Item:
             ',\n  '.join('{} = {{{}}}'.format(k, v) for k, v in self.fields.items()))
 
 
+def _item_from_state(
+        cite_key: str, item_type: str, fields: dict, span: Tuple[int, int] = None, source_path: str = None) -> Item:
+    """Rebuild an item (see `Item.__reduce__()`)"""
+
+    item = Item(cite_key, item_type, fields)
+    item.span = span
+    item.source_path = source_path
+    return item
+
+
+def _sort_keys(items: List[Tuple[str, str, dict]], fields: Sequence[str]) -> List[List[Tuple[int, Any]]]:
+    """Compute the sort keys of items given as ``(cite_key, item_type, fields)`` (used by `Database.sort()`)
+    """
+
+    keys = []
+    for cite_key, item_type, item_fields in items:
+        item = Item(cite_key, item_type, item_fields)
+        keys.append([item.sort_key(field) for field in fields])
+
+    return keys
+
+
 class Database:
     """Database of bibliographic items
 
@@ -62,8 +211,31 @@ class Database:
         The `cite_key` are considered to be case insensitive in lookup.
     """
 
-    def __init__(self, db: Dict[str, Item] = None):
+    source: str = None  #: the parsed input (in lossless mode)
+    encoding: str = None  #: encoding of the parsed input, if it was bytes (see `pybibtex.parser.BytesParser`)
+    layout: List[Union[Tuple[int, int], Tuple[str, int, int]]] = None  #: the layout of the input (in lossless mode)
+
+    def __init__(
+        self,
+        db: Dict[str, Item] = None,
+        preambles: List[str] = None,
+        source: str = None,
+        layout: List[Union[Tuple[int, int], Tuple[str, int, int]]] = None
+    ):
+        """Initialize the object
+
+        Parameters:
+            db: the items, with their (lowercase) citation key
+            preambles: the values of the ``@preamble``
+            source: the parsed input (in lossless mode)
+            layout: the layout of the input, as a list of spans of text, ``(start, end)``,
+                and spans of items, ``(key, start, end)`` (in lossless mode)
+        """
+
         self.db = {} if db is None else db
+        self.preambles = [] if preambles is None else preambles
+        self.source = source
+        self.layout = layout
 
     def __getitem__(self, item: str) -> Item:
         return self.db[item.lower()]
@@ -74,14 +246,243 @@ class Database:
     def __iter__(self) -> Iterable[str]:
         yield from self.db
 
+    def __len__(self) -> int:
+        return len(self.db)
+
     def iter_item(self) -> Iterable[Item]:
         yield from self.db.values()
 
+    def view(
+            self,
+            keys: Iterable[str] = None,
+            predicate: Callable[[Item], bool] = None,
+            item_types: Iterable[str] = None
+    ) -> 'DatabaseView':
+        """Get a view on the items of this database (nothing is copied).
+
+        Parameters:
+            keys: only the items with these citation keys (in this order)
+            predicate: only the items for which ``predicate(item)`` is ``True``
+            item_types: only the items of these types
+        """
+
+        if item_types is not None:
+            item_types = frozenset(t.lower() for t in item_types)
+            other_predicate = predicate
+
+            def _predicate(item: Item) -> bool:
+                return item.item_type in item_types and (other_predicate is None or other_predicate(item))
+
+            predicate = _predicate
+
+        return DatabaseView(self, keys=keys, predicate=predicate)
+
+    def slice(self, start: int, stop: int = None) -> 'DatabaseView':
+        """Get a view on the items from position ``start`` to ``stop`` (excluded)
+        """
+
+        return DatabaseView(self, keys=list(islice(self, start, stop)))
+
+    def filter(self, query) -> 'DatabaseView':
+        """Get a view on the items that match a query (the items are not copied).
+
+        Parameters:
+            query: a query (see `pybibtex.query`) or a function that takes an item and returns a boolean
+        """
+
+        if callable(query):
+            predicate, keys = query, None
+        else:
+            predicate, keys = query.compile(), query.candidates(self)
+
+        items = self.iter_item() if keys is None else (self[k] for k in keys if k in self)
+        return DatabaseView(self, keys=[i.cite_key.lower() for i in items if predicate(i)])
+
+    def sort(
+            self, by: Sequence[str] = ('author', 'year', 'title'), processes: int = None, chunk_size: int = 10000
+    ) -> List[Item]:
+        """Get the items, sorted.
+
+        The sort key of each item is computed once, and cached (see `Item.sort_key()`).
+
+        Parameters:
+            by: the fields to sort by (e.g., ``('author', '-year')``): if the name of a field starts with ``-``,
+                the order is reversed for this field (the items without this field are still last).
+            processes: if set, compute the sort keys (that are not cached) with a pool of ``processes`` processes.
+            chunk_size: number of items sent to a process at once.
+        """
+
+        items = list(self.iter_item())
+        fields = [(f[1:], True) if f[0] == '-' else (f, False) for f in by]
+
+        if processes is not None:
+            names = [f for f, _ in fields]
+            missing = [i for i in items if not all(i._has_sort_key(f) for f in names)]
+            chunks = [
+                [(i.cite_key, i.item_type, i.fields) for i in missing[j:j + chunk_size]]
+                for j in range(0, len(missing), chunk_size)
+            ]
+
+            with ProcessPoolExecutor(processes) as executor:
+                keys = chain.from_iterable(executor.map(_sort_keys, chunks, repeat(names)))
+                for item, item_keys in zip(missing, keys):
+                    for f, key in zip(names, item_keys):
+                        item._cache[('sort', f)] = item._sort_source(f.lower()), key
+
+        # stable sorts, from the least significant field to the most significant one
+        for field, reverse in reversed(fields):
+            if reverse:  # reverse the values, but keep the items with a missing value last
+                items.sort(key=lambda i: i.sort_key(field)[1], reverse=True)
+                items.sort(key=lambda i: i.sort_key(field)[0])
+            else:
+                items.sort(key=lambda i: i.sort_key(field))
+
+        return items
+
+    def to_tuple(self) -> tuple:
+        """Get a compact representation of the database, made of tuples, strings, integers and ``None``
+        (so that it can be serialized with `marshal`, see `pybibtex.serialization`).
+
+        The names of the fields and the item types are stored once, in a table,
+        and each item is a ``(cite_key, type, fields)`` tuple, where ``type`` and the names of the fields
+        are indices in the table (``fields`` alternates names and values).
+        The cache of the items is not included.
+        """
+
+        names: Dict[str, int] = {}
+        records = []
+
+        for item in self.iter_item():
+            fields = []
+            for name, value in item.fields.items():
+                fields.append(names.setdefault(name, len(names)))
+                fields.append(value)
+
+            record = (item.cite_key, names.setdefault(item.item_type, len(names)), tuple(fields))
+            if item.span is not None or item.source_path is not None:
+                record += (item.span, item.source_path)
+
+            records.append(record)
+
+        state = (tuple(names), tuple(records), tuple(self.preambles))
+        if self.layout is not None:
+            state += (self.source, tuple(self.layout), self.encoding)
+
+        return state
+
+    @staticmethod
+    def from_tuple(state: tuple) -> 'Database':
+        """Get a database out of its compact representation (see `to_tuple()`)"""
+
+        names, records, preambles = state[:3]
+        name = names.__getitem__
+        db = {}
+
+        for record in records:
+            fields = record[2]
+            item = Item(record[0], names[record[1]], dict(zip(map(name, fields[::2]), fields[1::2])))
+            if len(record) > 3:
+                item.span, item.source_path = record[3:]
+
+            db[item.cite_key.lower()] = item
+
+        database = Database(db, preambles=list(preambles))
+        if len(state) > 3:
+            database.source, layout, database.encoding = state[3:]
+            database.layout = list(layout)
+
+        return database
+
+    def __reduce__(self):
+        """Pickle the database as a compact tuple (see `to_tuple()`)"""
+
+        return Database.from_tuple, (self.to_tuple(), )
+
     def __repr__(self):
-        return ', '.join('@{}({})'.format(i.item_type, i.cite_key) for i in self.db.values())
+        return ', '.join('@{}({})'.format(i.item_type, i.cite_key) for i in self.iter_item())
 
     def __str__(self) -> str:
         """Outputs bibtex database
         """
 
-        return '\n'.join(str(item) for item in self.db.values())
+        return '\n'.join(chain(
+            ('@preamble{{{{{}}}}}'.format(preamble) for preamble in self.preambles),
+            (str(item) for item in self.iter_item())
+        ))
+
+
+class DatabaseView(Database):
+    """View on (a part of) the items of a database, with the same interface.
+
+    Nothing is copied: the items are looked up in the parent database when accessed,
+    so that the changes in the parent are visible in the view.
+    """
+
+    def __init__(self, parent: Database, keys: Iterable[str] = None, predicate: Callable[[Item], bool] = None):
+        """Initialize the object
+
+        Parameters:
+            parent: the parent database
+            keys: only the items with these citation keys (in this order)
+            predicate: only the items for which ``predicate(item)`` is ``True``
+        """
+
+        self.parent = parent
+        self.keys = None if keys is None else [k.lower() for k in keys]
+        self.predicate = predicate
+
+        self._key_set = None if keys is None else frozenset(self.keys)
+
+    @property
+    def preambles(self) -> List[str]:
+        return self.parent.preambles
+
+    @property
+    def db(self) -> Dict[str, Item]:
+        """Get the items as a dictionary (which is built on each call!)"""
+
+        return dict(zip(self, self.iter_item()))
+
+    def _iter_pairs(self) -> Iterable[Tuple[str, Item]]:
+        if self.keys is None:
+            pairs = zip(self.parent, self.parent.iter_item())
+        else:
+            pairs = ((k, self.parent[k]) for k in self.keys if k in self.parent)
+
+        if self.predicate is None:
+            yield from pairs
+        else:
+            yield from ((k, i) for k, i in pairs if self.predicate(i))
+
+    def __getitem__(self, item: str) -> Item:
+        key = item.lower()
+        if self._key_set is not None and key not in self._key_set:
+            raise KeyError(item)
+
+        value = self.parent[key]
+        if self.predicate is not None and not self.predicate(value):
+            raise KeyError(item)
+
+        return value
+
+    def __contains__(self, item) -> bool:
+        try:
+            self[item]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterable[str]:
+        if self.predicate is None and self.keys is not None:
+            yield from (k for k in self.keys if k in self.parent)
+        else:
+            yield from (k for k, _ in self._iter_pairs())
+
+    def __len__(self) -> int:
+        if self.predicate is None:
+            return len(self.parent) if self.keys is None else sum(1 for _ in self)
+
+        return sum(1 for _ in self._iter_pairs())
+
+    def iter_item(self) -> Iterable[Item]:
+        yield from (i for _, i in self._iter_pairs())
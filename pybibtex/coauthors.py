@@ -0,0 +1,244 @@
+from array import array
+from itertools import accumulate, combinations
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, TextIO, Tuple, Union
+import csv
+
+from pybibtex.authors import Author, parse_name, split_names
+from pybibtex.bibliography import Database, Item
+
+ID_BITS = 32  #: the edges are stored as ``(i << ID_BITS) | j``, with ``i < j``
+ID_MASK = (1 << ID_BITS) - 1
+
+
+def canonical_key(author: Author) -> Hashable:
+    """Get the key identifying an author in a `CoauthorGraph`: its sort key (see `pybibtex.authors.Author.sort_key`),
+    so that the LaTeX accents, the case and the punctuation do not matter
+    (e.g., ``M{\\"u}ller, J.`` and ``Müller, J`` are the same author)
+    """
+
+    return author.sort_key
+
+
+class CoauthorGraph:
+    """Co-authorship graph: the nodes are the authors, and two authors are linked if they wrote an item together,
+    the weight of the edge being the number of such items.
+
+    Each author gets an id (in the order in which they are found), and `authors` gives the first form
+    in which each author was found.
+    The edges are accumulated as items are added (or removed), while the compact adjacency structure (see `csr()`)
+    is only built when requested, and kept until the next update.
+    """
+
+    def __init__(
+            self,
+            fields: Iterable[str] = ('author', 'Author', 'AUTHOR'),
+            key: Callable[[Author], Hashable] = canonical_key
+    ):
+        """Initialize the object
+
+        Parameters:
+            fields: the fields containing the authors (the first one found is used)
+            key: function giving the key that identifies an author (see `canonical_key()`)
+        """
+
+        self.fields = tuple(fields)
+        self.key = key
+
+        self.authors: List[Author] = []  #: the authors, by id
+        self.ids: Dict[Hashable, int] = {}  #: the id of each author key
+        self.items = array('i')  #: number of items of each author, by id
+
+        self._names: Dict[str, int] = {}  # id of each name, as written in the items
+        self._edges: Dict[int, int] = {}
+        self._csr: Tuple[array, array, array] = None
+
+    def __len__(self) -> int:
+        """Number of authors"""
+
+        return len(self.authors)
+
+    @property
+    def n_edges(self) -> int:
+        """Number of edges (i.e., of pairs of co-authors)"""
+
+        return len(self._edges)
+
+    def author_id(self, author: Author) -> int:
+        """Get the id of an author (``KeyError`` if it is not in the graph)"""
+
+        return self.ids[self.key(author)]
+
+    def _id(self, name: str, create: bool) -> int:
+        """Get the id of a name, as written in an item (each distinct name is only parsed once)"""
+
+        i = self._names.get(name)
+        if i is not None:
+            return i
+
+        author = parse_name(name)
+        key = self.key(author)
+        i = self.ids.get(key)
+        if i is None:
+            if not create:
+                raise KeyError(author)
+
+            i = self.ids[key] = len(self.authors)
+            self.authors.append(author)
+            self.items.append(0)
+
+        self._names[name] = i
+        return i
+
+    def _item_ids(self, item: Item, create: bool) -> List[int]:
+        """Get the (distinct, sorted) ids of the authors of an item (a trailing ``and others`` is ignored)"""
+
+        for field in self.fields:
+            if field in item.fields:
+                value = item.fields[field]
+                break
+        else:
+            return []
+
+        if not value.strip(' '):
+            return []
+
+        names = list(split_names(value))
+        if names[-1] == 'others':
+            names.pop()
+
+        return sorted(set(self._id(name, create) for name in names))
+
+    def add_item(self, item: Item):
+        """Add the authors of an item, and the edges between them"""
+
+        ids = self._item_ids(item, create=True)
+        edges = self._edges
+
+        for i in ids:
+            self.items[i] += 1
+
+        for i, j in combinations(ids, 2):
+            edge = (i << ID_BITS) | j
+            edges[edge] = edges.get(edge, 0) + 1
+
+        self._csr = None
+
+    def remove_item(self, item: Item):
+        """Remove an item that was added before (it must not have been modified since).
+
+        The authors keep their id, even if they have no item anymore.
+        If the authors of the item (or their edges) are not in the graph, ``KeyError`` is raised,
+        and the graph is left unchanged.
+        """
+
+        ids = self._item_ids(item, create=False)
+        edges = self._edges
+
+        removed = [(i << ID_BITS) | j for i, j in combinations(ids, 2)]
+        for i in ids:
+            if self.items[i] <= 0:
+                raise KeyError(self.authors[i])
+        for edge in removed:
+            if edge not in edges:
+                raise KeyError((self.authors[edge >> ID_BITS], self.authors[edge & ID_MASK]))
+
+        for i in ids:
+            self.items[i] -= 1
+
+        for edge in removed:
+            weight = edges[edge] - 1
+            if weight > 0:
+                edges[edge] = weight
+            else:
+                del edges[edge]
+
+        self._csr = None
+
+    def update(self, items: Union[Database, Iterable[Item]]):
+        """Add the items of a database (walked once, with `pybibtex.bibliography.Database.iter_item()`),
+        or any iterable of items
+        """
+
+        for item in items.iter_item() if isinstance(items, Database) else items:
+            self.add_item(item)
+
+    @classmethod
+    def from_database(cls, database: Union[Database, Iterable[Item]], **kwargs) -> 'CoauthorGraph':
+        """Build the graph of a database (see `update()`, and `__init__()` for the other parameters)"""
+
+        graph = cls(**kwargs)
+        graph.update(database)
+        return graph
+
+    def csr(self) -> Tuple[array, array, array]:
+        """Get the adjacency structure, in the compressed sparse row (CSR) format, as ``(indptr, indices, weights)``:
+        the neighbors of author ``i`` are ``indices[indptr[i]:indptr[i + 1]]`` (sorted by id),
+        and the weights of the corresponding edges are ``weights[indptr[i]:indptr[i + 1]]``.
+
+        Each edge appears in both directions. The arrays can be given as is to ``scipy.sparse.csr_matrix()``.
+        """
+
+        if self._csr is not None:
+            return self._csr
+
+        n = len(self.authors)
+        degrees = [0] * n
+        edges = sorted(self._edges.items())
+
+        for edge, _ in edges:
+            degrees[edge >> ID_BITS] += 1
+            degrees[edge & ID_MASK] += 1
+
+        indptr = array('q', accumulate([0] + degrees))
+        indices = array('i', bytes(4 * indptr[-1]))
+        weights = array('i', bytes(4 * indptr[-1]))
+
+        # (since the edges are sorted, the neighbors of each author are added in increasing order)
+        fill = list(indptr[:-1])
+        for edge, weight in edges:
+            i, j = edge >> ID_BITS, edge & ID_MASK
+            indices[fill[i]], weights[fill[i]] = j, weight
+            fill[i] += 1
+            indices[fill[j]], weights[fill[j]] = i, weight
+            fill[j] += 1
+
+        self._csr = indptr, indices, weights
+        return self._csr
+
+    def neighbors(self, author: Author) -> List[Tuple[Author, int]]:
+        """Get the co-authors of an author, with the number of items they wrote together"""
+
+        indptr, indices, weights = self.csr()
+        i = self.author_id(author)
+        start, end = indptr[i], indptr[i + 1]
+
+        return [(self.authors[j], w) for j, w in zip(indices[start:end], weights[start:end])]
+
+    def weight(self, author1: Author, author2: Author) -> int:
+        """Get the number of items written together by two authors"""
+
+        i, j = sorted((self.author_id(author1), self.author_id(author2)))
+        return self._edges.get((i << ID_BITS) | j, 0)
+
+    def iter_edges(self) -> Iterator[Tuple[int, int, int]]:
+        """Iterate over the edges, as ``(i, j, weight)`` (with ``i < j``), sorted by ids"""
+
+        for edge, weight in sorted(self._edges.items()):
+            yield edge >> ID_BITS, edge & ID_MASK, weight
+
+    def dump_edges(self, fp: TextIO, delimiter: str = '\t', ids: bool = False):
+        """Write the edge list, one ``source, target, weight`` line per edge (see `csv`)
+
+        Parameters:
+            fp: a file opened in text mode (with ``newline=''``)
+            delimiter: the column delimiter
+            ids: write the ids of the authors instead of their names
+        """
+
+        writer = csv.writer(fp, delimiter=delimiter, lineterminator='\n')
+
+        for i, j, weight in self.iter_edges():
+            if ids:
+                writer.writerow((i, j, weight))
+            else:
+                writer.writerow((self.authors[i], self.authors[j], weight))
@@ -0,0 +1,154 @@
+from typing import Dict, Iterable, List, Set
+
+from pybibtex.bibliography import Database, Item
+
+INHERITANCE_FIELDS = ('crossref', 'xdata')  #: fields that define the parents of an item (never inherited)
+
+
+class CrossrefError(Exception):
+    """Exception raised when the crossref/xdata references form a cycle"""
+    pass
+
+
+class CrossrefResolver:
+    """Resolve the fields that items inherit from the ones they refer to,
+    through ``crossref`` (one parent) or ``xdata`` (a comma separated list of parents).
+
+    A field is inherited if the item does not define it (field names are case insensitive).
+    The fields of the ``xdata`` parents have precedence over the one of the ``crossref`` parent.
+    Missing parents are ignored.
+
+    The resolved items are computed all at once, in topological order, and cached:
+    call `invalidate()` when an item is modified, so that it (and the items that inherit from it) are recomputed.
+    """
+
+    def __init__(self, database: Database):
+        """Initialize the object
+
+        Parameters:
+            database: the database
+        """
+
+        self.database = database
+        self.resolved: Dict[str, Item] = {}
+        self.children: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def parents(item: Item) -> List[str]:
+        """Get the (lowercase) citation keys of the parents of an item, by order of precedence
+        """
+
+        parents = []
+        for name, value in item.fields.items():
+            name = name.lower()
+            if name == 'xdata':
+                parents = [k.strip().lower() for k in value.split(',') if k.strip()] + parents
+            elif name == 'crossref' and value.strip():
+                parents.append(value.strip().lower())
+
+        return parents
+
+    def resolve(self, keys: Iterable[str] = None):
+        """Compute the resolved items (in topological order, so that each item is resolved once).
+
+        Parameters:
+            keys: only resolve these items (and their parents), by default all the items that are not cached
+
+        Raises:
+            CrossrefError: if there is a cycle
+        """
+
+        if keys is None:
+            keys = self.database
+
+        in_progress: Set[str] = set()
+
+        for key in keys:
+            key = key.lower()
+            if key in self.resolved:
+                continue
+
+            # iterative depth-first search, resolving the parents before the children
+            stack = [(key, False)]
+            while stack:
+                current, parents_done = stack.pop()
+                if current in self.resolved or current not in self.database:
+                    continue
+
+                item = self.database[current]
+                parents = [p for p in self.parents(item) if p in self.database]
+
+                if parents_done:
+                    self.resolved[current] = self._merge(item, parents)
+                    in_progress.discard(current)
+                    for parent in parents:
+                        self.children.setdefault(parent, set()).add(current)
+                    continue
+
+                if current in in_progress:
+                    raise CrossrefError('cycle involving {}'.format(current))
+
+                in_progress.add(current)
+                stack.append((current, True))
+                for parent in parents:
+                    if parent in in_progress:
+                        raise CrossrefError('cycle between {} and {}'.format(current, parent))
+                    if parent not in self.resolved:
+                        stack.append((parent, False))
+
+    def _merge(self, item: Item, parents: List[str]) -> Item:
+        """Merge the fields of an item with the (already resolved) ones of its parents
+        """
+
+        if not parents:
+            return item
+
+        fields = dict(item.fields)
+        names = set(k.lower() for k in fields)
+
+        for parent in parents:
+            for name, value in self.resolved[parent].fields.items():
+                name_lower = name.lower()
+                if name_lower not in names and name_lower not in INHERITANCE_FIELDS:
+                    fields[name] = value
+                    names.add(name_lower)
+
+        resolved = Item(item.cite_key, item.item_type, fields)
+        resolved.span = item.span
+        resolved.source_path = item.source_path
+        return resolved
+
+    def invalidate(self, key: str = None):
+        """Remove an item, and the ones that inherit from it, from the cache.
+
+        Parameters:
+            key: the citation key of the item (if ``None``, the whole cache is cleared)
+        """
+
+        if key is None:
+            self.resolved.clear()
+            self.children.clear()
+            return
+
+        stack = [key.lower()]
+        while stack:
+            current = stack.pop()
+            if self.resolved.pop(current, None) is not None:
+                stack.extend(self.children.pop(current, ()))
+
+    def __getitem__(self, item: str) -> Item:
+        """Get an item with the inherited fields.
+        If the item has no parent, this is the item of the database itself.
+        """
+
+        key = item.lower()
+        try:
+            return self.resolved[key]
+        except KeyError:
+            pass
+
+        if key not in self.database:
+            raise KeyError(item)
+
+        self.resolve([key])
+        return self.resolved[key]
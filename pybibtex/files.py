@@ -0,0 +1,190 @@
+from typing import BinaryIO, Iterable, Iterator, Optional
+import bz2
+import codecs
+import gzip
+import lzma
+import queue
+import threading
+
+from pybibtex.bibliography import Database, Item
+from pybibtex.parser import StreamParser, detect_encoding
+
+CHUNK_SIZE = 1 << 16  #: size of the chunks read from the files (in bytes)
+QUEUE_SIZE = 8  #: maximum number of chunks read in advance by the reader thread
+FALLBACK_ENCODING = 'latin-1'  #: encoding used when a stream detected as UTF-8 is not (see `decode_chunks()`)
+
+COMPRESSIONS = (
+    (b'\x1f\x8b', 'gzip', gzip.open),
+    (b'BZh', 'bz2', bz2.open),
+    (b'\xfd7zXZ\x00', 'xz', lzma.open),
+)  #: magic numbers of the supported compression formats, their name, and the function to open them
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Detect the compression of a file, using its magic number.
+
+    Returns:
+        ``'gzip'``, ``'bz2'``, ``'xz'``, or ``None`` if the file is not compressed
+    """
+
+    with open(path, 'rb') as f:
+        magic = f.read(6)
+
+    for prefix, name, _ in COMPRESSIONS:
+        if magic.startswith(prefix):
+            return name
+
+    return None
+
+
+def open_binary(path: str) -> BinaryIO:
+    """Open a (possibly compressed) file in binary mode, decompressing it on the fly.
+    """
+
+    compression = detect_compression(path)
+    for _, name, opener in COMPRESSIONS:
+        if name == compression:
+            return opener(path, 'rb')
+
+    return open(path, 'rb')
+
+
+def iter_chunks(fp: BinaryIO, chunk_size: int = CHUNK_SIZE, threaded: bool = True) -> Iterator[bytes]:
+    """Iterate over the chunks of a file.
+
+    If ``threaded``, the chunks are read (and decompressed) by a separate thread, at most `QUEUE_SIZE` chunks
+    in advance, so that reading overlaps with the processing of the chunks while the memory stays bounded
+    (the decompression functions of `gzip`, `bz2` and `lzma` release the GIL).
+
+    Parameters:
+        fp: a file opened in binary mode
+        chunk_size: size of the chunks
+        threaded: use a reader thread
+    """
+
+    if not threaded:
+        yield from iter(lambda: fp.read(chunk_size), b'')
+        return
+
+    chunks = queue.Queue(QUEUE_SIZE)
+    stop = threading.Event()
+
+    def _reader():
+        try:
+            while not stop.is_set():
+                chunk = fp.read(chunk_size)
+                chunks.put(chunk)
+                if not chunk:
+                    break
+        except Exception as e:
+            chunks.put(e)
+
+    thread = threading.Thread(target=_reader, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            chunk = chunks.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            if not chunk:
+                break
+
+            yield chunk
+    finally:
+        # if the iteration stops before the end, make sure that the reader is not blocked on a full queue
+        stop.set()
+        while thread.is_alive():
+            try:
+                chunks.get_nowait()
+            except queue.Empty:
+                pass
+            thread.join(.01)
+
+
+def decode_chunks(chunks: Iterable[bytes], encoding: str = None, errors: str = 'strict') -> Iterator[str]:
+    """Decode a stream of chunks of bytes.
+
+    If the encoding is detected as UTF-8 (without BOM) on the first chunk, but a later chunk is not valid UTF-8,
+    the rest of the stream is decoded with `FALLBACK_ENCODING` (as `pybibtex.parser.detect_encoding()` does for
+    the whole file), instead of failing.
+
+    Parameters:
+        chunks: the chunks
+        encoding: the encoding (if ``None``, it is detected on the first chunk, see `pybibtex.parser.detect_encoding()`)
+        errors: how to handle decoding errors (see `codecs`)
+    """
+
+    decoder = None
+    fallback = encoding is None
+
+    def _decode(data: bytes, final: bool = False) -> str:
+        nonlocal decoder, fallback
+
+        try:
+            return decoder.decode(data, final)
+        except UnicodeDecodeError:
+            if not fallback:
+                raise
+
+            # (the decoder did not consume anything, so its pending bytes are still the ones of the previous chunks)
+            pending = decoder.getstate()[0]
+            decoder = codecs.getincrementaldecoder(FALLBACK_ENCODING)(errors)
+            fallback = False
+            return decoder.decode(pending + data, final)
+
+    for chunk in chunks:
+        if decoder is None:
+            if encoding is None:
+                encoding = detect_encoding(chunk, partial=True)
+            decoder = codecs.getincrementaldecoder(encoding)(errors)
+            fallback = fallback and codecs.lookup(encoding).name == 'utf-8'
+
+        text = _decode(chunk)
+        if text:
+            yield text
+
+    if decoder is not None:
+        text = _decode(b'', final=True)
+        if text:
+            yield text
+
+
+def iter_file(
+        path: str,
+        encoding: str = None,
+        errors: str = 'strict',
+        chunk_size: int = CHUNK_SIZE,
+        threaded: bool = True,
+        **kwargs
+) -> Iterator[Item]:
+    """Iterate over the items of a (possibly compressed) BibTeX file, as they are parsed.
+
+    Parameters:
+        path: path to the file (compressed with gzip, bzip2 or xz, or not)
+        encoding: the encoding (if ``None``, it is detected on the first chunk, see `pybibtex.parser.detect_encoding()`)
+        errors: how to handle decoding errors (see `codecs`)
+        chunk_size: size of the chunks read from the file
+        threaded: read (and decompress) the file in a separate thread (see `iter_chunks()`)
+        kwargs: other options of the parser (see `pybibtex.parser.StreamParser`)
+    """
+
+    with open_binary(path) as f:
+        yield from StreamParser(
+            decode_chunks(iter_chunks(f, chunk_size, threaded), encoding, errors), **kwargs).iter_item()
+
+
+def parse_file(
+        path: str,
+        encoding: str = None,
+        errors: str = 'strict',
+        chunk_size: int = CHUNK_SIZE,
+        threaded: bool = True,
+        **kwargs
+) -> Database:
+    """Parse a (possibly compressed) BibTeX file (see `iter_file()` for the parameters)
+    """
+
+    with open_binary(path) as f:
+        return StreamParser(
+            decode_chunks(iter_chunks(f, chunk_size, threaded), encoding, errors), **kwargs).parse()
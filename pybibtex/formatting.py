@@ -0,0 +1,318 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from pybibtex.authors import Author
+from pybibtex.bibliography import Database, Item
+from pybibtex.latexutf8 import utf8encode
+
+Getter = Callable[[Any], Optional[str]]
+
+BRACES_TR = str.maketrans('', '', '{}')
+
+
+class TemplateError(Exception):
+    """Exception raised when a template is invalid"""
+    pass
+
+
+def _parse_template(template: str, i: int = 0, closing: str = None) -> Tuple[list, int]:
+    """Get a list of parts out of a template, as
+
+    ```text
+    part := CHAR | '\\' CHAR | '{' name '}' | '[' part* ']' ;
+    template := part* ;
+    ```
+
+    where each part is either a string, a ``('field', name)`` or an ``('optional', parts)`` tuple.
+    """
+
+    parts = []
+    literal = ''
+
+    while i < len(template):
+        c = template[i]
+        if c == '\\' and i + 1 < len(template):
+            literal += template[i + 1]
+            i += 2
+            continue
+
+        if c in '{[]' and literal:
+            parts.append(literal)
+            literal = ''
+
+        if c == '{':
+            j = template.find('}', i)
+            if j < 0:
+                raise TemplateError('unmatched {{ at position {}'.format(i))
+            parts.append(('field', template[i + 1:j].strip()))
+            i = j + 1
+        elif c == '[':
+            subparts, i = _parse_template(template, i + 1, ']')
+            parts.append(('optional', subparts))
+        elif c == ']':
+            if closing != ']':
+                raise TemplateError('unmatched ] at position {}'.format(i))
+            return parts, i + 1
+        else:
+            literal += c
+            i += 1
+
+    if closing is not None:
+        raise TemplateError('unmatched [')
+
+    if literal:
+        parts.append(literal)
+
+    return parts, i
+
+
+def _compile_parts(parts: list, make_getter: Callable[[str], Getter]) -> Getter:
+    """Compile a list of parts into a function that returns ``None`` if one of the fields is missing
+    """
+
+    compiled = []
+    for part in parts:
+        if type(part) is str:
+            compiled.append(lambda ctx, p=part: p)
+        elif part[0] == 'field':
+            compiled.append(lambda ctx, g=make_getter(part[1]): g(ctx) or None)
+        else:
+            optional = _compile_parts(part[1], make_getter)
+            compiled.append(lambda ctx, f=optional: f(ctx) or '')
+
+    compiled = tuple(compiled)
+
+    def _required(ctx) -> Optional[str]:
+        out = []
+        for f in compiled:
+            value = f(ctx)
+            if value is None:
+                return None
+            out.append(value)
+
+        return ''.join(out)
+
+    return _required
+
+
+def compile_template(template: str, make_getter: Callable[[str], Getter]) -> Callable[[Any], str]:
+    """Compile a template into a function.
+
+    In the template, ``{name}`` is replaced by the value given by the getter for ``name``,
+    while ``[...]`` is an optional part, which is dropped if one of the fields inside is missing (or empty).
+    Use a backslash to escape ``{``, ``[`` and ``]``.
+
+    Parameters:
+        template: the template
+        make_getter: function that creates the getter for a given name.
+            The getter is called with the object to format, and returns ``None`` if the value is missing.
+
+    Returns:
+        A function that formats an object (missing fields outside of optional parts are left empty).
+    """
+
+    parts, _ = _parse_template(template)
+    compiled = _compile_parts([('optional', [part]) if type(part) is tuple else part for part in parts], make_getter)
+
+    return lambda ctx: compiled(ctx) or ''
+
+
+def initials(first: str) -> str:
+    """Get the initials of a first name (e.g., ``J.-P. K.`` for ``Jean-Pierre Karl``)
+
+    Parameters:
+        first: the first name
+    """
+
+    out = []
+    for word in first.split():
+        parts = []
+        for part in word.split('-'):
+            if not part:
+                continue
+            if part[0] == '{':  # take the whole braced group (e.g., a special character)
+                end = part.find('}')
+                parts.append((part if end < 0 else part[:end + 1]) + '.')
+            else:
+                parts.append(part[0] + '.')
+        out.append('-'.join(parts))
+
+    return ' '.join(out)
+
+
+def _author_getter(name: str) -> Getter:
+    if name == 'f':
+        return lambda author: initials(author.first)
+    elif name in ('first', 'von', 'last', 'jr'):
+        return lambda author: getattr(author, name)
+    else:
+        raise TemplateError('unknown author field {}'.format(name))
+
+
+class Style:
+    """Citation style, used to format items.
+
+    The templates are compiled once, when the style is created. In an item template,
+
+    + ``{authors}`` and ``{editors}`` are replaced by the list of authors (or editors), formatted with
+      ``author_template`` (which uses ``{first}``, ``{von}``, ``{last}``, ``{jr}``,
+      and ``{f}`` for the initials of the first name),
+    + ``{key}`` and ``{type}`` are replaced by the citation key and the item type,
+    + ``{n}`` is replaced by the number of the reference (when formatting a list of items),
+    + any other ``{name}`` is replaced by the value of the field (case sensitive).
+    """
+
+    def __init__(
+        self,
+        templates: Union[str, Dict[str, str]],
+        author_template: str = '{last}[, {f}]',
+        author_separator: str = ', ',
+        author_last_separator: str = ' and ',
+        max_authors: int = None,
+        et_al: str = ' et al.',
+        to_utf8: bool = False,
+        strip_braces: bool = True
+    ):
+        """Initialize the object
+
+        Parameters:
+            templates: the template for the items, or a dictionary of templates per item type,
+                with a ``'default'`` one
+            author_template: the template for an author
+            author_separator: separator between authors
+            author_last_separator: separator between the two last authors
+            max_authors: if there are more than ``max_authors``, only the first one is kept, followed by ``et_al``
+            et_al: what is added after a truncated list of authors (or a list that ends with ``and others``)
+            to_utf8: convert the LaTeX macros to UTF-8 (see `pybibtex.latexutf8.utf8encode()`)
+            strip_braces: remove the braces from the output
+        """
+
+        if type(templates) is str:
+            templates = {'default': templates}
+
+        if 'default' not in templates:
+            raise TemplateError('no default template')
+
+        self.format_author = compile_template(author_template, _author_getter)
+        self.author_separator = author_separator
+        self.author_last_separator = author_last_separator
+        self.max_authors = max_authors
+        self.et_al = et_al
+        self.to_utf8 = to_utf8
+        self.strip_braces = strip_braces
+
+        self.templates = dict(
+            (item_type.lower(), compile_template(template, self._item_getter))
+            for item_type, template in templates.items()
+        )
+        self._default = self.templates['default']
+
+    def format_authors(self, authors: Iterable[Author], others: bool = False) -> str:
+        """Format a list of authors
+
+        Parameters:
+            authors: the authors
+            others: whether the list should be followed by ``et_al``
+        """
+
+        names = [self.format_author(author) for author in authors]
+
+        if len(names) > 1:
+            formatted = self.author_separator.join(names[:-1]) + self.author_last_separator + names[-1]
+        else:
+            formatted = ''.join(names)
+
+        return formatted + self.et_al if others and formatted else formatted
+
+    def _authors_getter(self, possible_fields: Tuple[str, ...]) -> Getter:
+        def _getter(ctx: Tuple[Item, Optional[int]]) -> str:
+            authors = ctx[0].lazy_authors(possible_fields)
+
+            if self.max_authors is None:
+                return self.format_authors(authors, authors.others)
+
+            first_authors = authors[:self.max_authors + 1]
+            if len(first_authors) > self.max_authors:
+                return self.format_authors(first_authors[:1], True)
+            else:
+                return self.format_authors(first_authors, authors.others)
+
+        return _getter
+
+    def _item_getter(self, name: str) -> Getter:
+        if name == 'authors':
+            return self._authors_getter(('author', 'Author', 'AUTHOR'))
+        elif name == 'editors':
+            return self._authors_getter(('editor', 'Editor', 'EDITOR'))
+        elif name == 'key':
+            return lambda ctx: ctx[0].cite_key
+        elif name == 'type':
+            return lambda ctx: ctx[0].item_type
+        elif name == 'n':
+            return lambda ctx: None if ctx[1] is None else str(ctx[1])
+        else:
+            return lambda ctx: ctx[0].fields.get(name)
+
+    def format(self, item: Item, n: int = None) -> str:
+        """Format an item
+
+        Parameters:
+            item: the item
+            n: the number of the reference (for ``{n}``)
+        """
+
+        formatted = self.templates.get(item.item_type, self._default)((item, n))
+
+        if self.to_utf8:
+            formatted = utf8encode(formatted)
+
+        if self.strip_braces:
+            formatted = formatted.translate(BRACES_TR)
+
+        return formatted
+
+    def format_items(self, items: Iterable[Item], start: int = 1) -> List[str]:
+        """Format a list of items
+
+        Parameters:
+            items: the items
+            start: number of the first reference
+        """
+
+        return [self.format(item, n) for n, item in enumerate(items, start)]
+
+    def format_database(self, database: Database, keys: Iterable[str] = None, start: int = 1) -> List[str]:
+        """Format the items of a database
+
+        Parameters:
+            database: the database
+            keys: the citation keys of the items to format (by default, all of them, in order)
+            start: number of the first reference
+        """
+
+        if keys is None:
+            return self.format_items(database.iter_item(), start)
+        else:
+            return self.format_items((database[key] for key in keys), start)
+
+
+#: APA-like style
+APA = Style(
+    {
+        'default': '[{authors} ][({year}). ]{title}.[ {journal}[, {volume}][({number})][, {pages}].][ doi:{doi}]',
+        'book': '[{authors} ][({year}). ]{title}.[ {publisher}.][ doi:{doi}]',
+        'inproceedings': '[{authors} ][({year}). ]{title}.[ In {booktitle}][, pp. {pages}].[ doi:{doi}]'
+    },
+    author_template='[{von} ]{last}[, {f}][, {jr}]',
+    author_separator=', ',
+    author_last_separator=', & ',
+    max_authors=20,
+)
+
+#: numeric style
+NUMERIC = Style(
+    '[\\[{n}\\] ][{authors}, ]{title}[, {journal}][ {volume}][, {pages}][ ({year})].',
+    author_template='[{f} ][{von} ]{last}[, {jr}]',
+    author_separator=', ',
+    author_last_separator=' and ',
+    max_authors=3,
+)
@@ -0,0 +1,203 @@
+import codecs
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+from pybibtex.bibliography import Item
+from pybibtex.parser import Parser, TokenType
+
+INDEX_VERSION = 2
+INDEX_SUFFIX = '.idx'
+
+
+class InvalidIndexError(Exception):
+    """Exception raised when the index is invalid"""
+    pass
+
+
+class _IndexingParser(Parser):
+    """Parser that also records the string definitions in force for each item
+    """
+
+    def __init__(self, inp: str):
+        super().__init__(inp)
+
+        self.definitions: List[Tuple[str, str]] = []
+        self.in_force: Dict[str, int] = {}
+
+    def inside_string_var(self) -> Tuple[str, str]:
+        placeholder, value = super().inside_string_var()
+        self.definitions.append((placeholder, value))
+
+        return placeholder, value
+
+    def inside_item(self, item_type: str, closing: TokenType = None) -> Item:
+        item = super().inside_item(item_type, closing)
+        if item is not None:
+            self.in_force[item.cite_key.lower()] = len(self.definitions)
+
+        return item
+
+
+#: byte order marks of the codecs that write one, with the codec of the rest of the data
+BOMS = {
+    'utf-8-sig': ((codecs.BOM_UTF8, 'utf-8'), ),
+    'utf-16': ((codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be')),
+    'utf-32': ((codecs.BOM_UTF32_LE, 'utf-32-le'), (codecs.BOM_UTF32_BE, 'utf-32-be')),
+}
+
+
+def _item_encoding(data: bytes, encoding: str) -> Tuple[str, int]:
+    """Get the codec of the items of a file (the one of ``encoding``, without BOM), and the length of the BOM.
+
+    Parameters:
+        data: the content of the file
+        encoding: encoding of the file
+    """
+
+    name = codecs.lookup(encoding).name
+    if name not in BOMS:
+        return encoding, 0
+
+    for bom, item_encoding in BOMS[name]:
+        if data.startswith(bom):
+            return item_encoding, len(bom)
+
+    if name == 'utf-8-sig':
+        return 'utf-8', 0
+
+    # no BOM: the decoder uses the native byte order
+    return '{}-{}'.format(name, 'le' if sys.byteorder == 'little' else 'be'), 0
+
+
+def _stat(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def build_index(path: str, index_path: str = None, encoding: str = 'utf-8') -> dict:
+    """Parse a BibTeX file and write a sidecar index, mapping the (lowercase) citation keys to byte ranges.
+
+    Parameters:
+        path: path to the BibTeX file
+        index_path: path to the index (defaults to ``path + '.idx'``)
+        encoding: encoding of the BibTeX file
+
+    Returns:
+        The index
+    """
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    text = data.decode(encoding)
+    parser = _IndexingParser(text)
+    database = parser.parse()
+
+    # convert character positions to byte offsets (the slices are encoded without BOM, which is counted once)
+    item_encoding, bom_length = _item_encoding(data, encoding)
+    items = {}
+    prev_char, prev_byte = 0, bom_length
+    for key, item in sorted(database.db.items(), key=lambda x: x[1].span[0]):
+        start = prev_byte + len(text[prev_char:item.span[0]].encode(item_encoding))
+        end = start + len(text[item.span[0]:item.span[1]].encode(item_encoding))
+        items[key] = [start, end, parser.in_force[key]]
+        prev_char, prev_byte = item.span[1], end
+
+    size, mtime = _stat(path)
+    index = {
+        'version': INDEX_VERSION,
+        'encoding': item_encoding,
+        'size': size,
+        'mtime_ns': mtime,
+        'strings': parser.definitions,
+        'items': items
+    }
+
+    with open(path + INDEX_SUFFIX if index_path is None else index_path, 'w') as f:
+        json.dump(index, f)
+
+    return index
+
+
+def load_index(path: str, index_path: str = None) -> dict:
+    """Load the sidecar index of a BibTeX file.
+
+    Parameters:
+        path: path to the BibTeX file
+        index_path: path to the index (defaults to ``path + '.idx'``)
+
+    Raises:
+        InvalidIndexError: if the index does not exist or is outdated
+    """
+
+    try:
+        with open(path + INDEX_SUFFIX if index_path is None else index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        raise InvalidIndexError('cannot read index: {}'.format(e))
+
+    if index.get('version') != INDEX_VERSION:
+        raise InvalidIndexError('wrong index version')
+
+    if (index['size'], index['mtime_ns']) != _stat(path):
+        raise InvalidIndexError('index is outdated')
+
+    return index
+
+
+class LazyDatabase:
+    """Database that gives random access to the items of a BibTeX file, using a sidecar index.
+
+    Only the requested item is read and parsed, so that opening a (huge) file is cheap.
+    The index is (re)built if it does not exist or if the file changed.
+
+    !!! note
+        Each access parses the item again, so that modifying the returned `Item` has no effect on the database.
+    """
+
+    def __init__(self, path: str, index_path: str = None, encoding: str = 'utf-8'):
+        """Initialize the object
+
+        Parameters:
+            path: path to the BibTeX file
+            index_path: path to the index (defaults to ``path + '.idx'``)
+            encoding: encoding of the BibTeX file (only used if the index is built)
+        """
+
+        self.path = path
+
+        try:
+            self.index = load_index(path, index_path)
+        except InvalidIndexError:
+            self.index = build_index(path, index_path, encoding)
+
+        self.items: Dict[str, List[int]] = self.index['items']
+        self.strings: List[Tuple[str, str]] = self.index['strings']
+        self.encoding: str = self.index['encoding']  #: encoding of the items (without BOM)
+
+    def __getitem__(self, item: str) -> Item:
+        start, end, n_strings = self.items[item.lower()]
+
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            text = f.read(end - start).decode(self.encoding)
+
+        parser = Parser(text)
+        parser.string_variables.update(self.strings[:n_strings])
+
+        return next(parser.database().iter_item())
+
+    def __contains__(self, item: str) -> bool:
+        return item.lower() in self.items
+
+    def __iter__(self) -> Iterable[str]:
+        yield from self.items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def iter_item(self) -> Iterable[Item]:
+        for key in self.items:
+            yield self[key]
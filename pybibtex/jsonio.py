@@ -0,0 +1,357 @@
+from typing import Any, Dict, Iterable, Iterator, TextIO, Union
+import json
+import re
+
+from pybibtex.authors import Author
+from pybibtex.bibliography import Database, Item
+from pybibtex.latexutf8 import UTF8EncodeException, utf8decode, utf8encode
+
+BRACES_TR = str.maketrans('', '', '{}')
+CHUNK_SIZE = 1 << 16  #: number of characters read at once by `iter_csl()`
+
+CSL_TYPES = {
+    'article': 'article-journal',
+    'book': 'book',
+    'booklet': 'pamphlet',
+    'inbook': 'chapter',
+    'incollection': 'chapter',
+    'inproceedings': 'paper-conference',
+    'conference': 'paper-conference',
+    'manual': 'report',
+    'mastersthesis': 'thesis',
+    'phdthesis': 'thesis',
+    'proceedings': 'book',
+    'techreport': 'report',
+    'unpublished': 'manuscript',
+    'online': 'webpage',
+    'misc': 'document',
+}  #: BibTeX item types to CSL types (the other ones are ``document``)
+
+BIBTEX_TYPES = {
+    'article-journal': 'article',
+    'article-magazine': 'article',
+    'article-newspaper': 'article',
+    'article': 'article',
+    'book': 'book',
+    'pamphlet': 'booklet',
+    'chapter': 'incollection',
+    'paper-conference': 'inproceedings',
+    'report': 'techreport',
+    'thesis': 'phdthesis',
+    'manuscript': 'unpublished',
+    'webpage': 'online',
+}  #: CSL types to BibTeX item types (the other ones are ``misc``)
+
+CSL_FIELDS = {
+    'title': 'title',
+    'journal': 'container-title',
+    'booktitle': 'container-title',
+    'publisher': 'publisher',
+    'school': 'publisher',
+    'institution': 'publisher',
+    'organization': 'publisher',
+    'address': 'publisher-place',
+    'volume': 'volume',
+    'number': 'issue',
+    'pages': 'page',
+    'edition': 'edition',
+    'series': 'collection-title',
+    'chapter': 'chapter-number',
+    'doi': 'DOI',
+    'url': 'URL',
+    'isbn': 'ISBN',
+    'issn': 'ISSN',
+    'abstract': 'abstract',
+    'note': 'note',
+    'keywords': 'keyword',
+    'language': 'language',
+}  #: BibTeX fields to CSL variables (if more than one field give the same variable, the first one wins)
+
+BIBTEX_FIELDS = {
+    'title': 'title',
+    'container-title': 'journal',
+    'publisher': 'publisher',
+    'publisher-place': 'address',
+    'volume': 'volume',
+    'issue': 'number',
+    'page': 'pages',
+    'edition': 'edition',
+    'collection-title': 'series',
+    'chapter-number': 'chapter',
+    'DOI': 'doi',
+    'URL': 'url',
+    'ISBN': 'isbn',
+    'ISSN': 'issn',
+    'abstract': 'abstract',
+    'note': 'note',
+    'keyword': 'keywords',
+    'language': 'language',
+}  #: CSL variables to BibTeX fields (with exceptions for chapters, conference papers, theses and reports)
+
+CSL_NAMES = ('author', 'editor')
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+YEAR = re.compile(r'\d+')
+PAGES = re.compile(r'\s*-+\s*')
+
+
+def item_to_json(item: Item) -> Dict[str, Any]:
+    """Get the (lossless) JSON representation of an item, as ``{"key": ..., "type": ..., "fields": {...}}``
+    """
+
+    return {'key': item.cite_key, 'type': item.item_type, 'fields': item.fields}
+
+
+def item_from_json(obj: Dict[str, Any]) -> Item:
+    """Get an item out of its JSON representation (see `item_to_json()`)
+    """
+
+    return Item(obj['key'], obj['type'], dict(obj['fields']))
+
+
+def _text(value: str, to_utf8: bool) -> str:
+    if to_utf8:
+        try:
+            value = utf8encode(value)
+        except UTF8EncodeException:
+            pass
+
+        value = value.translate(BRACES_TR)
+
+    return value
+
+
+def _csl_name(author: Author, to_utf8: bool) -> Dict[str, str]:
+    name = {'family': _text(author.last, to_utf8)}
+    if author.first:
+        name['given'] = _text(author.first, to_utf8)
+    if author.von:
+        name['non-dropping-particle'] = _text(author.von, to_utf8)
+    if author.jr:
+        name['suffix'] = _text(author.jr, to_utf8)
+
+    return name
+
+
+def item_to_csl(item: Item, to_utf8: bool = True) -> Dict[str, Any]:
+    """Get the CSL-JSON representation of an item.
+
+    The fields that have no equivalent in CSL (see `CSL_FIELDS`) are dropped,
+    the authors and editors are converted to names (``family``, ``given``, ``non-dropping-particle``
+    and ``suffix``), and ``year`` and ``month`` to ``issued``.
+
+    Parameters:
+        item: the item
+        to_utf8: convert the LaTeX macros to UTF-8 (see `pybibtex.latexutf8.utf8encode()`), and remove the braces
+    """
+
+    obj = {'id': item.cite_key, 'type': CSL_TYPES.get(item.item_type, 'document')}
+    year, month = None, None
+
+    for name, value in item.fields.items():
+        name_lower = name.lower()
+        if name_lower in CSL_NAMES:
+            obj[name_lower] = [_csl_name(a, to_utf8) for a in item.lazy_authors((name, ))]
+        elif name_lower == 'year':
+            year = YEAR.search(value)
+        elif name_lower == 'month':
+            month = value.strip().lower()[:3]
+        elif name_lower in CSL_FIELDS and CSL_FIELDS[name_lower] not in obj:
+            if name_lower == 'pages':
+                value = PAGES.sub('-', value)
+            obj[CSL_FIELDS[name_lower]] = _text(value, to_utf8)
+
+    if item.item_type == 'mastersthesis':
+        obj['genre'] = "Master's thesis"
+    elif item.item_type == 'phdthesis':
+        obj['genre'] = 'PhD thesis'
+
+    if year is not None:
+        parts = [int(year.group())]
+        if month in MONTHS:
+            parts.append(MONTHS.index(month) + 1)
+        elif month is not None and month.isdigit():
+            parts.append(int(month))
+        obj['issued'] = {'date-parts': [parts]}
+
+    return obj
+
+
+def _bibtex_name(name: Dict[str, str], to_latex: bool) -> str:
+    if 'family' not in name:  # literal name
+        return '{{{}}}'.format(_latex(name.get('literal', ''), to_latex))
+
+    parts = [
+        ' '.join(p for p in (name.get('dropping-particle'), name.get('non-dropping-particle'), name['family']) if p)]
+    if name.get('suffix'):
+        parts.append(name['suffix'])
+    if name.get('given') or name.get('suffix'):
+        parts.append(name.get('given', ''))
+
+    return _latex(', '.join(parts), to_latex)
+
+
+def _latex(value: Any, to_latex: bool) -> str:
+    value = str(value)
+    return utf8decode(value) if to_latex else value
+
+
+def item_from_csl(obj: Dict[str, Any], to_latex: bool = False) -> Item:
+    """Get an item out of its CSL-JSON representation (see `item_to_csl()`).
+
+    Parameters:
+        obj: the CSL-JSON object
+        to_latex: convert the UTF-8 characters to LaTeX macros (see `pybibtex.latexutf8.utf8decode()`)
+    """
+
+    csl_type = obj.get('type', 'document')
+    item_type = BIBTEX_TYPES.get(csl_type, 'misc')
+    if csl_type == 'thesis' and 'master' in obj.get('genre', '').lower():
+        item_type = 'mastersthesis'
+
+    fields = {}
+    for variable, value in obj.items():
+        if variable in CSL_NAMES:
+            fields[variable] = ' and '.join(_bibtex_name(n, to_latex) for n in value)
+        elif variable == 'issued':
+            parts = value.get('date-parts', [[]])[0] if isinstance(value, dict) else []
+            if parts:
+                fields['year'] = str(parts[0])
+            if len(parts) > 1 and str(parts[1]).isdigit() and 1 <= int(parts[1]) <= 12:  # (not a season)
+                fields['month'] = MONTHS[int(parts[1]) - 1]
+        elif variable in BIBTEX_FIELDS:
+            name = BIBTEX_FIELDS[variable]
+            if variable == 'container-title' and item_type in ('incollection', 'inproceedings'):
+                name = 'booktitle'
+            elif variable == 'publisher' and item_type in ('phdthesis', 'mastersthesis'):
+                name = 'school'
+            elif variable == 'publisher' and item_type == 'techreport':
+                name = 'institution'
+            elif variable == 'page':
+                value = PAGES.sub('--', str(value))
+            fields[name] = _latex(value, to_latex)
+
+    return Item(str(obj['id']), item_type, fields)
+
+
+def _items(database: Union[Database, Iterable[Item]]) -> Iterable[Item]:
+    return database.iter_item() if isinstance(database, Database) else database
+
+
+def dump_jsonl(database: Union[Database, Iterable[Item]], fp: TextIO):
+    """Write items in the JSON Lines format (one lossless JSON object per line, see `item_to_json()`)
+
+    Parameters:
+        database: a database, or any iterable of items (they are written one at a time)
+        fp: a file opened in text mode
+    """
+
+    for item in _items(database):
+        fp.write(json.dumps(item_to_json(item), ensure_ascii=False))
+        fp.write('\n')
+
+
+def iter_jsonl(fp: TextIO) -> Iterator[Item]:
+    """Iterate over the items of a file in the JSON Lines format (see `dump_jsonl()`), one line at a time
+    """
+
+    for line in fp:
+        if line.strip():
+            yield item_from_json(json.loads(line))
+
+
+def load_jsonl(fp: TextIO) -> Database:
+    """Get a database out of a file in the JSON Lines format (see `dump_jsonl()`)"""
+
+    return Database(dict((item.cite_key.lower(), item) for item in iter_jsonl(fp)))
+
+
+def dump_csl(database: Union[Database, Iterable[Item]], fp: TextIO, to_utf8: bool = True):
+    """Write items as a CSL-JSON array (see `item_to_csl()`), one item at a time
+
+    Parameters:
+        database: a database, or any iterable of items
+        fp: a file opened in text mode
+        to_utf8: convert the LaTeX macros to UTF-8, and remove the braces
+    """
+
+    fp.write('[')
+    separator = '\n'
+    for item in _items(database):
+        fp.write(separator)
+        fp.write(json.dumps(item_to_csl(item, to_utf8), ensure_ascii=False))
+        separator = ',\n'
+
+    fp.write('\n]\n')
+
+
+def iter_csl(fp: TextIO, to_latex: bool = False, chunk_size: int = CHUNK_SIZE) -> Iterator[Item]:
+    """Iterate over the items of a CSL-JSON array, as they are read (the whole array is never loaded)
+
+    Parameters:
+        fp: a file opened in text mode
+        to_latex: convert the UTF-8 characters to LaTeX macros
+        chunk_size: number of characters read at once
+    """
+
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    expected = '['  # what comes next: ``[``, ``first`` (an element or ``]``), ``element``, or ``,`` (or ``]``)
+    eof = False
+
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+
+        if position < len(buffer):
+            char = buffer[position]
+
+            if expected == '[':
+                if char != '[':
+                    raise ValueError('expected a CSL-JSON array, got {!r}'.format(char))
+                expected = 'first'
+                position += 1
+                continue
+
+            if char == ']' and expected in ('first', ','):
+                return
+
+            if expected == ',':
+                if char != ',':
+                    raise ValueError('expected "," or "]" between the elements, got {!r}'.format(char))
+                expected = 'element'
+                position += 1
+                continue
+
+            if char in ',]':
+                raise ValueError('expected an element, got {!r}'.format(char))
+            if char == '[':
+                raise ValueError('nested arrays are not supported')
+
+            try:
+                obj, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield item_from_csl(obj, to_latex)
+                position = end
+                expected = ','
+                continue
+
+        if eof:
+            if expected != '[':
+                raise ValueError('unterminated array')
+            return
+
+        # read more
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def load_csl(fp: TextIO, to_latex: bool = False, chunk_size: int = CHUNK_SIZE) -> Database:
+    """Get a database out of a CSL-JSON array (see `iter_csl()`)"""
+
+    return Database(dict((item.cite_key.lower(), item) for item in iter_csl(fp, to_latex, chunk_size)))
@@ -1,5 +1,7 @@
 from typing import Iterator
 from enum import Enum, unique
+import re
+import unicodedata
 
 from pybibtex._utf8translate import TRANSLATION_TABLE, REVERSE_TRANSLATION_TABLE
 
@@ -210,3 +212,29 @@ def utf8encode(inp: str) -> str:
     """
 
     return LtxUTF8Parser(inp, REVERSE_TRANSLATION_TABLE).transform()
+
+
+PURIFY_SPACES = re.compile(r'[\s~\-]+')
+PURIFY_REMOVE = re.compile(r'[^\w ]|_')
+
+
+def purify(inp: str) -> str:
+    """Normalize a string for sorting, in the spirit of the ``purify$`` function of BibTeX:
+    LaTeX macros are converted to UTF-8 characters, accents and non-alphanumeric characters are removed
+    (hyphens and ties are replaced by spaces), and the result is lowercased.
+
+    Parameters:
+        inp: string, possibly containing LaTeX macros
+
+    Returns:
+        The normalized string
+    """
+
+    if '\\' in inp:
+        try:
+            inp = utf8encode(inp)
+        except UTF8EncodeException:
+            pass
+
+    inp = unicodedata.normalize('NFKD', inp)
+    return ' '.join(PURIFY_REMOVE.sub('', PURIFY_SPACES.sub(' ', inp)).lower().split())
@@ -0,0 +1,141 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+import os
+
+from pybibtex.bibliography import Database, Item
+from pybibtex.files import parse_file
+
+BIB_SUFFIXES = ('.bib', '.bib.gz', '.bib.bz2', '.bib.xz')  #: suffixes of the files that are loaded
+BATCH_BYTES = 1 << 20  #: maximum (total) size of the files sent to a process at once, if more than one
+
+
+class LoadResult:
+    """Result of `load_directory()`
+    """
+
+    def __init__(self, database: Database, errors: Dict[str, str], files: List[str]):
+        self.database = database  #: the items of all the files
+        self.errors = errors  #: the files that could not be parsed, with the error
+        self.files = files  #: the files that were found
+
+
+def find_files(path: str, recursive: bool = True) -> List[str]:
+    """Find the BibTeX files (see `BIB_SUFFIXES`) in a directory, sorted by path.
+
+    Parameters:
+        path: the directory
+        recursive: also look in the subdirectories
+    """
+
+    files = []
+
+    if recursive:
+        for root, directories, names in os.walk(path):
+            directories.sort()
+            files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith(BIB_SUFFIXES))
+    else:
+        with os.scandir(path) as entries:
+            files.extend(sorted(e.path for e in entries if e.is_file() and e.name.lower().endswith(BIB_SUFFIXES)))
+
+    return files
+
+
+def _batches(paths: List[str], batch_size: int, errors: Dict[str, str]) -> Iterator[List[str]]:
+    """Group the files by batches of at most ``batch_size`` files and `BATCH_BYTES` bytes
+    (but a large file is always alone in its batch).
+    The files that cannot be accessed (e.g., removed in the meantime) are skipped, and added to ``errors``.
+    """
+
+    batch, size = [], 0
+
+    for path in paths:
+        try:
+            file_size = os.path.getsize(path)
+        except OSError as e:
+            errors[path] = '{}: {}'.format(type(e).__name__, e)
+            continue
+
+        if batch and (len(batch) >= batch_size or size + file_size > BATCH_BYTES):
+            yield batch
+            batch, size = [], 0
+
+        batch.append(path)
+        size += file_size
+
+    if batch:
+        yield batch
+
+
+def _parse_files(paths: List[str], encoding: str = None) -> List[Tuple[str, List[Item], List[str], str]]:
+    """Parse files, and return ``(path, items, preambles, error)`` for each of them (used by `load_directory()`)
+    """
+
+    results = []
+
+    for path in paths:
+        try:
+            database = parse_file(path, encoding=encoding, threaded=False)
+        except Exception as e:
+            results.append((path, [], [], '{}: {}'.format(type(e).__name__, e)))
+        else:
+            results.append((path, list(database.iter_item()), database.preambles, None))
+
+    return results
+
+
+def _merge(
+        results: Iterator[List[Tuple[str, List[Item], List[str], str]]],
+        files: List[str],
+        errors: Dict[str, str]
+) -> LoadResult:
+    db = {}
+    preambles = []
+
+    for batch in results:
+        for path, items, file_preambles, error in batch:
+            if error is not None:
+                errors[path] = error
+                continue
+
+            for item in items:
+                item.source_path = path
+                db[item.cite_key.lower()] = item
+
+            preambles.extend(file_preambles)
+
+    return LoadResult(Database(db, preambles=preambles), errors, files)
+
+
+def load_directory(
+        path: str,
+        recursive: bool = True,
+        processes: int = None,
+        batch_size: int = 64,
+        encoding: str = None
+) -> LoadResult:
+    """Load all the BibTeX files (possibly compressed, see `pybibtex.files.parse_file()`) of a directory
+    in a single database.
+
+    The files are parsed concurrently by a pool of processes, by batches (so that small files are sent together).
+    The path of the file is stored in the `pybibtex.bibliography.Item.source_path` of each item.
+    If the same citation key appears in different files, the last file (by path) wins.
+    The files that cannot be parsed are reported in `LoadResult.errors`, and do not stop the loading.
+
+    Parameters:
+        path: the directory
+        recursive: also look in the subdirectories
+        processes: number of processes (by default, the number of CPUs). If ``0``, the files are parsed in this process.
+        batch_size: maximum number of files sent to a process at once
+        encoding: encoding of the files (if ``None``, it is detected for each file)
+    """
+
+    files = find_files(path, recursive)
+    errors = {}
+    batches = list(_batches(files, batch_size, errors))
+
+    if processes == 0:
+        results = (_parse_files(batch, encoding) for batch in batches)
+        return _merge(results, files, errors)
+
+    with ProcessPoolExecutor(processes) as executor:
+        return _merge(executor.map(_parse_files, batches, [encoding] * len(batches)), files, errors)
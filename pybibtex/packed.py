@@ -0,0 +1,304 @@
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterable, Iterator, List, Tuple
+import io
+import mmap
+import struct
+
+from pybibtex.bibliography import Database, Item
+
+MAGIC = b'PBTXPK01'
+
+HEADER = struct.Struct('<8sIIIQQQ')  #: magic, items, names, preambles, then offsets of names, records and index
+LENGTH = struct.Struct('<I')
+RECORD = struct.Struct('<III')  #: length of the key, type (name id), number of fields
+FIELD = struct.Struct('<II')  #: name id, length of the value
+INDEX = struct.Struct('<QIQ')  #: offset and length of the (lowercase, UTF-8) key, offset of the record
+
+
+class PackedError(Exception):
+    pass
+
+
+def pack(database: Database) -> bytes:
+    """Pack a database in the binary format read by `PackedDatabase`.
+
+    The format contains the records of the items (in the order of the database),
+    a table of names (field names and item types), the preambles,
+    and an index of the (lowercase) keys, sorted, so that the items are found by binary search.
+    All the strings are stored in UTF-8.
+    """
+
+    names: Dict[str, int] = {}
+    records = io.BytesIO()
+    index: List[Tuple[bytes, int]] = []
+
+    def _name(name: str) -> int:
+        if name not in names:
+            names[name] = len(names)
+        return names[name]
+
+    records_offset = HEADER.size
+    for key, item in zip(database, database.iter_item()):
+        index.append((key.encode('utf-8'), records_offset + records.tell()))
+
+        cite_key = item.cite_key.encode('utf-8')
+        records.write(RECORD.pack(len(cite_key), _name(item.item_type), len(item.fields)))
+        records.write(cite_key)
+
+        for name, value in item.fields.items():
+            value = value.encode('utf-8')
+            records.write(FIELD.pack(_name(name), len(value)))
+            records.write(value)
+
+    index.sort()
+
+    output = io.BytesIO()
+    output.write(b'\0' * HEADER.size)
+    output.write(records.getbuffer())
+
+    names_offset = output.tell()
+    for string in chain(names, database.preambles):  # (names in the order of their id)
+        string = string.encode('utf-8')
+        output.write(LENGTH.pack(len(string)))
+        output.write(string)
+
+    # keys, then index
+    key_offsets = []
+    for key, _ in index:
+        key_offsets.append(output.tell())
+        output.write(key)
+
+    index_offset = output.tell()
+    for (key, record_offset), key_offset in zip(index, key_offsets):
+        output.write(INDEX.pack(key_offset, len(key), record_offset))
+
+    output.seek(0)
+    output.write(HEADER.pack(
+        MAGIC, len(index), len(names), len(database.preambles), names_offset, records_offset, index_offset))
+
+    return output.getvalue()
+
+
+class PackedItem(Item):
+    """Read-only item of a `PackedDatabase`: the fields are decoded on demand.
+
+    `fields` decodes (and caches) all the fields, while ``item[name]`` and ``name in item``
+    only decode the requested one.
+    """
+
+    def __init__(self, database: 'PackedDatabase', offset: int):
+        buffer = database.buffer
+        key_length, type_id, n_fields = RECORD.unpack_from(buffer, offset)
+        offset += RECORD.size
+
+        self.cite_key = str(buffer[offset:offset + key_length], 'utf-8')
+        self.item_type = database.names[type_id]
+        self.span = None
+        self.source_path = None
+
+        self._database = database
+        self._fields_offset = offset + key_length
+        self._n_fields = n_fields
+        self._fields: Dict[str, str] = None
+        self._cache = {}
+
+    def _iter_fields(self) -> Iterator[Tuple[str, int, int]]:
+        """Iterate over the fields, as ``(name, start, end)`` of the value in the buffer"""
+
+        buffer, names = self._database.buffer, self._database.names
+        offset = self._fields_offset
+
+        for _ in range(self._n_fields):
+            name_id, length = FIELD.unpack_from(buffer, offset)
+            offset += FIELD.size
+            yield names[name_id], offset, offset + length
+            offset += length
+
+    @property
+    def fields(self) -> Dict[str, str]:
+        if self._fields is None:
+            buffer = self._database.buffer
+            self._fields = dict((n, str(buffer[s:e], 'utf-8')) for n, s, e in self._iter_fields())
+
+        return self._fields
+
+    def __getitem__(self, item: str) -> str:
+        if self._fields is not None:
+            return self._fields[item]
+
+        for name, start, end in self._iter_fields():
+            if name == item:
+                return str(self._database.buffer[start:end], 'utf-8')
+
+        raise KeyError(item)
+
+    def __contains__(self, item: str) -> bool:
+        return any(name == item for name, _, _ in self._iter_fields())
+
+    def __setitem__(self, key, value):
+        raise PackedError('packed items are read-only')
+
+
+class PackedDatabase(Database):
+    """Read-only database, stored in a compact binary format (see `pack()`) in a buffer
+    (``bytes``, ``mmap``, or shared memory), with the same interface as `pybibtex.bibliography.Database`.
+
+    The items are decoded on demand (see `PackedItem`), so that many processes can use the same buffer
+    (a file with `open()`, or shared memory with `attach()`) without having their own copy of the database.
+    """
+
+    def __init__(self, buffer):
+        """Initialize the object
+
+        Parameters:
+            buffer: a buffer containing the packed database
+        """
+
+        self.buffer = memoryview(buffer).cast('B')
+        self._resources = []
+
+        magic, self.n_items, n_names, n_preambles, names_offset, self.records_offset, self.index_offset = \
+            HEADER.unpack_from(self.buffer, 0)
+
+        if magic != MAGIC:
+            raise PackedError('not a packed database')
+
+        strings = []
+        offset = names_offset
+        for _ in range(n_names + n_preambles):
+            length, = LENGTH.unpack_from(self.buffer, offset)
+            offset += LENGTH.size
+            strings.append(str(self.buffer[offset:offset + length], 'utf-8'))
+            offset += length
+
+        self.names: List[str] = strings[:n_names]
+        self.preambles = strings[n_names:]
+        self.names_offset = names_offset
+
+    @classmethod
+    def open(cls, path: str) -> 'PackedDatabase':
+        """Open a file containing a packed database (see `write()`), with ``mmap``
+        """
+
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        database = cls(mapped)
+        database._resources.append(mapped)
+        return database
+
+    @staticmethod
+    def write(database: Database, path: str):
+        """Write a packed database in a file"""
+
+        with open(path, 'wb') as f:
+            f.write(pack(database))
+
+    @staticmethod
+    def to_shared_memory(database: Database, name: str = None) -> SharedMemory:
+        """Pack a database in a new block of shared memory.
+
+        The block must be released with ``close()`` and ``unlink()`` when it is not used anymore.
+
+        Parameters:
+            database: the database
+            name: name of the block (by default, a random name is used: see ``SharedMemory.name``)
+        """
+
+        data = pack(database)
+        shm = SharedMemory(name=name, create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        return shm
+
+    @classmethod
+    def attach(cls, name: str) -> 'PackedDatabase':
+        """Use a packed database stored in shared memory (see `to_shared_memory()`).
+
+        !!! note
+            Before Python 3.13, the ``multiprocessing`` resource tracker may remove the block when the attaching
+            process ends: the block should be created by a process that outlives the ones that attach to it.
+        """
+
+        try:
+            shm = SharedMemory(name=name, track=False)  # Python >= 3.13
+        except TypeError:
+            shm = SharedMemory(name=name)
+
+        database = cls(shm.buf)
+        database._resources.append(shm)
+        return database
+
+    def close(self):
+        """Release the buffer (the items cannot be used afterwards)"""
+
+        self.buffer.release()
+        for resource in self._resources:
+            resource.close()
+
+        self._resources = []
+
+    def __enter__(self) -> 'PackedDatabase':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def db(self) -> Dict[str, Item]:
+        """Get the items as a dictionary (which is built on each call!)"""
+
+        return dict(zip(self, self.iter_item()))
+
+    def _find(self, key: bytes) -> int:
+        """Get the offset of the record of an item, by binary search in the index (or -1 if not found)"""
+
+        buffer = self.buffer
+        low, high = 0, self.n_items
+
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, record_offset = INDEX.unpack_from(buffer, self.index_offset + middle * INDEX.size)
+            found = buffer[key_offset:key_offset + key_length].tobytes()
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return record_offset
+
+        return -1
+
+    def __getitem__(self, item: str) -> PackedItem:
+        offset = self._find(item.lower().encode('utf-8'))
+        if offset < 0:
+            raise KeyError(item)
+
+        return PackedItem(self, offset)
+
+    def __contains__(self, item) -> bool:
+        return self._find(item.lower().encode('utf-8')) >= 0
+
+    def __len__(self) -> int:
+        return self.n_items
+
+    def _iter_offsets(self) -> Iterator[int]:
+        """Iterate over the offsets of the records, in the order of the database"""
+
+        buffer = self.buffer
+        offset = self.records_offset
+
+        while offset < self.names_offset:
+            yield offset
+            key_length, _, n_fields = RECORD.unpack_from(buffer, offset)
+            offset += RECORD.size + key_length
+            for _ in range(n_fields):
+                offset += FIELD.size + FIELD.unpack_from(buffer, offset)[1]
+
+    def __iter__(self) -> Iterable[str]:
+        for offset in self._iter_offsets():
+            key_length = RECORD.unpack_from(self.buffer, offset)[0]
+            yield str(self.buffer[offset + RECORD.size:offset + RECORD.size + key_length], 'utf-8').lower()
+
+    def iter_item(self) -> Iterable[PackedItem]:
+        yield from (PackedItem(self, offset) for offset in self._iter_offsets())
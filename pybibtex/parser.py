@@ -1,5 +1,8 @@
-from typing import Tuple, Iterator
+from typing import Callable, Iterable, List, Optional, Tuple, Iterator, Union
+from array import array
+from bisect import bisect_right
 from enum import Enum, unique
+import codecs
 import re
 
 from pybibtex.bibliography import Database, Item
@@ -54,6 +57,87 @@ class Token:
         )
 
 
+DELIMITERS = re.compile(r'(\{)|(\})|(")')
+BYTES_DELIMITERS = re.compile(rb'(\{)|(\})|(")')
+
+
+def _find_closing(matches: Iterator[re.Match], quote: bool, level: int) -> int:
+    """Get the position of the closing brace (or quote) of a string (see `Parser.string_part()`),
+    out of the matches of `DELIMITERS`, or -1 if there is none.
+
+    Parameters:
+        matches: the matches, after the opening brace (or quote)
+        quote: the string is delimited by quotes
+        level: the initial brace level
+    """
+
+    for match in matches:
+        group = match.lastindex
+        if group == 1:
+            level += 1
+        elif group == 2:
+            level -= 1
+            if not quote and level == 0:
+                return match.start()
+        elif quote and level == 0:
+            return match.start()
+
+    return -1
+
+
+NEWLINE = re.compile(rb'\n')
+
+
+class LineIndex:
+    """Table of the offsets where the lines of a text start, to get the line and column of a position
+    (e.g. `Token.position`) by binary search.
+
+    The table is built by searching the newlines in bulk (with ``str.find()``), so that the lexers never have to
+    count the lines while tokenizing.
+    The lines and columns start at 1, and the columns of a bytes input are counted in bytes.
+    """
+
+    def __init__(self, text=''):
+        """Initialize the object
+
+        Parameters:
+            text: the text (``str``, or any bytes-like object)
+        """
+
+        self.starts = array('q', [0])
+        self.add(text)
+
+    def add(self, text, offset: int = 0):
+        """Record the newlines of a part of the text (used to build the table chunk by chunk)
+
+        Parameters:
+            text: the part of the text
+            offset: position of the part in the whole text
+        """
+
+        starts = self.starts
+
+        if isinstance(text, str) or hasattr(text, 'find'):
+            newline = '\n' if isinstance(text, str) else b'\n'
+            position = text.find(newline)
+            while position >= 0:
+                starts.append(offset + position + 1)
+                position = text.find(newline, position + 1)
+        else:  # e.g. memoryview
+            starts.extend(offset + match.end() for match in NEWLINE.finditer(text))
+
+    def __len__(self) -> int:
+        """Number of lines"""
+
+        return len(self.starts)
+
+    def location(self, position: int) -> Tuple[int, int]:
+        """Get the ``(line, column)`` of a position"""
+
+        line = bisect_right(self.starts, position)
+        return line, position - self.starts[line - 1] + 1
+
+
 class Lexer:
     def __init__(self, inp):
         self.input = inp
@@ -73,6 +157,25 @@ class Lexer:
         else:
             self.current_char = self.input[self.position]
 
+    def find_closing(self, start: int, quote: bool = False, level: int = 1) -> int:
+        """Find the position of the closing brace (or quote) of a string, directly in the input.
+
+        Parameters:
+            start: position where the search starts (after the opening brace or quote)
+            quote: the string is delimited by quotes
+            level: the initial brace level
+
+        Returns:
+            the position, or -1 if there is none
+        """
+
+        return _find_closing(DELIMITERS.finditer(self.input, start), quote, level)
+
+    def skip_to(self, position: int):
+        """Skip the input, so that the next token is the one at ``position``"""
+
+        self.position = position - 1
+
     def tokenize(self) -> Iterator[Token]:
         while self.current_char != '\0':
             if self.current_char in SYMBOL_TR:
@@ -84,8 +187,155 @@ class Lexer:
         yield Token(TokenType.EOS, '\0', self.position)
 
 
+ASCII_CHARS = [chr(i) for i in range(128)]
+ENCODING_HEADER = re.compile(rb'^%\s*Encoding:\s*([A-Za-z0-9_\-.]+)', re.MULTILINE)
+
+
+def detect_encoding(data: bytes, length: int = 1 << 16, partial: bool = False) -> str:
+    """Detect the encoding of a BibTeX file, using (in that order):
+
+    1. the UTF-8 byte order mark (gives ``utf-8-sig``);
+    2. the ``% Encoding: xxx`` header written by JabRef (in the first ``length`` bytes);
+    3. whether the data is valid UTF-8 (checked by chunks of ``length`` bytes, without keeping the decoded text).
+
+    Otherwise, the data is considered to be ``latin-1``.
+
+    Parameters:
+        data: the content of the file
+        length: size of the chunks that are checked
+        partial: ``data`` is only the beginning of the file (so it may end in the middle of a character)
+    """
+
+    data = memoryview(data).cast('B')
+
+    if data[:3] == codecs.BOM_UTF8:
+        return 'utf-8-sig'
+
+    header = ENCODING_HEADER.search(bytes(data[:length]))
+    if header:
+        try:
+            return codecs.lookup(header.group(1).decode('ascii')).name
+        except LookupError:
+            pass
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for i in range(0, len(data), length):
+            decoder.decode(data[i:i + length])
+        decoder.decode(b'', final=not partial)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+class BytesLexer:
+    """Lexer working directly on bytes (``bytes``, ``bytearray`` or ``memoryview``).
+
+    The structural characters are ASCII, so they are found at the byte level,
+    and only the other (non-ASCII) characters are decoded, one at a time, so that the input is never decoded as a whole.
+    The position of the tokens are byte offsets.
+
+    !!! note
+        The encoding must be ASCII-compatible (UTF-8, latin-1, cp1252, ...).
+    """
+
+    def __init__(self, inp, encoding: str = 'utf-8', errors: str = 'strict'):
+        self.input = memoryview(inp).cast('B')
+        self.position = 0
+
+        if self.input[:3] == codecs.BOM_UTF8 and codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig'):
+            self.position = 3  # skip BOM
+            encoding = 'utf-8'
+
+        self.encoding = encoding
+        self.decoder = codecs.getincrementaldecoder(encoding)(errors)
+
+    def find_closing(self, start: int, quote: bool = False, level: int = 1) -> int:
+        """Find the position of the closing brace (or quote) of a string (see `Lexer.find_closing()`),
+        without decoding it"""
+
+        return _find_closing(BYTES_DELIMITERS.finditer(self.input, start), quote, level)
+
+    def skip_to(self, position: int):
+        """Skip the input, so that the next token is the one at ``position``"""
+
+        self.position = position - 1
+
+    def tokenize(self) -> Iterator[Token]:
+        data = self.input
+        size = len(data)
+        position = self.position
+        decode = self.decoder.decode
+
+        while position < size:
+            byte = data[position]
+
+            if byte < 128:
+                char = ASCII_CHARS[byte]
+                self.position = position
+                if char in SYMBOL_TR:
+                    yield Token(SYMBOL_TR[char], char, position)
+                else:
+                    yield Token(TokenType.CHAR, char, position)
+                position = self.position + 1  # (see `skip_to()`)
+            else:  # feed the decoder until it outputs something
+                start = position
+                chars = ''
+                while not chars and position < size:
+                    chars = decode(data[position:position + 1])
+                    position += 1
+
+                if not chars:
+                    chars = decode(b'', final=True)
+
+                for char in chars:
+                    yield Token(SYMBOL_TR.get(char, TokenType.CHAR), char, start)
+
+        self.position = position
+        yield Token(TokenType.EOS, '\0', position)
+
+
+class StreamLexer:
+    """Lexer working on a stream of chunks of text (so that the input is never stored as a whole).
+    The position of the tokens are the offsets in the whole text.
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self.input = chunks
+        self.position = 0
+        self.lines = LineIndex()  #: newlines of the chunks read so far (see `LineIndex.add()`)
+
+    def find_closing(self, start: int, quote: bool = False, level: int = 1) -> int:
+        """Strings cannot be skipped at once, since the input is not stored (so it always returns -1)"""
+
+        return -1
+
+    def tokenize(self) -> Iterator[Token]:
+        position = self.position
+
+        for chunk in self.input:
+            self.lines.add(chunk, position)
+            for char in chunk:
+                if char in SYMBOL_TR:
+                    yield Token(SYMBOL_TR[char], char, position)
+                else:
+                    yield Token(TokenType.CHAR, char, position)
+                position += 1
+
+        self.position = position
+        yield Token(TokenType.EOS, '\0', position)
+
+
 class ParserSyntaxError(Exception):
-    pass
+    """Syntax error, with its location in the input (see `Parser.error()`)"""
+
+    def __init__(self, message: str, position: int = -1, line: int = None, column: int = None):
+        super().__init__(message if line is None else '{}:{}: {}'.format(line, column, message))
+
+        self.message = message
+        self.position = position
+        self.line = line
+        self.column = column
 
 
 IS_LITERAL = re.compile(r'[a-zA-Z0-9_]')
@@ -93,20 +343,55 @@ IS_LITERAL_BEG = re.compile(r'[a-zA-Z_]')
 IS_KEY = re.compile(r'[a-zA-Z0-9_\-:]')
 
 
+def _make_filter(f: Union[Callable[[str], bool], Iterable[str]] = None) -> Callable[[str], bool]:
+    """Get a (case insensitive) predicate out of a collection of values, or keep the predicate as is"""
+
+    if f is None or callable(f):
+        return f
+
+    values = frozenset(v.lower() for v in f)
+    return lambda value: value.lower() in values
+
+
 class Parser:
     """Parser for the bibliography in BiBTeX format
     """
 
-    def __init__(self, inp: str):
+    def __init__(
+            self,
+            inp: str,
+            lossless: bool = False,
+            keep_fields: Iterable[str] = None,
+            drop_fields: Iterable[str] = None,
+            type_filter: Union[Callable[[str], bool], Iterable[str]] = None,
+            key_filter: Union[Callable[[str], bool], Iterable[str]] = None
+    ):
         """Initialize the object
 
         Parameters:
             inp: string containing the BiBTeX database
+            lossless: record the layout of the input in the database (see `database()`)
+            keep_fields: only keep these fields (case insensitive), the other ones are skipped (see `skip_value()`)
+            drop_fields: skip these fields (case insensitive)
+            type_filter: only keep the items of these types (case insensitive), or for which
+                ``type_filter(item_type)`` is ``True``: the other ones are skipped (see `skip_fields()`)
+            key_filter: only keep the items with these citation keys (case insensitive), or for which
+                ``key_filter(cite_key)`` is ``True``
         """
 
-        self.lexer = Lexer(inp)
+        self.input = inp
+        self.lossless = lossless
+        self.preambles: List[str] = []
+
+        self.keep_fields = None if keep_fields is None else frozenset(f.lower() for f in keep_fields)
+        self.drop_fields = None if drop_fields is None else frozenset(f.lower() for f in drop_fields)
+        self.type_filter = _make_filter(type_filter)
+        self.key_filter = _make_filter(key_filter)
+
+        self.lexer = self.make_lexer(inp)
         self.tokenizer = self.lexer.tokenize()
         self.current_token: Token = None
+        self._line_index: LineIndex = None
 
         # month are defined by default
         self.string_variables = {
@@ -126,6 +411,41 @@ class Parser:
 
         self.next()
 
+    def make_lexer(self, inp) -> Lexer:
+        """Get the lexer for the input"""
+
+        return Lexer(inp)
+
+    def make_line_index(self) -> LineIndex:
+        """Get the line index of the input (see `location()`)"""
+
+        return LineIndex(self.input)
+
+    def location(self, position: int) -> Optional[Tuple[int, int]]:
+        """Get the ``(line, column)`` of a position in the input (e.g., of the `pybibtex.bibliography.Item.span`
+        of an item), or ``None`` if it is unknown.
+
+        The line index (see `LineIndex`) is only built on the first call, so that it costs nothing
+        when no location is requested.
+        """
+
+        if position < 0:
+            return None
+
+        if self._line_index is None:
+            self._line_index = self.make_line_index()
+
+        return self._line_index.location(position)
+
+    def error(self, message: str, position: int = None) -> ParserSyntaxError:
+        """Get a syntax error located at ``position`` (by default, the position of the current token)"""
+
+        if position is None:
+            position = self.current_token.position
+
+        location = self.location(position)
+        return ParserSyntaxError(message, position, *(location or ()))
+
     def _next(self):
         """Get next token"""
 
@@ -143,7 +463,7 @@ class Parser:
         if self.current_token.type == typ:
             self.next()
         else:
-            raise ParserSyntaxError('expected {}, got {}'.format(typ, self.current_token))
+            raise self.error('expected {}, got {}'.format(typ, self.current_token))
 
     def skip_empty(self):
         """Skip spaces, newlines and comments
@@ -174,7 +494,7 @@ class Parser:
         """
 
         if self.current_token.type != TokenType.CHAR or not IS_LITERAL_BEG.match(self.current_token.value):
-            raise ParserSyntaxError('expected literal, got {}'.format(self.current_token))
+            raise self.error('expected literal, got {}'.format(self.current_token))
 
         literal = self.current_token.value
         self.next()
@@ -198,7 +518,7 @@ class Parser:
         """
 
         if self.current_token.type != TokenType.CHAR or not IS_KEY.match(self.current_token.value):
-            raise ParserSyntaxError('expected literal, got {}'.format(self.current_token))
+            raise self.error('expected literal, got {}'.format(self.current_token))
 
         citekey = ''
 
@@ -213,24 +533,62 @@ class Parser:
         The BibTeX format is more or less defined as
 
         ```text
-        bibtex := (item | string_var | comment)*;
+        bibtex := (item | string_var | preamble | comment)*;
         ```
 
         with
 
         ```text
         string_var := AT 'string' (LCBRACE inside_string_var RCBRACE | LPAR inside_string_var RPAR) ;
+        preamble := AT 'preamble' (LCBRACE value RCBRACE | LPAR value RPAR) ;
         item := AT literal (LCBRACE inside_item RCBRACE | LPAR inside_item RPAR) ;
         comment := (AT 'comment' CHAR* NL | CHAR*)
         ```
 
-        (it is missing the `@preamble` instruction).
+        The values of the `@preamble` are stored in `preambles`.
+
+        In lossless mode, the database also keeps a reference to the input and its layout:
+        the spans of the text between items (including comments, `@string` and `@preamble`) and the spans of the items,
+        so that unmodified parts can be written back as is (see `pybibtex.writer`).
         """
 
         db = {}
+        layout: List[Union[Tuple[int, int], Tuple[str, int, int]]] = []
+        last = 0
+
+        for item in self.iter_item():
+            key = item.cite_key.lower()
+
+            if self.lossless:
+                start, end = item.span
+                if start > last:
+                    layout.append((last, start))
+
+                if key in db:  # previous definition is overridden, so it is just some text now
+                    index = layout.index((key, ) + db[key].span)
+                    layout[index] = db[key].span
+
+                layout.append((key, start, end))
+                last = end
+
+            db[key] = item
+
+        if not self.lossless:
+            return Database(db, preambles=self.preambles)
+
+        if last < len(self.input):
+            layout.append((last, len(self.input)))
+
+        return Database(db, preambles=self.preambles, source=self.input, layout=layout)
+
+    def iter_item(self) -> Iterator[Item]:
+        """Iterate over the items of the database (see `database()`), as they are parsed.
+        """
+
         self.skip_any_but_item()  # go to the next @
 
         while self.current_token.type != TokenType.EOS:
+            start = self.current_token.position
             self.eat(TokenType.AT)
 
             # get type
@@ -242,7 +600,7 @@ class Parser:
             else:
                 # get opening
                 if self.current_token.type not in OPENINGS:
-                    raise ParserSyntaxError('expected OPENINGS, got {}'.format(self.current_token))
+                    raise self.error('expected OPENINGS, got {}'.format(self.current_token))
 
                 opening = self.current_token.type
                 closing = {
@@ -254,19 +612,27 @@ class Parser:
                 self.skip_empty()
 
                 # go inside
+                item = None
                 if item_type.lower() == 'string':
                     self.inside_string_var()
+                elif item_type.lower() == 'preamble':
+                    self.preambles.append(self.value())
+                elif self.type_filter is not None and not self.type_filter(item_type):
+                    self.skip_fields(closing)
                 else:
-                    item = self.inside_item(item_type)
-                    db[item.cite_key.lower()] = item
+                    item = self.inside_item(item_type, closing)
 
                 self.skip_empty()
+                end = self.current_token.position + 1
                 self.eat(closing)
 
+                if item is not None:
+                    item.span = (start, end)
+                    yield item
+
             self.skip_any_but_item()
 
         self.eat(TokenType.EOS)
-        return Database(db)
 
     def comment(self):
         """Skip whatever remains of the line
@@ -275,8 +641,8 @@ class Parser:
         while self.current_token.type not in [TokenType.NL, TokenType.EOS]:
             self.next()
 
-    def inside_string_var(self):
-        """Defines a string variable:
+    def inside_string_var(self) -> Tuple[str, str]:
+        """Defines a string variable, and returns its name and value:
 
         ```text
         inside_string_var := key EQUAL value ;
@@ -298,18 +664,29 @@ class Parser:
         value = self.value()
         self.string_variables[placeholder] = value
 
-    def inside_item(self, item_type: str) -> Item:
+        return placeholder, value
+
+    def inside_item(self, item_type: str, closing: TokenType = None) -> Item:
         """Get an item:
 
         ```text
         inside_item := key COMMA (field (COMMA field)*)? COMMA?
         ```
 
+        Returns ``None`` if the item is skipped because of its key (see ``key_filter``).
+
+        Parameters:
+            item_type: the type of the item
+            closing: the closing of the item (used to skip it)
         """
 
         # get key
         item_citekey = self.key()
 
+        if self.key_filter is not None and not self.key_filter(item_citekey):
+            self.skip_fields(closing)
+            return None
+
         # eat COMMA
         self.skip_empty()
         self.eat(TokenType.COMMA)
@@ -329,9 +706,11 @@ class Parser:
             try:
                 k, v = self.field()
             except ParserSyntaxError as e:
-                raise ParserSyntaxError('while parsing {}, {}'.format(item_citekey, e))
+                raise ParserSyntaxError(
+                    'while parsing {}, {}'.format(item_citekey, e.message), e.position, e.line, e.column)
 
-            fields[k] = v
+            if v is not None:
+                fields[k] = v
 
             self.skip_empty()
             if self.current_token.type != TokenType.COMMA:
@@ -350,6 +729,7 @@ class Parser:
         field := key EQUAL value ;
         ```
 
+        The value is ``None`` if the field is skipped (see `keep_field()`).
         """
 
         # get key
@@ -361,8 +741,22 @@ class Parser:
         self.skip_empty()
 
         # get value and return
+        if not self.keep_field(key):
+            self.skip_value()
+            return key, None
+
         return key, self.value()
 
+    def keep_field(self, name: str) -> bool:
+        """Check whether a field should be kept (see ``keep_fields`` and ``drop_fields``)"""
+
+        if self.keep_fields is None and self.drop_fields is None:
+            return True
+
+        name = name.lower()
+        return (self.keep_fields is None or name in self.keep_fields) and \
+            (self.drop_fields is None or name not in self.drop_fields)
+
     def value(self) -> str:
         """A value is a string, but different stuffs can be concatenated.
 
@@ -390,6 +784,81 @@ class Parser:
         # ok, done
         return value
 
+    def skip_fields(self, closing: TokenType = None):
+        """Skip the rest of an item, up to its closing brace (or parenthesis), which becomes the current token.
+
+        If the item is delimited by braces, the closing one is found by counting the braces directly in the input,
+        if the lexer allows it (see `Lexer.find_closing()`).
+        Otherwise, the strings are skipped one by one (see `skip_string_part()`).
+        """
+
+        if closing == TokenType.RCBRACE and self.current_token.type != TokenType.RCBRACE:
+            position = self.lexer.find_closing(self.current_token.position)
+            if position >= 0:
+                self.lexer.skip_to(position)
+                self.next()
+                return
+
+        while self.current_token.type not in [TokenType.RCBRACE, TokenType.RPAR, TokenType.EOS]:
+            if self.current_token.type in [TokenType.LCBRACE, TokenType.QUOTE]:
+                self.skip_string_part()
+            else:
+                self.next()
+
+    def skip_value(self):
+        """Skip a value (see `value()`), without building it.
+
+        The strings are skipped by brace matching, directly in the input if the lexer allows it
+        (see `Lexer.find_closing()`), and the string variables are not checked.
+        """
+
+        self.skip_string_part()
+        self.skip_empty()
+
+        while self.current_token.type == TokenType.POUND:
+            self.next()
+            self.skip_empty()
+            self.skip_string_part()
+            self.skip_empty()
+
+    def skip_string_part(self):
+        """Skip a string (see `string_part()`), without building it"""
+
+        if self.current_token.type == TokenType.CHAR:
+            if self.current_token.value.isnumeric():
+                while self.current_token.type == TokenType.CHAR and self.current_token.value.isnumeric():
+                    self.next()
+            else:
+                self.literal()
+
+        elif self.current_token.type in [TokenType.LCBRACE, TokenType.QUOTE]:
+            quote = self.current_token.type == TokenType.QUOTE
+            closing = self.lexer.find_closing(self.current_token.position + 1, quote, 0 if quote else 1)
+
+            if closing >= 0:
+                self.lexer.skip_to(closing + 1)
+            else:
+                self.next()
+                brace_level = 0 if quote else 1
+                while True:
+                    if self.current_token.type == TokenType.LCBRACE:
+                        brace_level += 1
+                    elif self.current_token.type == TokenType.RCBRACE:
+                        brace_level -= 1
+                        if not quote and brace_level == 0:
+                            break
+                    elif self.current_token.type == TokenType.QUOTE:
+                        if quote and brace_level == 0:
+                            break
+                    elif self.current_token.type == TokenType.EOS:
+                        raise self.error('got {} while parsing string'.format(self.current_token))
+
+                    self.next()
+
+            self.next()  # eat closing
+        else:
+            raise self.error('expected string, got {}'.format(self.current_token))
+
     def string_part(self) -> str:
         """Get an actual string.
 
@@ -419,11 +888,12 @@ class Parser:
                     value += self.current_token.value
                     self.next()
             else:  # ... it is a literal, then
+                position = self.current_token.position
                 lit = self.literal()
                 try:
                     value = self.string_variables[lit]
                 except KeyError:
-                    raise ParserSyntaxError('{} is not defined'.format(lit))
+                    raise self.error('{} is not defined'.format(lit), position)
 
         elif self.current_token.type in [TokenType.LCBRACE, TokenType.QUOTE]:
             opening_char = self.current_token.type
@@ -444,11 +914,74 @@ class Parser:
                         self.next()
                         break
                 elif self.current_token.type == TokenType.EOS:
-                    raise ParserSyntaxError('got {} while parsing string'.format(self.current_token))
+                    raise self.error('got {} while parsing string'.format(self.current_token))
 
                 value += self.current_token.value
                 self.next()
         else:
-            raise ParserSyntaxError('expected string, got {}'.format(self.current_token))
+            raise self.error('expected string, got {}'.format(self.current_token))
 
         return value
+
+
+class BytesParser(Parser):
+    """Parser for the bibliography in BiBTeX format, working directly on bytes (see `BytesLexer`),
+    so that the input is not decoded as a whole before being parsed.
+
+    The spans of the items (`pybibtex.bibliography.Item.span`) are byte offsets.
+    """
+
+    def __init__(self, inp, encoding: str = None, errors: str = 'strict', **kwargs):
+        """Initialize the object
+
+        Parameters:
+            inp: the BiBTeX database, as ``bytes``, ``bytearray`` or ``memoryview``
+            encoding: encoding of the input (if ``None``, it is detected with `detect_encoding()`)
+            errors: how to handle decoding errors (see `codecs`)
+            kwargs: other options (see `Parser`)
+        """
+
+        self.encoding = detect_encoding(inp) if encoding is None else encoding
+        self.errors = errors
+
+        super().__init__(inp, **kwargs)
+
+        self.encoding = self.lexer.encoding
+
+    def make_lexer(self, inp) -> BytesLexer:
+        return BytesLexer(inp, self.encoding, self.errors)
+
+    def database(self) -> Database:
+        database = super().database()
+        database.encoding = self.encoding
+        return database
+
+
+class StreamParser(Parser):
+    """Parser for the bibliography in BiBTeX format, working on a stream of chunks of text (see `StreamLexer`).
+    Use `iter_item()` to keep the memory bounded.
+
+    !!! note
+        The lossless mode is not available, since the input is not kept.
+    """
+
+    def __init__(self, chunks: Iterable[str], **kwargs):
+        """Initialize the object
+
+        Parameters:
+            chunks: the BiBTeX database, as an iterable of strings (e.g., a file opened in text mode)
+            kwargs: other options (see `Parser`, except ``lossless``)
+        """
+
+        if kwargs.get('lossless'):
+            raise ValueError('the lossless mode is not available for streams')
+
+        super().__init__(chunks, **kwargs)
+
+    def make_lexer(self, inp) -> StreamLexer:
+        return StreamLexer(inp)
+
+    def make_line_index(self) -> LineIndex:
+        """The line index is built by the lexer, as the chunks are read (see `StreamLexer.lines`)"""
+
+        return self.lexer.lines
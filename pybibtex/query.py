@@ -0,0 +1,257 @@
+from typing import Callable, List, Optional, Tuple
+import re
+
+from pybibtex.bibliography import Database, Item
+from pybibtex.latexutf8 import purify
+
+Predicate = Callable[[Item], bool]
+
+
+def _get_field(item: Item, name: str) -> Optional[str]:
+    try:
+        return item.get_field(name)
+    except KeyError:
+        return None
+
+
+def _field_names(name: str) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys((name, name.lower(), name.capitalize(), name.upper())))
+
+
+class Query:
+    """Query on the items of a database.
+
+    Queries are combined with ``&``, ``|`` and ``~``, and compiled into a predicate with `compile()`.
+    """
+
+    cost = 1  #: relative cost of the evaluation, used to evaluate the cheapest queries first
+
+    def compile(self) -> Predicate:
+        """Get a predicate, which returns ``True`` if the item matches the query
+        """
+
+        raise NotImplementedError()
+
+    def candidates(self, database: Database) -> Optional[List[str]]:
+        """Get the (lowercase) citation keys of the items that may match the query,
+        or ``None`` if all items must be checked.
+        """
+
+        return None
+
+    def sql(self) -> Optional[Tuple[str, tuple]]:
+        """Get the equivalent SQL condition (see `pybibtex.sqlitedb.SQLiteDatabase.filter()`) and its parameters,
+        or ``None`` if there is none.
+        """
+
+        return None
+
+    def __and__(self, other: 'Query') -> 'Query':
+        return And(self, other)
+
+    def __or__(self, other: 'Query') -> 'Query':
+        return Or(self, other)
+
+    def __invert__(self) -> 'Query':
+        return Not(self)
+
+
+class FieldEquals(Query):
+    """Match the items for which the field is equal to a value (the name of the field is case insensitive)
+    """
+
+    cost = 2
+
+    def __init__(self, name: str, value: str):
+        self.name = name
+        self.value = value
+
+    def compile(self) -> Predicate:
+        name, value = self.name, self.value
+
+        def _predicate(item: Item) -> bool:
+            found = item.fields.get(name)
+            if found is None:
+                found = _get_field(item, name)
+
+            return found == value
+
+        return _predicate
+
+    def sql(self) -> Optional[Tuple[str, tuple]]:
+        # (field names are ASCII, so the ``lower()`` of SQLite is enough)
+        return 'i.key IN (SELECT key FROM fields WHERE lower(name) = ? AND value = ?)', (self.name.lower(), self.value)
+
+
+class FieldMatches(Query):
+    """Match the items for which the field matches a regular expression (with ``re.search()``)
+    """
+
+    cost = 5
+
+    def __init__(self, name: str, pattern: str, flags: int = 0):
+        self.name = name
+        self.pattern = re.compile(pattern, flags)
+
+    def compile(self) -> Predicate:
+        name, search = self.name, self.pattern.search
+
+        def _predicate(item: Item) -> bool:
+            found = item.fields.get(name)
+            if found is None:
+                found = _get_field(item, name)
+
+            return found is not None and search(found) is not None
+
+        return _predicate
+
+
+class YearRange(Query):
+    """Match the items for which the year is between ``start`` and ``end`` (included).
+
+    The year is extracted from the ``year`` field, as for sorting (see `pybibtex.bibliography.Item.sort_key()`).
+    """
+
+    cost = 3
+
+    def __init__(self, start: int = None, end: int = None):
+        self.start = start
+        self.end = end
+
+    def compile(self) -> Predicate:
+        start, end = self.start, self.end
+
+        def _predicate(item: Item) -> bool:
+            missing, year = item.sort_key('year')
+            return not missing and (start is None or year >= start) and (end is None or year <= end)
+
+        return _predicate
+
+
+class TypeIn(Query):
+    """Match the items of the given types
+    """
+
+    def __init__(self, *item_types: str):
+        self.item_types = frozenset(t.lower() for t in item_types)
+
+    def compile(self) -> Predicate:
+        item_types = self.item_types
+        return lambda item: item.item_type in item_types
+
+    def sql(self) -> Optional[Tuple[str, tuple]]:
+        return 'i.item_type IN ({})'.format(', '.join('?' * len(self.item_types))), tuple(self.item_types)
+
+
+class KeyIn(Query):
+    """Match the items with the given citation keys (case insensitive)
+    """
+
+    def __init__(self, *keys: str):
+        self.keys = list(dict.fromkeys(k.lower() for k in keys))
+
+    def compile(self) -> Predicate:
+        keys = frozenset(self.keys)
+        return lambda item: item.cite_key.lower() in keys
+
+    def candidates(self, database: Database) -> Optional[List[str]]:
+        return [k for k in self.keys if k in database]
+
+    def sql(self) -> Optional[Tuple[str, tuple]]:
+        return 'i.key IN ({})'.format(', '.join('?' * len(self.keys))), tuple(self.keys)
+
+
+class AuthorLast(Query):
+    """Match the items for which one of the authors (or editors) has the given last name.
+    The comparison is done on normalized names (see `pybibtex.latexutf8.purify()`).
+    """
+
+    cost = 10
+
+    def __init__(self, last: str, field: str = 'author'):
+        self.last = last
+        self.field = field
+
+    def compile(self) -> Predicate:
+        last = purify(self.last)
+        possible_fields = _field_names(self.field)
+
+        return lambda item: any(purify(author.last) == last for author in item.lazy_authors(possible_fields))
+
+
+class And(Query):
+    """Match the items that match all the queries (the cheapest ones are evaluated first)
+    """
+
+    def __init__(self, *queries: Query):
+        self.queries = sorted(queries, key=lambda q: q.cost)
+        self.cost = sum(q.cost for q in queries)
+
+    def compile(self) -> Predicate:
+        predicates = tuple(q.compile() for q in self.queries)
+
+        if len(predicates) == 2:
+            first, second = predicates
+            return lambda item: first(item) and second(item)
+
+        return lambda item: all(p(item) for p in predicates)
+
+    def candidates(self, database: Database) -> Optional[List[str]]:
+        candidates = [c for c in (q.candidates(database) for q in self.queries) if c is not None]
+        return min(candidates, key=len) if candidates else None
+
+    def sql(self) -> Optional[Tuple[str, tuple]]:
+        conditions = [q.sql() for q in self.queries]
+        if any(c is None for c in conditions):
+            return None
+
+        return ' AND '.join('({})'.format(c[0]) for c in conditions), sum((c[1] for c in conditions), ())
+
+
+class Or(Query):
+    """Match the items that match at least one of the queries (the cheapest ones are evaluated first)
+    """
+
+    def __init__(self, *queries: Query):
+        self.queries = sorted(queries, key=lambda q: q.cost)
+        self.cost = sum(q.cost for q in queries)
+
+    def compile(self) -> Predicate:
+        predicates = tuple(q.compile() for q in self.queries)
+
+        if len(predicates) == 2:
+            first, second = predicates
+            return lambda item: first(item) or second(item)
+
+        return lambda item: any(p(item) for p in predicates)
+
+    def candidates(self, database: Database) -> Optional[List[str]]:
+        candidates = [q.candidates(database) for q in self.queries]
+        if any(c is None for c in candidates):
+            return None
+
+        return list(dict.fromkeys(k for c in candidates for k in c))
+
+    def sql(self) -> Optional[Tuple[str, tuple]]:
+        conditions = [q.sql() for q in self.queries]
+        if any(c is None for c in conditions):
+            return None
+
+        return ' OR '.join('({})'.format(c[0]) for c in conditions), sum((c[1] for c in conditions), ())
+
+
+class Not(Query):
+    """Match the items that do not match the query
+    """
+
+    def __init__(self, query: Query):
+        self.query = query
+        self.cost = query.cost
+
+    def compile(self) -> Predicate:
+        predicate = self.query.compile()
+        return lambda item: not predicate(item)
+
+    def sql(self) -> Optional[Tuple[str, tuple]]:
+        condition = self.query.sql()
+        return None if condition is None else ('NOT ({})'.format(condition[0]), condition[1])
@@ -0,0 +1,74 @@
+from contextlib import contextmanager
+from typing import Iterator, Union
+import gc
+import marshal
+import threading
+
+from pybibtex.bibliography import Database
+
+MAGIC = b'PBTXSR01'
+MARSHAL_VERSION = 4
+
+
+class SerializationError(Exception):
+    pass
+
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0  # number of running `loads()`
+_gc_enabled = False  # state of the garbage collector before the first of them
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Disable the garbage collector, and restore its previous state at the end.
+    When several threads use it at once, the state is saved by the first one, and restored by the last one.
+    """
+
+    global _gc_pauses, _gc_enabled
+
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_enabled:
+                gc.enable()
+
+
+def dumps(database: Database) -> bytes:
+    """Serialize a database into bytes, with `marshal`, out of its compact representation
+    (see `pybibtex.bibliography.Database.to_tuple()`).
+
+    It is faster and more compact than `pickle`, but the format may change between versions of Python:
+    use it to exchange data between processes, or as a cache, not for long-term storage.
+    """
+
+    return MAGIC + marshal.dumps(database.to_tuple(), MARSHAL_VERSION)
+
+
+def loads(data: Union[bytes, bytearray, memoryview]) -> Database:
+    """Get a database out of the output of `dumps()`.
+
+    The garbage collector is disabled while loading, and then restored to its previous state
+    (once all the calls running at the same time in other threads are done).
+    Since this is a setting of the whole process, other code should not enable or disable the collector
+    while `loads()` is running.
+    """
+
+    data = memoryview(data)
+    if data[:len(MAGIC)] != MAGIC:
+        raise SerializationError('not a serialized database')
+
+    # the garbage collector is useless while building many containers at once (and slows it down a lot)
+    with _gc_paused():
+        try:
+            return Database.from_tuple(marshal.loads(data[len(MAGIC):]))
+        except (EOFError, ValueError, TypeError) as e:
+            raise SerializationError('invalid data: {}'.format(e))
@@ -0,0 +1,305 @@
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Set
+import threading
+
+from pybibtex.bibliography import Database, Item
+
+
+def copy_item(item: Item) -> Item:
+    """Get a copy of an item, with its own fields (the values are shared, since strings are immutable)
+    """
+
+    copy = Item(item.cite_key, item.item_type, dict(item.fields))
+    copy.span = item.span
+    copy.source_path = item.source_path
+    return copy
+
+
+COMPACT_MIN = 1024  #: minimum number of changes before the layers are merged in a new base (see `Transaction.commit()`)
+COMPACT_RATIO = 16  #: the layers are merged when they have more changes than ``1 / COMPACT_RATIO`` of the base
+SQUASH_RATIO = 2  #: a layer is squashed with the one below it if it is not ``SQUASH_RATIO`` times smaller
+
+
+class OverlayDict(Mapping):
+    """Read-only mapping made of a parent mapping and the changes made to it (replaced, removed and added keys),
+    so that a new version of a mapping shares the parent with the previous one, instead of copying it.
+
+    The parent is either a ``dict`` (the base) or another `OverlayDict`, so that the versions form a chain of layers.
+    The order is the one a ``dict`` would have: the replaced keys keep their position, the added ones are at the end.
+    """
+
+    def __init__(
+            self,
+            parent: Mapping,
+            replaced: Dict[str, Item] = None,
+            removed: Set[str] = None,
+            added: Dict[str, Item] = None
+    ):
+        self.parent = parent
+        self.base: Dict[str, Item] = parent.base if isinstance(parent, OverlayDict) else parent  #: the dict below
+        self.depth: int = parent.depth + 1 if isinstance(parent, OverlayDict) else 1  #: number of layers
+        self.replaced = {} if replaced is None else replaced  #: keys of the parent with a new value
+        self.removed = set() if removed is None else removed  #: keys of the parent that are removed
+        self.added = {} if added is None else added  #: keys that are not in the parent (or were removed, then added)
+
+    @property
+    def n_changes(self) -> int:
+        """Number of keys that differ from the parent"""
+
+        return len(self.replaced) + len(self.removed) + len(self.added)
+
+    @property
+    def total_changes(self) -> int:
+        """Number of changes in all the layers (a key changed in several layers is counted several times)"""
+
+        n, layer = 0, self
+        while isinstance(layer, OverlayDict):
+            n += layer.n_changes
+            layer = layer.parent
+
+        return n
+
+    def __getitem__(self, key: str) -> Item:
+        layer = self
+        while isinstance(layer, OverlayDict):
+            if key in layer.added:
+                return layer.added[key]
+            if key in layer.removed:
+                raise KeyError(key)
+            if key in layer.replaced:
+                return layer.replaced[key]
+            layer = layer.parent
+
+        return layer[key]
+
+    def __contains__(self, key) -> bool:
+        layer = self
+        while isinstance(layer, OverlayDict):
+            if key in layer.added:
+                return True
+            if key in layer.removed:
+                return False
+            if key in layer.replaced:
+                return True
+            layer = layer.parent
+
+        return key in layer
+
+    def __iter__(self) -> Iterator[str]:
+        removed = self.removed
+        if removed:
+            yield from (k for k in self.parent if k not in removed)
+        else:
+            yield from self.parent
+
+        yield from self.added
+
+    def __len__(self) -> int:
+        return len(self.parent) - len(self.removed) + len(self.added)
+
+
+def squash(overlay: OverlayDict) -> OverlayDict:
+    """Merge an overlay with its parent (which must be an overlay too), in a new layer.
+    Both layers are left untouched, since the versions that use them may still be read.
+    """
+
+    lower = overlay.parent
+    replaced, removed, added = dict(lower.replaced), set(lower.removed), dict(lower.added)
+
+    for key in overlay.removed:
+        if key in added:
+            del added[key]
+        else:
+            removed.add(key)
+            replaced.pop(key, None)
+
+    for key, item in overlay.replaced.items():
+        if key in added:  # (keep its position)
+            added[key] = item
+        else:
+            replaced[key] = item
+
+    added.update(overlay.added)
+    return OverlayDict(lower.parent, replaced, removed, added)
+
+
+class Transaction:
+    """Changes to a `SharedDatabase` (see `SharedDatabase.update()`).
+
+    The changes are recorded in a new layer (see `OverlayDict`) on top of the items of the current version,
+    so that a transaction costs the size of its changes, not the size of the database (nor of the previous layers).
+    The items are copied when they are first modified in the transaction (copy-on-write),
+    so that the current version of the database is never modified.
+    """
+
+    def __init__(self, database: Database):
+        self.base = database
+        self.preambles = list(database.preambles)
+
+        self._overlay = OverlayDict(database.db)
+        self._copied: Set[str] = set()
+
+    @property
+    def db(self) -> Mapping:
+        """The items, with the changes of the transaction"""
+
+        return self._overlay
+
+    def __getitem__(self, item: str) -> Item:
+        """Get an item (it should not be modified, use `item()` or `set_field()` for that)"""
+
+        return self._overlay[item.lower()]
+
+    def __contains__(self, item: str) -> bool:
+        return item.lower() in self._overlay
+
+    def __iter__(self) -> Iterable[str]:
+        yield from self._overlay
+
+    def __len__(self) -> int:
+        return len(self._overlay)
+
+    def _put(self, key: str, item: Item):
+        overlay = self._overlay
+        if key in overlay.added or key in overlay.removed or key not in overlay.parent:
+            overlay.added[key] = item
+        else:
+            overlay.replaced[key] = item
+
+    def item(self, key: str) -> Item:
+        """Get an item that can be modified (it is copied, once per transaction)"""
+
+        key = key.lower()
+        if key not in self._copied:
+            self._put(key, copy_item(self._overlay[key]))
+            self._copied.add(key)
+
+        return self._overlay[key]
+
+    def set_field(self, key: str, name: str, value: str):
+        """Set the field of an item"""
+
+        self.item(key)[name] = value
+
+    def add(self, item: Item):
+        """Add (or replace) an item (it belongs to the database afterwards, so it should not be modified)"""
+
+        key = item.cite_key.lower()
+        self._put(key, item)
+        self._copied.add(key)
+
+    def remove(self, key: str):
+        """Remove an item"""
+
+        key = key.lower()
+        overlay = self._overlay
+        if key in overlay.added:
+            del overlay.added[key]
+        elif key in overlay:
+            overlay.removed.add(key)
+            overlay.replaced.pop(key, None)
+        else:
+            raise KeyError(key)
+
+        self._copied.discard(key)
+
+    def commit(self) -> Database:
+        """Get the new version of the database.
+
+        The layer of the transaction is squashed with the ones below it as long as they are not much larger
+        (see `SQUASH_RATIO`), so that there are only a logarithmic number of layers,
+        and each change is copied a logarithmic number of times.
+        When the layers get too large (see `COMPACT_RATIO`), they are merged in a new base,
+        so that the cost of the merge is amortized over many changes.
+        """
+
+        overlay = self._overlay
+        if not overlay.n_changes:
+            db = overlay.parent
+        else:
+            while isinstance(overlay.parent, OverlayDict) \
+                    and overlay.parent.n_changes <= SQUASH_RATIO * overlay.n_changes:
+                overlay = squash(overlay)
+
+            db = overlay
+            if overlay.total_changes > max(COMPACT_MIN, len(overlay.base) // COMPACT_RATIO):
+                while isinstance(overlay.parent, OverlayDict):
+                    overlay = squash(overlay)
+
+                # (the replaced keys keep their position, the removed then added ones are moved at the end)
+                db = dict(overlay.base)
+                for key in overlay.removed:
+                    del db[key]
+                db.update(overlay.replaced)
+                db.update(overlay.added)
+
+        database = Database(db, preambles=self.preambles, source=self.base.source, layout=self.base.layout)
+        database.encoding = self.base.encoding
+        return database
+
+
+class SharedDatabase:
+    """Database shared between threads, with lock-free reads and copy-on-write updates.
+
+    Each version of the database is immutable: readers get the current version with `snapshot()`
+    (which is just an attribute access), and use it as long as they need a consistent view.
+    Updates are made in a transaction (see `update()`), which builds a new version,
+    sharing the unmodified items (and the dictionary that holds them, see `OverlayDict`) with the previous one,
+    and replaces the current version at once at the end.
+    The source and layout of a lossless database are kept, so that `pybibtex.writer.dumps()` still preserves
+    the formatting of the unmodified parts.
+    Writers are serialized by a lock, so they never see each other's partial changes.
+
+    !!! note
+        The items of a snapshot must not be modified directly (with ``item[field] = value``
+        or by writing in ``snapshot.db``), only through a transaction.
+    """
+
+    def __init__(self, database: Database = None):
+        """Initialize the object
+
+        Parameters:
+            database: the initial version (it is not copied, so it should not be modified afterwards)
+        """
+
+        self._database = Database() if database is None else database
+        self._lock = threading.Lock()
+        self.version = 0  #: number of updates
+
+    def snapshot(self) -> Database:
+        """Get the current version of the database (without locking)"""
+
+        return self._database
+
+    @contextmanager
+    def update(self) -> Iterator[Transaction]:
+        """Context manager that gives a `Transaction`: at the end of the ``with`` block,
+        the changes become visible to the readers, all at once.
+        If an exception occurs in the block, the changes are discarded.
+
+        ```python
+        with shared.update() as transaction:
+            transaction.set_field('knuth1984', 'year', '1984')
+            transaction.remove('old')
+        ```
+        """
+
+        with self._lock:
+            transaction = Transaction(self._database)
+            yield transaction
+
+            self._database = transaction.commit()
+            self.version += 1
+
+    def __getitem__(self, item: str) -> Item:
+        return self._database[item]
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._database
+
+    def __iter__(self) -> Iterable[str]:
+        yield from self._database
+
+    def __len__(self) -> int:
+        return len(self._database)
@@ -0,0 +1,213 @@
+import sqlite3
+from itertools import groupby, islice
+from typing import Iterable, Iterator, List, Tuple
+
+from pybibtex.bibliography import Database, Item
+from pybibtex.parser import Parser
+from pybibtex.query import And, Query
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    key TEXT PRIMARY KEY NOT NULL,
+    cite_key TEXT NOT NULL,
+    item_type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fields (
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fields_key ON fields(key, position);
+"""
+
+FIELD_INDEX = 'CREATE INDEX IF NOT EXISTS fields_lower_name_value ON fields(lower(name), value);'
+TYPE_INDEX = 'CREATE INDEX IF NOT EXISTS items_type ON items(item_type);'
+
+
+class SQLiteDatabase:
+    """Database of bibliographic items, stored in SQLite rather than in memory.
+
+    It provides the same interface as `Database` to access items (``bibliography['citation-key']``,
+    ``'citation-key' in bibliography``, ``iter_item()``, ...), but the items are built on demand.
+
+    !!! note
+        As in `Database`, the `cite_key` are considered to be case insensitive in lookup.
+        Modifying an `Item` obtained from this database has no effect on the storage: use `add_item()` again.
+    """
+
+    def __init__(self, path: str = ':memory:', indexes: bool = True):
+        """Initialize the object
+
+        Parameters:
+            path: path to the SQLite file (by default, the database is in memory)
+            indexes: create the indexes on field values and item types (useful for `find()`)
+        """
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+
+        if path != ':memory:':
+            self.connection.execute('PRAGMA journal_mode = WAL')
+            self.connection.execute('PRAGMA synchronous = NORMAL')
+
+        self.connection.executescript(SCHEMA)
+        if indexes:
+            self.create_indexes()
+
+    def create_indexes(self):
+        """Create the indexes on field values and item types.
+
+        For large imports, it is faster to create them after `add_items()`.
+        """
+
+        with self.connection:
+            self.connection.execute(FIELD_INDEX)
+            self.connection.execute(TYPE_INDEX)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'SQLiteDatabase':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add_items(self, items: Iterable[Item], batch_size: int = 10000) -> int:
+        """Insert (or replace) items, by batches (one transaction per batch).
+
+        Parameters:
+            items: the items
+            batch_size: number of items per transaction
+
+        Returns:
+            The number of items that were processed
+        """
+
+        n = 0
+        items = iter(items)
+
+        while True:
+            # if the same key appears twice, the last one wins (as in `Database`)
+            batch = dict((item.cite_key.lower(), item) for item in islice(items, batch_size))
+            if not batch:
+                break
+
+            with self.connection:
+                self.connection.executemany('DELETE FROM fields WHERE key = ?', ((k, ) for k in batch))
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO items VALUES (?, ?, ?)',
+                    ((k, i.cite_key, i.item_type) for k, i in batch.items()))
+                self.connection.executemany(
+                    'INSERT INTO fields VALUES (?, ?, ?, ?)',
+                    ((k, p, f, v) for k, i in batch.items() for p, (f, v) in enumerate(i.fields.items())))
+
+            n += len(batch)
+
+        return n
+
+    def add_item(self, item: Item):
+        """Insert (or replace) an item"""
+
+        self.add_items([item])
+
+    def add_parser(self, parser: Parser, batch_size: int = 10000) -> int:
+        """Insert the items, as they are parsed.
+
+        Parameters:
+            parser: the parser
+            batch_size: number of items per transaction
+
+        Returns:
+            The number of items that were processed
+        """
+
+        return self.add_items(parser.iter_item(), batch_size)
+
+    @staticmethod
+    def _items(rows: Iterable[Tuple[str, str, str, str, str]]) -> Iterator[Item]:
+        """Build items out of ``(key, cite_key, item_type, name, value)`` rows, sorted by key"""
+
+        for (_, cite_key, item_type), fields in groupby(rows, lambda r: r[:3]):
+            yield Item(
+                cite_key=cite_key,
+                item_type=item_type,
+                fields=dict((r[3], r[4]) for r in fields if r[3] is not None))
+
+    def _select(self, where: str = '', params: tuple = ()) -> Iterator[Item]:
+        yield from self._items(self.connection.execute(
+            'SELECT i.key, i.cite_key, i.item_type, f.name, f.value FROM items i '
+            'LEFT JOIN fields f ON f.key = i.key {} ORDER BY i.rowid, f.position'.format(where), params))
+
+    def find(self, field: str, value: str) -> Iterator[Item]:
+        """Iterate over the items for which ``item[field] == value``
+
+        Parameters:
+            field: name of the field (case sensitive)
+            value: value of the field
+        """
+
+        yield from self._select(
+            # (``+name`` so that the index on ``lower(name)`` is used)
+            'WHERE i.key IN (SELECT key FROM fields WHERE lower(name) = ? AND value = ? AND +name = ?)',
+            (field.lower(), value, field))
+
+    def find_type(self, item_type: str) -> Iterator[Item]:
+        """Iterate over the items of a given type"""
+
+        yield from self._select('WHERE i.item_type = ?', (item_type.lower(), ))
+
+    def filter(self, query: Query) -> Database:
+        """Get a (in memory) database containing the items that match a query.
+
+        The parts of the query that can be expressed in SQL (see `pybibtex.query.Query.sql()`) are evaluated by SQLite,
+        using the indexes, while the other ones are evaluated on the resulting items.
+
+        Parameters:
+            query: the query
+        """
+
+        condition = query.sql()
+        predicate = None
+
+        if condition is None and isinstance(query, And):
+            conditions = [q.sql() for q in query.queries]
+            others = [q for q, c in zip(query.queries, conditions) if c is None]
+            predicate = (others[0] if len(others) == 1 else And(*others)).compile()
+
+            conditions = [c for c in conditions if c is not None]
+            if conditions:
+                condition = (
+                    ' AND '.join('({})'.format(c[0]) for c in conditions), sum((c[1] for c in conditions), ()))
+        elif condition is None:
+            predicate = query.compile()
+
+        items = self._select() if condition is None else self._select('WHERE {}'.format(condition[0]), condition[1])
+        return Database(dict((i.cite_key.lower(), i) for i in items if predicate is None or predicate(i)))
+
+    def __getitem__(self, item: str) -> Item:
+        items: List[Item] = list(self._select('WHERE i.key = ?', (item.lower(), )))
+        if not items:
+            raise KeyError(item)
+
+        return items[0]
+
+    def __contains__(self, item: str) -> bool:
+        return self.connection.execute('SELECT 1 FROM items WHERE key = ?', (item.lower(), )).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+
+    def __iter__(self) -> Iterable[str]:
+        for row in self.connection.execute('SELECT key FROM items ORDER BY rowid'):
+            yield row[0]
+
+    def iter_item(self) -> Iterable[Item]:
+        yield from self._select()
+
+    def __str__(self) -> str:
+        """Outputs bibtex database
+        """
+
+        return '\n'.join(str(item) for item in self.iter_item())
@@ -1,10 +1,38 @@
+import bz2
+import codecs
+import gc
+import gzip
+import io
+import json
+import lzma
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
 import unittest
 from typing import Tuple, List
 
 import pybibtex.parser as P
-from pybibtex.bibliography import Database
-from pybibtex.latexutf8 import utf8decode, utf8encode, LtxUTF8Parser
-from pybibtex.authors import AuthorsParser, Author
+from pybibtex.bibliography import Database, Item
+from pybibtex.latexutf8 import utf8decode, utf8encode, LtxUTF8Parser, purify
+from pybibtex.authors import AuthorsParser, Author, split_names, parse_authors_bulk, LazyAuthors
+from pybibtex.authorcache import AuthorCache, parse_authors
+from pybibtex.coauthors import CoauthorGraph
+from pybibtex.index import LazyDatabase, load_index
+from pybibtex.sqlitedb import SQLiteDatabase
+from pybibtex.formatting import Style, TemplateError, APA, NUMERIC, initials
+from pybibtex.crossref import CrossrefResolver, CrossrefError
+from pybibtex.query import FieldEquals, FieldMatches, YearRange, TypeIn, KeyIn, AuthorLast
+from pybibtex.writer import dumps
+from pybibtex.files import decode_chunks, detect_compression, iter_chunks, iter_file, parse_file
+from pybibtex.loader import load_directory, find_files
+from pybibtex.watch import DatabaseWatcher
+from pybibtex.shared import OverlayDict, SharedDatabase
+from pybibtex.packed import PackedDatabase, PackedError, pack
+from pybibtex import serialization
+from pybibtex.jsonio import dump_csl, dump_jsonl, item_to_csl, item_from_csl, iter_csl, load_csl, load_jsonl
 
 
 class LiteralTestCase(unittest.TestCase):
@@ -201,6 +229,83 @@ class ParserTestCase(unittest.TestCase):
                 self.assertIn(k1, i2.fields)
                 self.assertEqual(i1.fields[k1], i2.fields[k1])
 
+    def test_skip(self):
+        database = (
+            '@string{v = "V"}'
+            '@misc(item1, Title = {T}, abstract = "a{"}b{{}}" # {c} # 12 # v, file = {{}x}, year = 2000)'
+            '@misc{item2, title = "U", abstract = {{"}}}'
+        )
+
+        def _parsers(**kwargs):
+            yield P.Parser(database, **kwargs)
+            yield P.BytesParser(database.encode(), **kwargs)
+            yield P.StreamParser(database, **kwargs)  # (no fast skip)
+
+        for parser in _parsers(keep_fields=['title', 'year']):
+            db = parser.parse()
+            self.assertEqual(db['item1'].fields, {'Title': 'T', 'year': '2000'})
+            self.assertEqual(db['item2'].fields, {'title': 'U'})
+
+        for parser in _parsers(drop_fields=['ABSTRACT', 'file']):
+            db = parser.parse()
+            self.assertEqual(db['item1'].fields, {'Title': 'T', 'year': '2000'})
+
+        # the type of the item and its key
+        database = (
+            '@string{a = "A"}'
+            '@misc{item1, title = a # {"}}'
+            '@ARTICLE{item2, title = {{"}}, a = "b(}{)"}'
+            '@string{a = "B"}'
+            '@article(item3, title = ")" # a)'
+            '@book{item4,}'
+        )
+
+        for parser in _parsers(type_filter=['Article']):
+            db = parser.parse()
+            self.assertEqual(list(db), ['item2', 'item3'])
+            self.assertEqual(db['item3']['title'], ')B')
+
+        for parser in _parsers(key_filter=lambda key: key[-1] in '34'):
+            db = parser.parse()
+            self.assertEqual(list(db), ['item3', 'item4'])
+            self.assertEqual(db['item3']['title'], ')B')
+
+        for parser in _parsers(type_filter=['book', 'misc'], key_filter=['ITEM1', 'item2']):
+            self.assertEqual(list(parser.parse()), ['item1'])
+
+        # in lossless mode, the skipped items are kept as text
+        self.assertEqual(dumps(P.Parser(database, lossless=True, type_filter=['book']).parse()), database)
+
+        # unclosed strings are still detected
+        with self.assertRaises(P.ParserSyntaxError):
+            P.Parser('@misc{a, abstract = {x{}', drop_fields=['abstract']).parse()
+
+    def test_location(self):
+        text = 'x\n\nyz\n'
+        for inp in (text, text.encode(), memoryview(text.encode())):
+            index = P.LineIndex(inp)
+            self.assertEqual(len(index), 4)
+            self.assertEqual(
+                [index.location(i) for i in range(len(text) + 1)],
+                [(1, 1), (1, 2), (2, 1), (3, 1), (3, 2), (3, 3), (4, 1)])
+
+        database = '% comment\n@misc{a,\n  title = {A}}\n\n@book{b,\n  title = {B} # x,\n}\n'
+
+        parser = P.Parser(database.replace(' # x', ''))
+        items = list(parser.iter_item())
+        self.assertEqual([parser.location(i.span[0]) for i in items], [(2, 1), (5, 1)])
+        self.assertEqual(parser.location(items[0].span[1] - 1), (3, 14))
+
+        for parser in (P.Parser(database), P.BytesParser(database.encode()), P.StreamParser(database)):
+            with self.assertRaises(P.ParserSyntaxError) as e:
+                parser.parse()
+            self.assertEqual((e.exception.line, e.exception.column), (6, 17))
+            self.assertEqual(str(e.exception), '6:17: while parsing b, x is not defined')
+
+        with self.assertRaises(P.ParserSyntaxError) as e:
+            P.StreamParser(['@misc{a,\n', ' title = ', '{A}}\n\n', '@book']).parse()
+        self.assertEqual((e.exception.line, e.exception.column), (4, 6))
+
 
 class ParserStringTestCase(unittest.TestCase):
     @staticmethod
@@ -257,6 +362,972 @@ class DatabaseTestCase(unittest.TestCase):
         self.assertEqual(list(self.db), ['item1', 'item2'])
         self.assertEqual(list(self.db.iter_item()), [self.db['item1'], self.db['item2']])
 
+    def test_view(self):
+        db = P.Parser('@misc(a, year = 1) @book(B, year = 2) @misc(c, year = 3) @article(d, year = 4)').parse()
+
+        view = db.view(keys=['C', 'a', 'e'])
+        self.assertEqual(list(view), ['c', 'a'])
+        self.assertEqual(len(view), 2)
+        self.assertIs(view['A'], db['a'])
+        self.assertNotIn('b', view)
+
+        with self.assertRaises(KeyError):
+            view['b']
+
+        view = db.view(item_types=['misc', 'BOOK'], predicate=lambda i: i['year'] != '3')
+        self.assertEqual(list(view), ['a', 'b'])
+        self.assertEqual(list(view.iter_item()), [db['a'], db['b']])
+        self.assertNotIn('c', view)
+        self.assertEqual(str(view), str(P.Parser('@misc(a, year = 1) @book(B, year = 2)').parse()))
+
+        # changes in the parent are visible
+        db['c']['year'] = '5'
+        self.assertIn('c', view)
+
+        # slice, and views of views
+        self.assertEqual(list(db.slice(1, 3)), ['b', 'c'])
+        self.assertEqual(list(view.slice(1)), ['b', 'c'])
+        self.assertEqual(list(view.view(keys=['c', 'd'])), ['c'])
+        self.assertEqual(list(view.filter(lambda i: i.cite_key != 'a')), ['b', 'c'])
+        self.assertEqual(view.filter(lambda i: i.cite_key != 'a').db, {'b': db['b'], 'c': db['c']})
+
+    def test_sort(self):
+        db = P.Parser(
+            '@misc(a, author = {von Zola, Emile}, title = {The Book}, year = 1900)'
+            '@misc(b, author = {{\\"O}rn, Jan}, title = {A Zebra}, year = 2000)'
+            '@misc(c, author = {Orn, Jan and Doe, John}, title = {Another}, year = {ca. 1999})'
+            '@misc(d, title = {Anonymous})'
+            '@misc(e, author = {Orn, Jan}, title = {Zebra})'
+        ).parse()
+
+        self.assertEqual([i.cite_key for i in db.sort()], ['b', 'e', 'c', 'a', 'd'])
+        self.assertEqual([i.cite_key for i in db.sort(('-year', 'key'))], ['b', 'c', 'a', 'd', 'e'])
+        self.assertEqual([i.cite_key for i in db.sort(['title'])], ['d', 'c', 'a', 'b', 'e'])
+
+        # keys are cached, until the item is modified
+        self.assertEqual(db['e'].sort_key('year'), (1, 0))
+        db['e']['year'] = '1800'
+        self.assertEqual(db['e'].sort_key('year'), (0, 1800))
+
+        # ... even if the fields are modified directly
+        db['e'].fields['year'] = '1801'
+        self.assertEqual(db['e'].sort_key('year'), (0, 1801))
+        self.assertEqual(db['e'].sort_key('author'), (0, (('orn', 'jan', ''), )))
+        db['e'].fields['author'] = 'Doe, John'
+        self.assertEqual(db['e'].sort_key('author'), (0, (('doe', 'john', ''), )))
+        db['e'].fields['author'] = 'Orn, Jan'
+
+        # parallel computation of the keys
+        db2 = P.Parser(str(db)).parse()
+        self.assertEqual(
+            [i.cite_key for i in db2.sort(('author', '-year'), processes=2, chunk_size=2)],
+            [i.cite_key for i in db.sort(('author', '-year'))])
+
+
+class BytesParserTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.source = '@string{x = "Zürich"}\n@misc{a, title = {Él} # x, author = {Ñandú, José}}\n'
+
+    def test_detect_encoding(self):
+        self.assertEqual(P.detect_encoding(self.source.encode('utf-8')), 'utf-8')
+        self.assertEqual(P.detect_encoding(self.source.encode('utf-8-sig')), 'utf-8-sig')
+        self.assertEqual(P.detect_encoding(self.source.encode('latin-1')), 'latin-1')
+        self.assertEqual(P.detect_encoding(b'% Encoding: windows-1252\n'), 'cp1252')
+        self.assertEqual(P.detect_encoding(self.source.encode('utf-8'), length=1), 'utf-8')  # split characters
+
+    def test_parse(self):
+        expected = P.Parser(self.source).parse()
+
+        for encoding in ('utf-8', 'utf-8-sig', 'latin-1'):
+            data = self.source.encode(encoding)
+            for inp in (data, bytearray(data), memoryview(data)):
+                db = P.BytesParser(inp).parse()
+                self.assertEqual(db['a'].fields, expected['a'].fields)
+
+        # spans are byte offsets
+        data = self.source.encode('utf-8')
+        db = P.BytesParser(data).parse()
+        self.assertEqual(data[db['a'].span[0]:db['a'].span[1]], self.source[self.source.index('@misc'):-1].encode())
+
+        # decoding errors
+        with self.assertRaises(UnicodeDecodeError):
+            P.BytesParser(b'@misc{a, t = {\xe9x}}', encoding='utf-8').parse()
+
+        db = P.BytesParser(b'@misc{a, t = {\xe9}}', encoding='utf-8', errors='replace').parse()
+        self.assertEqual(db['a']['t'], '\ufffd')
+
+    def test_round_trip(self):
+        for encoding in ('utf-8', 'utf-8-sig', 'latin-1'):
+            data = self.source.encode(encoding)
+            db = P.BytesParser(data, lossless=True).parse()
+            self.assertEqual(dumps(db).encode(db.encoding), data)  # (the BOM is part of the first text segment)
+
+
+class FilesTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.source = '@preamble{"x"}\n' + ''.join(
+            '@misc{{k{0}, title = {{Théorie {0}}}, year = {0}}}\n'.format(i) for i in range(200))
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = {}
+
+        for compression, opener in (
+                (None, open), ('gzip', gzip.open), ('bz2', bz2.open), ('xz', lzma.open)):
+            path = os.path.join(self.directory.name, 'biblio.bib{}'.format('.' + compression if compression else ''))
+            with opener(path, 'wb') as f:
+                f.write(self.source.encode('utf-8'))
+            self.paths[compression] = path
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_parse_file(self):
+        expected = P.Parser(self.source).parse()
+
+        for compression, path in self.paths.items():
+            self.assertEqual(detect_compression(path), compression)
+
+            for threaded in (True, False):
+                db = parse_file(path, chunk_size=7, threaded=threaded)  # characters are split between chunks
+                self.assertEqual(list(db), list(expected))
+                self.assertEqual(db['k42'].fields, expected['k42'].fields)
+                self.assertEqual(db.preambles, ['x'])
+
+        # iterate and stop before the end
+        items = iter_file(self.paths['xz'], chunk_size=16)
+        self.assertEqual(next(items).cite_key, 'k0')
+        items.close()
+
+    def test_stream_parser(self):
+        self.assertEqual(
+            P.StreamParser(self.source.splitlines(keepends=True)).parse()['k1'].span,
+            P.Parser(self.source).parse()['k1'].span)
+
+        with self.assertRaises(ValueError):
+            P.StreamParser(self.source, lossless=True)
+
+    def test_late_latin1(self):
+        data = ('@misc{a, title = {A}}\n' * 20 + '@misc{b, title = {Théorie}}\n').encode('latin-1')
+        path = os.path.join(self.directory.name, 'latin1.bib')
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        expected = P.BytesParser(data).parse()
+        self.assertEqual(expected['b']['title'], 'Théorie')
+
+        for chunk_size in (16, 1 << 16):
+            self.assertEqual(parse_file(path, chunk_size=chunk_size)['b']['title'], 'Théorie')
+
+        # UTF-8 before, so decoded as such, then latin-1 (rather than failing)
+        self.assertEqual(list(decode_chunks([b'\xc3', b'\xa9 ', b'\xe9'])), ['é ', 'é'])
+        self.assertEqual(list(decode_chunks([b'x', b'\xc3'])), ['x', 'Ã'])
+
+        with self.assertRaises(UnicodeDecodeError):
+            parse_file(path, encoding='utf-8')
+
+    def test_iter_chunks(self):
+        class Failing(io.BytesIO):
+            def read(self, *args):
+                raise OSError('failed')
+
+        with self.assertRaises(OSError):
+            list(iter_chunks(Failing()))
+
+        self.assertEqual(b''.join(iter_chunks(io.BytesIO(b'x' * 100), chunk_size=3)), b'x' * 100)
+
+
+class LoaderTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.directory.name, 'sub', 'subsub'))
+
+        self.files = {
+            'a.bib': '@misc{a, title = {A}} @misc{shared, title = {from a}}',
+            'b.BIB': '@misc{b, title = {B}}',
+            'notes.txt': '@misc{c, title = {C}}',
+            'sub/d.bib': '@misc{d, title = {D}} @misc{shared, title = {from d}}',
+            'sub/subsub/e.bib.gz': '@misc{e, title = {E}}',
+            'sub/wrong.bib': '@misc{f, title = {F}',
+        }
+
+        for name, content in self.files.items():
+            path = os.path.join(self.directory.name, name)
+            with (gzip.open if name.endswith('.gz') else open)(path, 'wb') as f:
+                f.write(content.encode())
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_find_files(self):
+        self.assertEqual(
+            find_files(self.directory.name),
+            [self.path(n) for n in ('a.bib', 'b.BIB', 'sub/d.bib', 'sub/wrong.bib', 'sub/subsub/e.bib.gz')])
+
+        self.assertEqual(find_files(self.directory.name, recursive=False), [self.path('a.bib'), self.path('b.BIB')])
+
+    def test_load_directory(self):
+        for processes in (0, 2):
+            result = load_directory(self.directory.name, processes=processes, batch_size=2)
+
+            self.assertEqual(len(result.files), 5)
+            self.assertEqual(sorted(result.database), ['a', 'b', 'd', 'e', 'shared'])
+            self.assertEqual(result.database['shared']['title'], 'from d')
+            self.assertEqual(result.database['e'].source_path, self.path('sub/subsub/e.bib.gz'))
+
+            self.assertEqual(list(result.errors), [self.path('sub/wrong.bib')])
+            self.assertIn('ParserSyntaxError', result.errors[self.path('sub/wrong.bib')])
+
+    def test_missing_file(self):
+        # found, but cannot be read (as a file removed between the listing and the loading)
+        os.symlink(self.path('removed.bib'), self.path('sub/link.bib'))
+
+        for processes in (0, 2):
+            result = load_directory(self.directory.name, processes=processes)
+
+            self.assertEqual(len(result.files), 6)
+            self.assertEqual(sorted(result.database), ['a', 'b', 'd', 'e', 'shared'])
+            self.assertEqual(sorted(result.errors), [self.path('sub/link.bib'), self.path('sub/wrong.bib')])
+            self.assertIn('FileNotFoundError', result.errors[self.path('sub/link.bib')])
+
+
+class WatchTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.time = 10 ** 18
+
+        self.write('a.bib', '@string{x = "X"} @misc{a1, title = x} @misc{a2, title = {A2}}')
+        self.write('b.bib', '@misc{b, title = {B}}')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, name: str, content: str):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+
+        self.time += 10 ** 9  # make sure that the modification time changes
+        os.utime(path, ns=(self.time, self.time))
+
+    def test_watch(self):
+        databases = []
+        watcher = DatabaseWatcher(self.directory.name, on_change=databases.append)
+
+        db = watcher.database
+        self.assertEqual(sorted(db), ['a1', 'a2', 'b'])
+        self.assertEqual(db['a1']['title'], 'X')
+        self.assertFalse(watcher.check())
+
+        # only a1 is modified, and b.bib is not parsed again
+        self.write('a.bib', '@string{x = "X"} @misc{a1, title = x # "!"} @misc{a2, title = {A2}}')
+        self.assertTrue(watcher.check())
+
+        self.assertEqual(watcher.database['a1']['title'], 'X!')
+        self.assertIs(watcher.database['a2'], db['a2'])
+        self.assertIs(watcher.database['b'], db['b'])
+        self.assertEqual(db['a1']['title'], 'X')  # the previous database is not modified
+
+        # change of @string: all the items of the file are new
+        self.write('a.bib', '@string{x = "Y"} @misc{a1, title = x # "!"} @misc{a2, title = {A2}}')
+        watcher.check()
+        self.assertEqual(watcher.database['a1']['title'], 'Y!')
+        self.assertIsNot(watcher.database['a2'], db['a2'])
+
+        # errors keep the previous version, new and removed files
+        self.write('b.bib', '@misc{b, title = {B}')
+        self.write('c.bib', '@misc{c, title = {C}}')
+        watcher.check()
+        self.assertEqual(sorted(watcher.database), ['a1', 'a2', 'b', 'c'])
+        self.assertEqual(list(watcher.errors), [os.path.join(self.directory.name, 'b.bib')])
+
+        os.remove(os.path.join(self.directory.name, 'b.bib'))
+        watcher.check()
+        self.assertEqual(sorted(watcher.database), ['a1', 'a2', 'c'])
+        self.assertEqual(watcher.errors, {})
+
+        self.assertEqual(len(databases), 5)
+        self.assertIs(databases[-1], watcher.database)
+
+    def test_thread(self):
+        changed = threading.Event()
+
+        with DatabaseWatcher(self.directory.name, on_change=lambda db: changed.set()) as watcher:
+            changed.clear()  # (set by the initial loading)
+            watcher.start(interval=.01)
+            self.write('c.bib', '@misc{c, title = {C}}')
+            self.assertTrue(changed.wait(5))
+            self.assertIn('c', watcher.database)
+
+    def test_thread_errors(self):
+        failed, changed = threading.Event(), threading.Event()
+
+        def on_change(db: Database):
+            if not failed.is_set():
+                failed.set()
+                raise RuntimeError('failing callback')
+            changed.set()
+
+        with DatabaseWatcher(self.directory.name) as watcher:
+            watcher.on_change = on_change
+            watcher.start(interval=.01)
+
+            # the callback fails once, but the thread keeps watching
+            self.write('c.bib', '@misc{c, title = {C}}')
+            self.assertTrue(failed.wait(5))
+            self.write('d.bib', '@misc{d, title = {D}}')
+            self.assertTrue(changed.wait(5))
+
+            self.assertIn('d', watcher.database)
+            self.assertIsInstance(watcher.last_error, RuntimeError)
+
+
+class SharedDatabaseTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.shared = SharedDatabase(P.Parser(
+            '@misc{a, title = {A}, author = {Doe, J. and Smith, A.}} @misc{b, title = {B}}').parse())
+
+    def test_update(self):
+        before = self.shared.snapshot()
+
+        with self.shared.update() as transaction:
+            transaction.set_field('A', 'title', 'A2')
+            transaction.set_field('a', 'year', '2000')
+            transaction.remove('b')
+            transaction.add(Item('c', 'misc', {'title': 'C'}))
+
+            self.assertEqual(transaction['a']['title'], 'A2')
+            self.assertIs(self.shared.snapshot(), before)  # not visible yet
+
+        after = self.shared.snapshot()
+        self.assertEqual(self.shared.version, 1)
+        self.assertEqual(list(after), ['a', 'c'])
+        self.assertEqual(after['a'].fields, {'title': 'A2', 'author': 'Doe, J. and Smith, A.', 'year': '2000'})
+
+        # the previous version is not modified
+        self.assertEqual(list(before), ['a', 'b'])
+        self.assertEqual(before['a']['title'], 'A')
+
+        # unmodified items are shared
+        with self.shared.update() as transaction:
+            transaction.set_field('c', 'year', '2001')
+
+        self.assertIs(self.shared['a'], after['a'])
+        self.assertIsNot(self.shared['c'], after['c'])
+
+        # the dictionary of the items is shared as well
+        self.assertIs(self.shared.snapshot().db.base, before.db)
+
+    def test_overlay(self):
+        base = self.shared.snapshot()
+
+        with self.shared.update() as transaction:
+            transaction.remove('a')
+            transaction.add(Item('c', 'misc', {}))
+            transaction.add(Item('a', 'misc', {'title': 'A2'}))  # removed, then added: at the end
+            transaction.add(Item('b', 'misc', {'title': 'B2'}))  # replaced: same position
+
+        snapshot = self.shared.snapshot()
+        self.assertEqual(list(snapshot), ['b', 'c', 'a'])
+        self.assertEqual([i['title'] for i in snapshot.iter_item() if 'title' in i], ['B2', 'A2'])
+        self.assertEqual(len(snapshot), 3)
+        self.assertNotIn('z', snapshot)
+
+        with self.shared.update() as transaction:
+            transaction.remove('a')
+
+        self.assertEqual(list(self.shared), ['b', 'c'])
+        self.assertIs(self.shared.snapshot().db.base, base.db)
+
+        # large overlays are merged in a new dictionary
+        with self.shared.update() as transaction:
+            for i in range(2000):
+                transaction.add(Item('x{}'.format(i), 'misc', {}))
+            transaction.remove('b')
+            transaction.add(Item('b', 'misc', {'title': 'B3'}))
+            transaction.set_field('c', 'title', 'C2')
+
+        self.assertIs(type(self.shared.snapshot().db), dict)
+        self.assertEqual(list(self.shared), ['c'] + ['x{}'.format(i) for i in range(2000)] + ['b'])
+        self.assertEqual(self.shared['c']['title'], 'C2')
+
+    def test_layers(self):
+        keys = ['k{}'.format(i) for i in range(64000)]
+        shared = SharedDatabase(Database(dict((key, Item(key, 'misc', {})) for key in keys)))
+        expected = list(shared)
+        generator = random.Random(42)
+
+        for n in range(1500):
+            with shared.update() as transaction:
+                for _ in range(generator.choice((1, 1, 1, 5))):
+                    key = generator.choice(expected)
+                    action = generator.random()
+                    if action < .2:
+                        transaction.remove(key)
+                        expected.remove(key)
+                    elif action < .4:  # removed, then added: at the end
+                        transaction.remove(key)
+                        transaction.add(Item(key, 'misc', {'n': str(n)}))
+                        expected.remove(key)
+                        expected.append(key)
+                    elif action < .6:  # replaced: same position
+                        transaction.add(Item(key, 'misc', {'n': str(n)}))
+                    else:
+                        transaction.set_field(key, 'n', str(n))
+
+                    if action < .1:
+                        key = 'new{}'.format(len(shared) + n)
+                        if key not in transaction:
+                            transaction.add(Item(key, 'misc', {}))
+                            expected.append(key)
+
+            db = shared.snapshot().db
+            if isinstance(db, OverlayDict):  # the number of layers stays logarithmic
+                self.assertLessEqual(db.depth, 12)
+
+        self.assertIsInstance(shared.snapshot().db, OverlayDict)
+        self.assertEqual(list(shared), expected)
+        self.assertEqual(len(shared), len(expected))
+
+        # a small transaction adds a small layer, the previous ones are shared (not copied)
+        before = shared.snapshot().db
+        with shared.update() as transaction:
+            transaction.set_field(expected[0], 'n', 'last')
+
+        after = shared.snapshot().db
+        self.assertIs(after.parent, before)
+        self.assertEqual(after.n_changes, 1)
+        self.assertEqual(shared[expected[0]]['n'], 'last')
+
+    def test_lossless(self):
+        source = '% comment\n@misc{a,\n  title = {A}}\n\n@misc{b, title={B}}\n'
+        shared = SharedDatabase(P.Parser(source, lossless=True).parse())
+
+        with shared.update() as transaction:
+            transaction.set_field('b', 'title', 'B2')
+
+        self.assertEqual(dumps(shared.snapshot()), source.replace('@misc{b, title={B}}', '@misc{b,\n  title = {B2}\n}'))
+
+    def test_rollback(self):
+        before = self.shared.snapshot()
+
+        with self.assertRaises(KeyError):
+            with self.shared.update() as transaction:
+                transaction.set_field('a', 'title', 'A2')
+                transaction.remove('z')
+
+        self.assertIs(self.shared.snapshot(), before)
+        self.assertEqual(self.shared['a']['title'], 'A')
+        self.assertEqual(self.shared.version, 0)
+
+    def test_threads(self):
+        def _write(n: int):
+            for i in range(50):
+                with self.shared.update() as transaction:
+                    value = int(transaction['a'].fields.get('n', '0'))
+                    transaction.set_field('a', 'n', str(value + 1))
+                    transaction.set_field('a', 'writer', str(n))
+
+        def _read():
+            for i in range(500):
+                snapshot = self.shared.snapshot()
+                item = snapshot['a']
+                self.assertEqual(item.fields, snapshot['a'].fields)
+                self.assertEqual([a.last for a in item.authors()], ['Doe', 'Smith'])
+
+        threads = [threading.Thread(target=_write, args=(i, )) for i in range(4)]
+        threads += [threading.Thread(target=_read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.shared['a']['n'], '200')
+
+
+class PackedDatabaseTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = P.Parser(
+            '@preamble{"p"}'
+            '@article{Zeta, author = {Müller, Jürgen and Doe, J.}, title = {Théorie}, year = 2000}'
+            '@book{alpha, title = {Alpha}}'
+            '@misc{empty,}'
+        ).parse()
+
+    def check(self, packed: PackedDatabase):
+        self.assertEqual(list(packed), list(self.db))
+        self.assertEqual(len(packed), 3)
+        self.assertEqual(packed.preambles, ['p'])
+
+        for key in self.db:
+            self.assertIn(key.upper(), packed)
+            self.assertEqual(packed[key].fields, self.db[key].fields)
+            self.assertEqual(packed[key].item_type, self.db[key].item_type)
+            self.assertEqual(str(packed[key]), str(self.db[key]))
+
+        self.assertNotIn('beta', packed)
+        with self.assertRaises(KeyError):
+            packed['beta']
+
+        item = packed['zeta']
+        self.assertEqual(item.cite_key, 'Zeta')
+        self.assertEqual(item['title'], 'Théorie')
+        self.assertIn('year', item)
+        self.assertNotIn('Year', item)
+        self.assertEqual(item.authors()[0].last, 'Müller')
+        self.assertEqual(item.sort_key('year'), (0, 2000))
+
+        with self.assertRaises(PackedError):
+            item['title'] = 'x'
+
+    def test_buffer(self):
+        self.check(PackedDatabase(pack(self.db)))
+        self.check(PackedDatabase(bytearray(pack(self.db))))
+
+        with self.assertRaises(PackedError):
+            PackedDatabase(b'\0' * 64)
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'packed')
+            PackedDatabase.write(self.db, path)
+
+            with PackedDatabase.open(path) as packed:
+                self.check(packed)
+
+    def test_shared_memory(self):
+        shm = PackedDatabase.to_shared_memory(self.db)
+        try:
+            with PackedDatabase.attach(shm.name) as packed:
+                self.check(packed)
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+class JSONTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = P.Parser(
+            '@article{a, author = {Jean de la Fontaine and M{\\"u}ller, Jr., J{\\"u}rgen}, title = {The {DNA}},'
+            '  journal = {J. Chem.}, year = 2001, month = feb, pages = {1--10}, foo = {bar}}'
+            '@incollection{b, editor = {Doe, J.}, booktitle = {Collected}, year = {ca. 1999}}'
+            '@mastersthesis{c, author = {X, Y}, school = {U}, year = 2000}'
+        ).parse()
+
+    def test_jsonl(self):
+        output = io.StringIO()
+        dump_jsonl(self.db, output)
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
+
+        db = load_jsonl(io.StringIO(output.getvalue()))
+        self.assertEqual(str(db), str(self.db))
+
+    def test_csl(self):
+        obj = item_to_csl(self.db['a'])
+        self.assertEqual(obj['type'], 'article-journal')
+        self.assertEqual(obj['author'], [
+            {'family': 'Fontaine', 'given': 'Jean', 'non-dropping-particle': 'de la'},
+            {'family': 'Müller', 'given': 'Jürgen', 'suffix': 'Jr.'}
+        ])
+        self.assertEqual(obj['title'], 'The DNA')
+        self.assertEqual(obj['container-title'], 'J. Chem.')
+        self.assertEqual(obj['page'], '1-10')
+        self.assertEqual(obj['issued'], {'date-parts': [[2001, 2]]})
+        self.assertNotIn('foo', obj)
+
+        self.assertEqual(item_to_csl(self.db['a'], to_utf8=False)['title'], 'The {DNA}')
+
+        item = item_from_csl(obj)
+        self.assertEqual(item.item_type, 'article')
+        self.assertEqual(item['author'], 'de la Fontaine, Jean and Müller, Jr., Jürgen')
+        self.assertEqual(item['pages'], '1--10')
+        self.assertEqual((item['year'], item['month']), ('2001', 'feb'))
+
+        item = item_from_csl(item_to_csl(self.db['b']))
+        self.assertEqual(item.item_type, 'incollection')
+        self.assertEqual(item.fields, {'editor': 'Doe, J.', 'booktitle': 'Collected', 'year': '1999'})
+
+        item = item_from_csl(item_to_csl(self.db['c']))
+        self.assertEqual(item.item_type, 'mastersthesis')
+        self.assertEqual(item['school'], 'U')
+
+        item = item_from_csl({'id': 1, 'type': 'book', 'author': [{'literal': 'ACME'}, {'family': 'Müller'}]}, True)
+        self.assertEqual(item['author'], '{ACME} and M\\"uller')
+
+        # seasons (21-24) and invalid months are dropped
+        for month, expected in ((3, 'mar'), ('12', 'dec'), (21, None), (0, None)):
+            item = item_from_csl({'id': 1, 'issued': {'date-parts': [[2000, month]]}})
+            self.assertEqual(item['year'], '2000')
+            self.assertEqual(item.fields.get('month'), expected)
+
+    def test_csl_stream(self):
+        output = io.StringIO()
+        dump_csl(self.db, output)
+        self.assertEqual(len(json.loads(output.getvalue())), 3)
+
+        for chunk_size in (1, 7, 1000):
+            db = load_csl(io.StringIO(output.getvalue()), chunk_size=chunk_size)
+            self.assertEqual(list(db), ['a', 'b', 'c'])
+
+        self.assertEqual(list(iter_csl(io.StringIO(' [ ] '))), [])
+
+        with self.assertRaises(ValueError):
+            list(iter_csl(io.StringIO('[{"id": "a"}, {"id": ')))
+
+        with self.assertRaises(ValueError):  # not an array
+            list(iter_csl(io.StringIO(' {"id": "a"}')))
+
+        # exactly one comma between the elements
+        for invalid in ('[{"id": "a"} {"id": "b"}]', '[{"id": "a"},, {"id": "b"}]', '[, {"id": "a"}]',
+                        '[{"id": "a"}, ]', '[{"id": "a"}, [{"id": "b"}]]'):
+            for chunk_size in (1, 1000):
+                with self.assertRaises(ValueError):
+                    list(iter_csl(io.StringIO(invalid), chunk_size=chunk_size))
+
+
+class SerializationTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.source = '@preamble{"x"} @misc{A, author = {Doe, J.}, year = 1} @book{b, title = {U}}'
+        self.db = P.Parser(self.source, lossless=True).parse()
+        self.db['b'].source_path = 'biblio.bib'
+        self.db['a'].authors()  # fill the cache
+
+    def check(self, db: Database):
+        self.assertEqual(list(db), ['a', 'b'])
+        self.assertEqual(db['a'].fields, self.db['a'].fields)
+        self.assertEqual(db['a'].item_type, 'misc')
+        self.assertEqual(db['a'].span, self.db['a'].span)
+        self.assertEqual(db['b'].source_path, 'biblio.bib')
+        self.assertEqual(db['a']._cache, {})
+        self.assertEqual(db.preambles, ['x'])
+        self.assertEqual(dumps(db), self.source)
+
+    def test_pickle(self):
+        self.check(pickle.loads(pickle.dumps(self.db)))
+
+        item = pickle.loads(pickle.dumps(self.db['b']))
+        self.assertEqual((item.cite_key, item.fields, item.source_path), ('b', {'title': 'U'}, 'biblio.bib'))
+
+        view = pickle.loads(pickle.dumps(self.db.view(keys=['b'])))
+        self.assertEqual(type(view), Database)
+        self.assertEqual(list(view), ['b'])
+
+    def test_serialization(self):
+        self.check(serialization.loads(serialization.dumps(self.db)))
+        self.assertEqual(Database.from_tuple(self.db.to_tuple()).db.keys(), self.db.db.keys())
+
+        with self.assertRaises(serialization.SerializationError):
+            serialization.loads(b'nope')
+
+        with self.assertRaises(serialization.SerializationError):
+            serialization.loads(serialization.dumps(self.db)[:-10])
+
+        # the state of the garbage collector is restored
+        self.assertTrue(gc.isenabled())
+        gc.disable()
+        try:
+            serialization.loads(serialization.dumps(self.db))
+            self.assertFalse(gc.isenabled())
+        finally:
+            gc.enable()
+
+    def test_serialization_threads(self):
+        data = serialization.dumps(Database(dict(
+            ('k{}'.format(i), Item('k{}'.format(i), 'misc', {'title': str(i)})) for i in range(2000))))
+        barrier = threading.Barrier(4)
+        sizes = []
+
+        def _work():
+            barrier.wait()
+            for _ in range(20):
+                sizes.append(len(serialization.loads(data)))
+
+        threads = [threading.Thread(target=_work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # overlapping calls restore the state once they are all done
+        self.assertEqual(sizes, [2000] * 80)
+        self.assertTrue(gc.isenabled())
+        self.assertEqual(serialization._gc_pauses, 0)
+
+
+class WriterTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.source = (
+            '% a comment\n'
+            '@preamble{"\\newcommand{\\x}{x}" # " "}\n'
+            '@string{j = "Journal"}\n\n'
+            '@article{a,\n    title={A},  journal = j}\n'
+            '@misc(b, title = "B")\n'
+            'trailing text\n'
+        )
+
+    def test_preamble(self):
+        db = P.Parser(self.source).parse()
+        self.assertEqual(db.preambles, ['\\newcommand{\\x}{x} '])
+        self.assertEqual(list(db), ['a', 'b'])
+        self.assertTrue(str(db).startswith('@preamble{{\\newcommand{\\x}{x} }}'))
+        self.assertEqual(db.view().preambles, db.preambles)
+
+    def test_round_trip(self):
+        db = P.Parser(self.source, lossless=True).parse()
+        self.assertEqual(dumps(db), self.source)
+
+        # without lossless mode, the output is formatted
+        self.assertEqual(dumps(P.Parser(self.source).parse()), str(P.Parser(self.source).parse()))
+
+        # duplicate keys: last one wins, but the first one is kept as text
+        source = '@misc{a, title = {1}}\n@misc{A, title = {2}}\n'
+        db = P.Parser(source, lossless=True).parse()
+        self.assertEqual(db['a']['title'], '2')
+        self.assertEqual(dumps(db), source)
+
+    def test_modifications(self):
+        db = P.Parser(self.source, lossless=True).parse()
+
+        db['a']['title'] = 'New'
+        del db.db['b']
+        db.db['c'] = Item('c', 'misc', {'title': 'C'})
+
+        output = dumps(db)
+        self.assertTrue(output.startswith(self.source[:self.source.index('@article')]))
+        self.assertIn(str(db['a']), output)
+        self.assertNotIn('@misc(b', output)
+        self.assertTrue(output.endswith('trailing text\n\n{}\n'.format(db['c'])))
+
+        db2 = P.Parser(output).parse()
+        self.assertEqual(list(db2), ['a', 'c'])
+        self.assertEqual(db2['a']['title'], 'New')
+        self.assertEqual(db2['a']['journal'], 'Journal')
+
+
+class LazyDatabaseTestCase(unittest.TestCase):
+
+    BIBTEX = '@string(s = "Stra{\\ss}e")\n' \
+        "@misc(item1, title = {Café {\\'e}té}) @comment whatever\n" \
+        '@string(s = "Weg") @misc(Item2, title = "Long" # s)'
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'test.bib')
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(self.BIBTEX)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_lazy_access(self):
+        database = P.Parser(self.BIBTEX).parse()
+        lazy_db = LazyDatabase(self.path)
+
+        self.assertTrue(os.path.exists(self.path + '.idx'))
+        self.assertEqual(list(lazy_db), list(database))
+        self.assertIn('ITEM2', lazy_db)
+        self.assertNotIn('item3', lazy_db)
+
+        for key in database:
+            self.assertEqual(lazy_db[key].cite_key, database[key].cite_key)
+            self.assertEqual(lazy_db[key].fields, database[key].fields)
+
+        # the string definitions in force are used
+        self.assertEqual(lazy_db['item2']['title'], 'LongWeg')
+
+    def test_bom(self):
+        database = P.Parser(self.BIBTEX).parse()
+
+        for i, (encoding, data) in enumerate([
+            ('utf-8-sig', self.BIBTEX.encode('utf-8-sig')),
+            ('utf-8-sig', self.BIBTEX.encode('utf-8')),
+            ('utf-16', self.BIBTEX.encode('utf-16')),
+            ('utf-16', codecs.BOM_UTF16_BE + self.BIBTEX.encode('utf-16-be')),
+            ('utf-32', self.BIBTEX.encode('utf-32')),
+        ]):
+            path = os.path.join(self.directory.name, 'bom{}.bib'.format(i))
+            with open(path, 'wb') as f:
+                f.write(data)
+
+            lazy_db = LazyDatabase(path, encoding=encoding)
+            for key in database:
+                self.assertEqual(lazy_db[key].fields, database[key].fields)
+
+    def test_outdated_index(self):
+        LazyDatabase(self.path)
+        load_index(self.path)
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('\n@misc(item3, title = s)')
+
+        lazy_db = LazyDatabase(self.path)
+        self.assertIn('item3', lazy_db)
+        self.assertEqual(lazy_db['item3']['title'], 'Weg')
+
+
+class CrossrefTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = P.Parser(
+            '@inproceedings(a, title = {A}, crossref = {Proc}, xdata = {pub, x})'
+            '@inproceedings(b, title = {B}, Crossref = {proc}, year = 2001)'
+            '@proceedings(proc, title = {Proc}, year = 2000, booktitle = {Proceedings}, xdata = {pub})'
+            '@xdata(pub, publisher = {Springer}, address = {Berlin})'
+            '@xdata(x, address = {Heidelberg})'
+            '@misc(c, title = {C}, crossref = {missing})'
+        ).parse()
+
+        self.resolver = CrossrefResolver(self.db)
+
+    def test_resolve(self):
+        self.resolver.resolve()
+
+        a = self.resolver['A']
+        self.assertEqual(a['title'], 'A')
+        self.assertEqual(a['year'], '2000')
+        self.assertEqual(a['booktitle'], 'Proceedings')
+        self.assertEqual(a['publisher'], 'Springer')
+        self.assertEqual(a['address'], 'Berlin')  # xdata first
+        self.assertIsNot(a, self.db['a'])
+
+        b = self.resolver['b']
+        self.assertEqual(b['year'], '2001')
+        self.assertEqual(b['publisher'], 'Springer')
+        self.assertEqual(b['Crossref'], 'proc')
+        self.assertNotIn('xdata', b)
+
+        self.assertEqual(self.resolver['c'].fields, self.db['c'].fields)
+
+        with self.assertRaises(KeyError):
+            self.resolver['d']
+
+    def test_invalidate(self):
+        self.assertEqual(self.resolver['a']['publisher'], 'Springer')
+        self.assertEqual(self.resolver['b']['publisher'], 'Springer')
+        self.assertEqual(self.resolver['x']['address'], 'Heidelberg')
+
+        self.db['pub']['publisher'] = 'Elsevier'
+        self.resolver.invalidate('pub')
+
+        self.assertNotIn('a', self.resolver.resolved)
+        self.assertNotIn('proc', self.resolver.resolved)
+        self.assertIn('x', self.resolver.resolved)
+
+        self.assertEqual(self.resolver['a']['publisher'], 'Elsevier')
+        self.assertEqual(self.resolver['b']['publisher'], 'Elsevier')
+
+    def test_cycle(self):
+        db = P.Parser('@misc(a, crossref = {b}) @misc(b, crossref = {c}) @misc(c, xdata = {d, a}) @misc(d, )').parse()
+
+        with self.assertRaises(CrossrefError):
+            CrossrefResolver(db).resolve()
+
+
+class QueryTestCase(unittest.TestCase):
+
+    BIBTEX = '@article(a, author = {von Zola, Emile and Doe, J.}, Journal = {JCP}, title = {The Book}, year = 1900)' \
+        '@book(b, author = {{\\"O}rn, Jan}, title = {A Zebra}, year = 2000)' \
+        '@article(c, author = {Orn, Jan and Doe, John}, journal = {JCP}, title = {Another}, year = {ca. 1999})' \
+        '@misc(d, title = {Anonymous})'
+
+    def setUp(self) -> None:
+        self.db = P.Parser(self.BIBTEX).parse()
+
+    def filter(self, query) -> List[str]:
+        return list(self.db.filter(query))
+
+    def test_queries(self):
+        self.assertEqual(self.filter(FieldEquals('journal', 'JCP')), ['a', 'c'])
+        self.assertEqual(self.filter(FieldMatches('title', '^A')), ['b', 'c', 'd'])
+        self.assertEqual(self.filter(YearRange(1950)), ['b', 'c'])
+        self.assertEqual(self.filter(YearRange(end=1999)), ['a', 'c'])
+        self.assertEqual(self.filter(TypeIn('Book', 'misc')), ['b', 'd'])
+        self.assertEqual(self.filter(KeyIn('D', 'c', 'e')), ['d', 'c'])
+        self.assertEqual(self.filter(AuthorLast('Orn')), ['b', 'c'])
+        self.assertEqual(self.filter(lambda item: 'author' not in item), ['d'])
+
+    def test_combination(self):
+        self.assertEqual(self.filter(TypeIn('article') & AuthorLast('doe') & ~YearRange(1950)), ['a'])
+        self.assertEqual(self.filter(TypeIn('book') | FieldMatches('title', 'Anon')), ['b', 'd'])
+        self.assertEqual(self.filter(KeyIn('a', 'b') & TypeIn('article')), ['a'])
+        self.assertEqual(self.filter(KeyIn('a') | KeyIn('b', 'e')), ['a', 'b'])
+
+        # items are shared
+        self.assertIs(self.db.filter(TypeIn('book'))['b'], self.db['b'])
+
+    def test_sqlite(self):
+        with SQLiteDatabase() as sqlite_db:
+            sqlite_db.add_parser(P.Parser(self.BIBTEX))
+
+            for query in [
+                FieldEquals('journal', 'JCP'),
+                TypeIn('article') & ~KeyIn('c'),
+                TypeIn('article') & AuthorLast('doe') & ~YearRange(1950),
+                TypeIn('book') | FieldMatches('title', 'Anon'),
+            ]:
+                self.assertEqual(list(sqlite_db.filter(query)), self.filter(query))
+
+            # field names are case insensitive, in SQL as well
+            sqlite_db.add_item(Item('f', 'article', {'JOurnal': 'JCP'}))
+            query = FieldEquals('journal', 'JCP')
+            self.assertEqual(list(sqlite_db.filter(query)), self.filter(query) + ['f'])
+
+            # ... but not in `find()`
+            self.assertNotIn('f', [i.cite_key for i in sqlite_db.find('journal', 'JCP')])
+            self.assertEqual([i.cite_key for i in sqlite_db.find('JOurnal', 'JCP')], ['f'])
+
+
+class SQLiteDatabaseTestCase(unittest.TestCase):
+
+    BIBTEX = '@misc(item1, key = {val{u}e}, year = 2000) @article(Item2, key = "valu{"}e{"}", year = 2001) ' \
+        '@book(item3, year = 2000) @misc(item4, )'
+
+    def setUp(self) -> None:
+        self.database = P.Parser(self.BIBTEX).parse()
+        self.sqlite_db = SQLiteDatabase()
+        self.assertEqual(self.sqlite_db.add_parser(P.Parser(self.BIBTEX), batch_size=3), 4)
+
+    def tearDown(self) -> None:
+        self.sqlite_db.close()
+
+    def test_access(self):
+        self.assertEqual(len(self.sqlite_db), 4)
+        self.assertEqual(list(self.sqlite_db), list(self.database))
+        self.assertIn('ITEM2', self.sqlite_db)
+        self.assertNotIn('item5', self.sqlite_db)
+
+        with self.assertRaises(KeyError):
+            self.sqlite_db['item5']
+
+        for item in self.sqlite_db.iter_item():
+            expected = self.database[item.cite_key]
+            self.assertEqual(item.cite_key, expected.cite_key)
+            self.assertEqual(item.item_type, expected.item_type)
+            self.assertEqual(list(item.fields.items()), list(expected.fields.items()))
+
+        self.assertEqual(str(self.sqlite_db), str(self.database))
+
+    def test_replace_and_find(self):
+        item = self.sqlite_db['item3']
+        item['year'] = '2001'
+        self.sqlite_db.add_item(item)
+
+        self.assertEqual(self.sqlite_db['item3']['year'], '2001')
+        self.assertEqual([i.cite_key for i in self.sqlite_db.find('year', '2001')], ['Item2', 'item3'])
+        self.assertEqual([i.cite_key for i in self.sqlite_db.find_type('MISC')], ['item1', 'item4'])
+
 
 class ItemTestCase(unittest.TestCase):
 
@@ -280,6 +1351,68 @@ class ItemTestCase(unittest.TestCase):
         self.assertTrue(self.item_k2_key in self.item)
         self.assertFalse(self.item_k1_key + self.item_k2_key in self.item)
 
+    def test_authors(self):
+        self.assertEqual(self.item.authors(), [])
+
+        self.item['author'] = 'Hohenberg, P. and Khon, H. and Doe, J. and others'
+        authors = self.item.lazy_authors()
+        self.assertIs(authors, self.item.lazy_authors())  # cached
+
+        self.assertEqual(self.item.authors(limit=2), [Author('P.', 'Hohenberg'), Author('H.', 'Khon')])
+        self.assertEqual(len(self.item.authors()), 3)
+        self.assertTrue(authors.others)
+
+        self.item['author'] = 'P. Hohenberg'
+        self.assertIsNot(authors, self.item.lazy_authors())  # cache invalidated
+        self.assertEqual(self.item.authors(), [Author('P.', 'Hohenberg')])
+
+
+class FormattingTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = P.Parser(
+            '@article(a, author = {Beaujean, Pierre and de la Fontaine, Jean-Pierre and others}, '
+            "title = {The {DNA} of {\\'e}t{\\'e}}, journal = {J. Chem.}, volume = 3, year = 2020, pages = {1--2})"
+            '@book(b, author = {Smith, J.}, title = {Book}, year = 1999)'
+        ).parse()
+
+    def test_template(self):
+        style = Style('{title}[ ({year}[, {volume}])]\\[x\\]', to_utf8=True)
+
+        self.assertEqual(style.format(self.db['a']), 'The DNA of été (2020, 3)[x]')
+        self.assertEqual(style.format(self.db['b']), 'Book (1999)[x]')
+
+        style = Style({'default': '{title}', 'book': '{key}:{type}:{n}'})
+        self.assertEqual(style.format_database(self.db, ['b', 'a'], start=3), ['b:book:3', "The DNA of \\'et\\'e"])
+
+        with self.assertRaises(TemplateError):
+            Style('[{title}')
+
+        with self.assertRaises(TemplateError):
+            Style('{title}', author_template='{whatever}')
+
+    def test_authors(self):
+        self.assertEqual(initials("Jean-Pierre {\\'E}mile"), "J.-P. {\\'E}.")
+
+        style = Style('{authors}', author_template='{last}', max_authors=1)
+        self.assertEqual(style.format_items(self.db.iter_item()), ['Beaujean et al.', 'Smith'])
+
+        style = Style('{authors}', author_template='[{von} ]{last}', max_authors=2)
+        self.assertEqual(style.format(self.db['a']), 'Beaujean and de la Fontaine et al.')
+
+    def test_styles(self):
+        self.assertEqual(
+            APA.format_database(self.db),
+            ["Beaujean, P., & de la Fontaine, J.-P. et al. (2020). The DNA of \\'et\\'e. J. Chem., 3, 1--2.",
+             'Smith, J. (1999). Book.'])
+
+        self.assertEqual(NUMERIC.format(self.db['b'], 1), '[1] J. Smith, Book (1999).')
+
+        # "von" and "jr" parts
+        item = Item('c', 'book', {'author': 'Doe, Jr., John and Jean de la Fontaine', 'title': 'Fables'})
+        self.assertEqual(APA.format(item), 'Doe, J., Jr., & de la Fontaine, J. Fables.')
+        self.assertEqual(NUMERIC.format(item, 1), '[1] J. Doe, Jr. and J. de la Fontaine, Fables.')
+
 
 class LaTeXUTF8TestCase(unittest.TestCase):
 
@@ -346,6 +1479,10 @@ class LaTeXUTF8TestCase(unittest.TestCase):
     def test_encode(self):
         self.assertEqual(utf8encode(self.TEST_OUT), self.TEST_IN)
 
+    def test_purify(self):
+        self.assertEqual(purify(self.TEST_OUT), 'cet ete jai ete a la chasse aux mures')
+        self.assertEqual(purify('{The} {DNA}~of Jean-Pierre {\\TeX}_1'), 'the dna of jean pierre tex1')
+
 
 class AuthorsTestCase(unittest.TestCase):
 
@@ -480,3 +1617,225 @@ class AuthorsTestCase(unittest.TestCase):
         self.assertEqual(expected, self.transform('Hohenberg, P. and Khon, H.'))
         self.assertEqual(expected, self.transform('P. Hohenberg and Khon, H.'))
         self.assertEqual(expected, self.transform('P. Hohenberg and H. Khon'))
+
+    def test_split_names(self):
+        self.assertEqual(list(split_names('A and B AND {C and D} and{E}')), ['A', 'B', '{C and D} and{E}'])
+        self.assertEqual(list(split_names('A} and B,and C')), ['A}', 'B,', 'C'])
+        self.assertEqual(list(split_names('Anderson, Sandy')), ['Anderson, Sandy'])
+
+    def test_bulk(self):
+        inputs = [
+            'Hohenberg, P. and Khon, H.',
+            'Pierre Beaujean and de la Fontaine, Jean',
+            "O'Neil, J.-P. and Van  Der Berg, Jan   Peter and van der Berg, Jan",
+            'John smith and {Barnes and Noble, Inc.} and Jean {de} {la} fontaine',
+            "{\\'E}mile Zola and Zola, {\\'E}mile and Zola, Jr., Emile and Smith, ",
+            'Mary Ann Evans',
+            'Doe, John\n',  # (not handled by the fast path)
+            'John Doe\n',
+        ]
+
+        columns = parse_authors_bulk(inputs)
+
+        expected = [(i, a) for i, inp in enumerate(inputs) for a in AuthorsParser(inp).authors()]
+        self.assertEqual(len(columns), len(expected))
+
+        for i, (source, author) in enumerate(expected):
+            self.assertEqual(columns.source[i], source)
+            self.assertEqual(columns[i], author)
+
+    def test_lazy_authors(self):
+        authors = LazyAuthors('Hohenberg, P. and Khon, H. and {Barnes and Noble} and others and Doe, J.')
+
+        self.assertEqual(authors[0], Author('P.', 'Hohenberg'))
+        self.assertEqual(authors._names, ['Hohenberg, P.'])  # the rest is not even split
+
+        self.assertEqual(authors[:2], [Author('P.', 'Hohenberg'), Author('H.', 'Khon')])
+        self.assertEqual(len(authors), 5)
+        self.assertFalse(authors.others)  # "others" is not the last one
+        self.assertEqual(authors[-1], Author('J.', 'Doe'))
+        self.assertEqual(list(authors), self.transform(authors.input))
+
+        authors = LazyAuthors('Hohenberg, P. and others')
+        self.assertEqual(list(authors), [Author('P.', 'Hohenberg')])
+        self.assertTrue(authors.others)
+
+        self.assertEqual(len(LazyAuthors('')), 0)
+
+    def test_lazy_authors_threads(self):
+        names = ['Author{}, A.'.format(i) for i in range(20000)]
+        item = Item('a', 'misc', {'author': ' and '.join(names)})
+        errors = []
+
+        def _work():
+            try:
+                self.assertEqual([a.last for a in item.authors()], [n[:-4] for n in names])
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=_work) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(errors, [])
+
+    def test_author_value(self):
+        author = Author('Jean', 'Fontaine', von='de la')
+
+        with self.assertRaises(AttributeError):
+            author.last = 'Zola'
+        with self.assertRaises(AttributeError):
+            author.other = 1
+
+        self.assertEqual(hash(author), hash(Author('Jean', 'Fontaine', von='de la')))
+        self.assertEqual(len({author, Author('Jean', 'Fontaine', von='de la'), Author('Jean', 'Fontaine')}), 2)
+        self.assertEqual(pickle.loads(pickle.dumps(author)), author)
+
+        self.assertEqual(author.sort_key, ('de la fontaine', 'jean', ''))
+        self.assertEqual(Author("{\\'E}mile", 'Zola').sort_key, ('zola', 'emile', ''))
+
+        authors = [Author('B.', 'Zola'), Author("{\\'E}mile", 'Zola'), author, Author('A.', 'Berg', von='van der')]
+        self.assertEqual(sorted(authors), [author, authors[3], authors[0], authors[1]])
+        self.assertTrue(Author('A.', 'Zola') < Author('B.', 'Zola') <= Author('B.', 'Zola'))
+        self.assertFalse(Author('A.', 'Zola') > Author('A.', 'Zola'))
+
+
+class AuthorCacheTestCase(unittest.TestCase):
+
+    def test_cache(self):
+        cache = AuthorCache(maxsize=2)
+        inp = 'Hohenberg, P. and {Barnes and Noble} and Jean de la Fontaine'
+
+        authors = cache.get(inp)
+        self.assertEqual(list(authors), AuthorsParser(inp).authors())
+        self.assertIs(cache.get(inp), authors)
+        self.assertEqual(cache.get(''), ())
+
+        cache.get(inp)  # most recently used, so it is kept
+        cache.get('Doe, J.')
+        self.assertIn(inp, cache)
+        self.assertNotIn('', cache)
+
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (2, 3, 1, 2))
+        self.assertAlmostEqual(stats.hit_ratio, .4)
+
+        cache.resize(1)
+        self.assertEqual(list(cache._entries), ['Doe, J.'])
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats().misses, 0)
+
+    def test_persistence(self):
+        cache = AuthorCache()
+        inputs = ['Hohenberg, P. and Khon, H.', "Zola, Jr., {\\'E}mile", 'van der Berg, Jan']
+        for inp in inputs:
+            cache.get(inp)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'authors.json')
+            cache.save(path)
+            self.assertEqual(os.listdir(directory), ['authors.json'])
+
+            loaded = AuthorCache(maxsize=2)
+            self.assertEqual(loaded.load(path), 3)
+
+        self.assertEqual(list(loaded._entries), inputs[1:])
+        for inp in inputs[1:]:
+            self.assertEqual(loaded.get(inp), parse_authors(inp))
+        self.assertEqual(loaded.stats().hits, 2)
+
+    def test_threads(self):
+        cache = AuthorCache(maxsize=50)
+        inputs = ['Author{}, A. and Other, B.'.format(i % 100) for i in range(2000)]
+
+        def _work():
+            for inp in inputs:
+                self.assertEqual(cache.get(inp)[0].last, inp.split(',')[0])
+
+        threads = [threading.Thread(target=_work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        self.assertEqual(stats.hits + stats.misses, 8000)
+        self.assertEqual(stats.size, 50)
+
+
+class CoauthorGraphTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.database = P.Parser(
+            '@article{a, author = {Smith, J. and Doe, Jane and M{\\"u}ller, K.}}\n'
+            '@article{b, author = {J. Smith and Jane Doe}}\n'
+            '@book{c, Author = {Müller, K and Zola, E. and others}}\n'
+            '@misc{d, title = {No authors}}\n'
+            '@misc{e, author = {Smith, J. and Smith, J.}}\n'
+        ).parse()
+
+    def test_graph(self):
+        graph = CoauthorGraph.from_database(self.database)
+
+        self.assertEqual([str(a) for a in graph.authors], ['Smith, J.', 'Doe, Jane', 'M{\\"u}ller, K.', 'Zola, E.'])
+        self.assertEqual(list(graph.items), [3, 2, 2, 1])
+        self.assertEqual(graph.n_edges, 4)
+        self.assertEqual(graph.weight(Author('J.', 'Smith'), Author('Jane', 'Doe')), 2)
+        self.assertEqual(graph.weight(Author('J.', 'Smith'), Author('E.', 'Zola')), 0)
+
+        indptr, indices, weights = graph.csr()
+        self.assertEqual(list(indptr), [0, 2, 4, 7, 8])
+        self.assertEqual(list(indices), [1, 2, 0, 2, 0, 1, 3, 2])
+        self.assertEqual(list(weights), [2, 1, 2, 1, 1, 1, 1, 1])
+        self.assertIs(graph.csr(), graph.csr())
+
+        self.assertEqual(graph.neighbors(Author('K', 'Müller')), [
+            (Author('J.', 'Smith'), 1), (Author('Jane', 'Doe'), 1), (Author('E.', 'Zola'), 1)])
+
+        output = io.StringIO()
+        graph.dump_edges(output)
+        self.assertEqual(output.getvalue().splitlines()[0], 'Smith, J.\tDoe, Jane\t2')
+
+        output = io.StringIO()
+        graph.dump_edges(output, delimiter=',', ids=True)
+        self.assertEqual(output.getvalue(), '0,1,2\n0,2,1\n1,2,1\n2,3,1\n')
+
+    def test_updates(self):
+        graph = CoauthorGraph()
+        graph.update(self.database.iter_item())
+        graph.csr()
+
+        graph.remove_item(self.database['a'])
+        self.assertEqual(list(graph.iter_edges()), [(0, 1, 1), (2, 3, 1)])
+        self.assertEqual(list(graph.csr()[0]), [0, 1, 2, 3, 4])
+
+        graph.add_item(Item('f', 'misc', {'author': 'Zola, Emile and Doe, Jane'}))
+        self.assertEqual(len(graph), 5)
+        self.assertEqual(graph.weight(Author('Emile', 'Zola'), Author('Jane', 'Doe')), 1)
+        self.assertEqual(list(graph.csr()[0]), [0, 1, 3, 4, 5, 6])
+
+        with self.assertRaises(KeyError):
+            graph.remove_item(Item('g', 'misc', {'author': 'Nobody, A.'}))
+
+        # known authors, but never together (or already removed): the graph is unchanged
+        items, edges = list(graph.items), list(graph.iter_edges())
+        for authors in ('Smith, J. and Zola, E.', 'Smith, J. and Doe, Jane and Müller, K.'):
+            with self.assertRaises(KeyError):
+                graph.remove_item(Item('g', 'misc', {'author': authors}))
+
+            self.assertEqual(list(graph.items), items)
+            self.assertEqual(list(graph.iter_edges()), edges)
+
+        graph.remove_item(self.database['b'])
+        with self.assertRaises(KeyError):
+            graph.remove_item(self.database['b'])
+        self.assertEqual(graph.items[0], 1)
@@ -0,0 +1,200 @@
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+import hashlib
+import os
+import threading
+
+from pybibtex.bibliography import Database, Item
+from pybibtex.files import open_binary
+from pybibtex.loader import find_files
+from pybibtex.parser import BytesParser
+
+
+class WatchedFile:
+    """State of a file watched by `DatabaseWatcher`
+    """
+
+    def __init__(self, path: str, stat: Tuple[int, int]):
+        self.path = path
+        self.stat = stat  #: ``(mtime_ns, size)`` of the file when it was parsed
+        self.items: Dict[str, Item] = {}
+        self.digests: Dict[str, bytes] = {}  #: digest of the source of each item
+        self.strings: Dict[str, str] = {}
+        self.preambles: List[str] = []
+
+
+def _stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DatabaseWatcher:
+    """Keep a database in sync with BibTeX files on disk, by polling their modification time and size.
+
+    Only the files that changed are parsed again.
+    Furthermore, if the ``@string`` of a file did not change, the items whose source did not change are kept
+    (so that their cached authors and sort keys are kept as well).
+
+    Each update builds a new `pybibtex.bibliography.Database`, which replaces `database` at once:
+    readers that get ``watcher.database`` never see a partially updated database.
+
+    !!! note
+        Items should not be modified, since they may be shared between successive versions of the database.
+    """
+
+    def __init__(
+            self,
+            paths: Union[str, Iterable[str]],
+            recursive: bool = True,
+            encoding: str = None,
+            on_change: Callable[[Database], None] = None
+    ):
+        """Initialize the object, and load the files
+
+        Parameters:
+            paths: a directory (the BibTeX files it contains are watched, see `pybibtex.loader.find_files()`)
+                or a list of files
+            recursive: also look in the subdirectories
+            encoding: encoding of the files (if ``None``, it is detected for each file)
+            on_change: function called with the new database after each change
+        """
+
+        self.paths = paths
+        self.recursive = recursive
+        self.encoding = encoding
+        self.on_change = on_change
+
+        self.files: Dict[str, WatchedFile] = {}
+        self.errors: Dict[str, str] = {}  #: the files that could not be parsed, with the error
+        self.last_error: Exception = None  #: the last exception raised by a check of the background thread
+        self.database = Database()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+        self.check()
+
+    def list_files(self) -> List[str]:
+        if isinstance(self.paths, str):
+            return find_files(self.paths, self.recursive)
+
+        return [p for p in self.paths if os.path.exists(p)]
+
+    def _parse(self, path: str, stat: Tuple[int, int]) -> WatchedFile:
+        """Parse a file, reusing the unchanged items of its previous version
+        """
+
+        with open_binary(path) as f:
+            data = f.read()
+
+        parser = BytesParser(data, encoding=self.encoding)
+        watched = WatchedFile(path, stat)
+
+        for item in parser.iter_item():
+            key = item.cite_key.lower()
+            item.source_path = path
+            watched.items[key] = item
+            watched.digests[key] = hashlib.blake2b(data[item.span[0]:item.span[1]], digest_size=16).digest()
+
+        watched.strings = parser.string_variables
+        watched.preambles = parser.preambles
+
+        previous = self.files.get(path)
+        if previous is not None and previous.strings == watched.strings:
+            for key, digest in watched.digests.items():
+                if previous.digests.get(key) == digest:
+                    watched.items[key] = previous.items[key]
+
+        return watched
+
+    def check(self) -> bool:
+        """Check the files, and update the database if any of them changed (or was added or removed).
+
+        Returns:
+            ``True`` if the database was updated
+        """
+
+        with self._lock:
+            changed = False
+            files = {}
+
+            for path in self.list_files():
+                try:
+                    stat = _stat(path)
+                except OSError:  # removed in the meantime
+                    continue
+
+                previous = self.files.get(path)
+                if previous is not None and previous.stat == stat:
+                    files[path] = previous
+                    continue
+
+                changed = True
+                try:
+                    files[path] = self._parse(path, stat)
+                    self.errors.pop(path, None)
+                except Exception as e:
+                    self.errors[path] = '{}: {}'.format(type(e).__name__, e)
+                    if previous is not None:  # keep the previous version
+                        files[path] = previous
+
+            if files.keys() != self.files.keys():
+                changed = True
+
+            for path in list(self.errors):
+                if not os.path.exists(path):
+                    del self.errors[path]
+
+            if not changed:
+                return False
+
+            db = {}
+            preambles = []
+            for path in sorted(files):
+                db.update(files[path].items)
+                preambles.extend(files[path].preambles)
+
+            self.files = files
+            self.database = Database(db, preambles=preambles)
+
+        if self.on_change is not None:
+            self.on_change(self.database)
+
+        return True
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception as e:  # (e.g., in ``on_change``, or the directory is unreadable) keep watching
+                self.last_error = e
+
+    def start(self, interval: float = 1.0):
+        """Start checking the files every ``interval`` seconds, in a background thread.
+
+        An exception raised during a check (including by ``on_change``) does not stop the thread:
+        it is kept in `last_error`, and the files are checked again after the next interval.
+        """
+
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, args=(interval, ), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> 'DatabaseWatcher':
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
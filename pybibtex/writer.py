@@ -0,0 +1,70 @@
+from typing import Iterator, TextIO
+import codecs
+
+from pybibtex.bibliography import Database
+
+
+def iter_dump(database: Database) -> Iterator[str]:
+    """Iterate over the parts of the BibTeX output of a database (see `dumps()`)
+    """
+
+    if database.layout is None:
+        yield str(database)
+        return
+
+    source = database.source
+    if not isinstance(source, str):  # parsed from bytes, so decode the parts when needed
+        encoding = database.encoding
+
+        def text(start: int, end: int) -> str:
+            return codecs.decode(source[start:end], encoding)
+    else:
+        def text(start: int, end: int) -> str:
+            return source[start:end]
+
+    written = set()
+
+    for segment in database.layout:
+        if len(segment) == 2:  # text between items
+            yield text(*segment)
+            continue
+
+        key, start, end = segment
+        if key in written or key not in database:  # deleted
+            continue
+
+        item = database[key]
+        yield text(start, end) if item.span == (start, end) else str(item)
+        written.add(key)
+
+    for key, item in zip(database, database.iter_item()):
+        if key not in written:  # new item
+            yield '\n{}\n'.format(item)
+
+
+def dumps(database: Database) -> str:
+    """Get the BibTeX output of a database.
+
+    If the database was parsed in lossless mode (see `pybibtex.parser.Parser.database()`),
+    the unmodified parts of the input (comments, ``@string``, ``@preamble``, formatting, and items)
+    are written back as is, so that parsing and writing a file without modifications gives the exact same file.
+    The modified items are formatted, the deleted ones are removed, and the new ones are added at the end.
+    Otherwise, it is equivalent to ``str(database)``.
+
+    Parameters:
+        database: the database
+    """
+
+    return ''.join(iter_dump(database))
+
+
+def dump(database: Database, fp: TextIO):
+    """Write the BibTeX output of a database (see `dumps()`) into a file
+
+    Parameters:
+        database: the database
+        fp: a file opened in text mode
+    """
+
+    for part in iter_dump(database):
+        fp.write(part)